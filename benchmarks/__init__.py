@@ -0,0 +1 @@
+"""ネットワーク不要の合成データによるベンチマーク"""
@@ -0,0 +1,58 @@
+"""株価チャート作成時間のベンチマーク
+
+使い方: python -m benchmarks.bench_charts [バー数 ...]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import plotly.graph_objects as go
+
+from core.charts import direction_colors, direction_marker, price_figure
+from core.indicators import add_indicators
+
+
+def synthetic_ohlcv(n: int, seed: int = 0) -> pd.DataFrame:
+    """ランダムウォークによる合成OHLCVデータ"""
+    rng = np.random.default_rng(seed)
+    close = 3000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = close * (1 + rng.normal(0, 0.005, n))
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * 1.01,
+        'Low': np.minimum(open_, close) * 0.99,
+        'Close': close,
+        'Volume': rng.integers(100_000, 10_000_000, n),
+    }, index=pd.date_range('2000-01-01', periods=n, freq='min'))
+
+
+def _timeit(func, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(sizes):
+    print(f"{'bars':>8} {'iterrows色(ms)':>15} {'np.where色(ms)':>15} {'文字列色Bar(ms)':>16} "
+          f"{'数値色Bar(ms)':>14} {'図作成(ms)':>11} {'JSON(ms)':>9}")
+    for n in sizes:
+        df = add_indicators(synthetic_ohlcv(n))
+        loop = _timeit(lambda: ['red' if row['Close'] < row['Open'] else 'green' for _, row in df.iterrows()], repeat=1)
+        vectorized = _timeit(lambda: direction_colors(df['Close'].to_numpy(), df['Open'].to_numpy()))
+        close, open_, volume = df['Close'].to_numpy(), df['Open'].to_numpy(), df['Volume'].to_numpy()
+        string_bar = _timeit(lambda: go.Bar(x=df.index, y=volume, marker_color=direction_colors(close, open_)), repeat=1)
+        numeric_bar = _timeit(lambda: go.Bar(x=df.index, y=volume, marker=direction_marker(close, open_)))
+        build = _timeit(lambda: price_figure(df))
+        fig = price_figure(df)
+        serialize = _timeit(fig.to_json, repeat=1)
+        print(f"{n:>8} {loop * 1000:>15.1f} {vectorized * 1000:>15.2f} {string_bar * 1000:>16.1f} "
+              f"{numeric_bar * 1000:>14.2f} {build * 1000:>11.1f} {serialize * 1000:>9.1f}")
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000])
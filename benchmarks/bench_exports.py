@@ -0,0 +1,54 @@
+"""ダウンロード用ファイルの書き出しのベンチマーク
+
+合成したセッション全体のテレメトリ相当のDataFrameで、形式ごとに
+書き出し時間・ファイルサイズと、同じ内容をもう一度ダウンロードしたとき
+（ハッシュでキャッシュ済み）の時間を比べる。従来は再実行のたびに
+CSVを作っていたので、その時間が毎回の再実行にかかっていた。
+
+使い方: python -m benchmarks.bench_exports [行数]
+"""
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.exports import FORMATS, ExportCache
+
+
+def synthetic_telemetry(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    time_s = np.arange(rows) * 0.27
+    return pd.DataFrame({
+        'SessionTime': pd.to_timedelta(time_s, unit='s'),
+        'RPM': rng.uniform(8000, 12000, rows),
+        'Speed': rng.uniform(80, 330, rows),
+        'nGear': rng.integers(1, 9, rows),
+        'Throttle': rng.uniform(0, 100, rows),
+        'Brake': rng.random(rows) < 0.2,
+        'DRS': rng.integers(0, 14, rows),
+        'Driver': np.repeat([f'D{i:02d}' for i in range(20)], -(-rows // 20))[:rows],
+    })
+
+
+def main(rows: int) -> None:
+    df = synthetic_telemetry(rows)
+    started = time.perf_counter()
+    df.to_csv(index=False).encode('utf-8')
+    print(f"{rows:,}行")
+    print(f"従来（再実行ごとのCSV作成）: {(time.perf_counter() - started) * 1000:.0f} ms")
+    print(f"{'形式':<8} {'初回(ms)':>10} {'2回目(ms)':>10} {'サイズ(MB)':>11}")
+    with tempfile.TemporaryDirectory() as root:
+        cache = ExportCache(root)
+        for fmt in FORMATS:
+            timings = []
+            for _ in range(2):
+                started = time.perf_counter()
+                data = cache.frame(df, fmt)()
+                timings.append(time.perf_counter() - started)
+            print(f"{fmt:<8} {timings[0] * 1000:>10.0f} {timings[1] * 1000:>10.0f} {len(data) / 1e6:>11.1f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
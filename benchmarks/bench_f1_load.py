@@ -0,0 +1,36 @@
+"""F1セッションの読み込み時間（データの種類ごと・cold/warm）のベンチマーク
+
+空のキャッシュディレクトリで1回（cold）、同じディレクトリでもう1回（warm）
+読み込み、ラップ（メッセージを含む）・テレメトリ・天候それぞれの時間を表示する。
+fastf1のサーバーからデータを取得するためネットワークが必要。
+
+使い方: python -m benchmarks.bench_f1_load [年] [グランプリ] [セッション]
+"""
+import sys
+import tempfile
+import warnings
+
+import fastf1
+
+from core.f1_data import DATA_CLASSES, SessionData
+
+
+def main(year: int, gp: str, session_type: str) -> None:
+    warnings.filterwarnings('ignore')
+    fastf1.set_log_level('WARNING')
+    with tempfile.TemporaryDirectory() as cache_dir:
+        fastf1.Cache.enable_cache(cache_dir)
+        print(f"{year} {gp} {session_type}")
+        print(f"{'回':<6} {'データ':<10} {'キャッシュ':<8} {'時間(秒)':>10}")
+        for attempt in ("1回目", "2回目"):
+            data = SessionData(year, gp, session_type, cache_dir)
+            data.ensure(*DATA_CLASSES)
+            for timing in data.timings:
+                cache = 'warm' if timing.warm else 'cold'
+                print(f"{attempt:<6} {timing.data_class:<10} {cache:<8} {timing.seconds:>10.2f}")
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 2024, args[1] if len(args) > 1 else 'Bahrain',
+         args[2] if len(args) > 2 else 'Race')
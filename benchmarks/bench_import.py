@@ -0,0 +1,66 @@
+"""ページごとのimport時間のベンチマーク（python -X importtime）
+
+ページのモジュールを新しいPythonプロセスでimportし、-X importtime の出力から
+合計時間と時間のかかったパッケージを表示する。「app.py経由」は
+streamlit run app.py で実際にimportされるもの（app.py のimport文と
+ページのモジュール）で、ページを開いたときの時間はこちらを見る。
+「全ページ」は分割前のapp.py（すべてのページの依存を起動時にimport）に
+相当する。streamlitだけのimportを基準として別に表示する。
+
+使い方: python -m benchmarks.bench_import [回数] [上位の表示数]
+"""
+import ast
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from views import PAGES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def app_imports() -> str:
+    """app.py のトップレベルのimport文（ページのモジュールは含まない）"""
+    with open(os.path.join(ROOT, "app.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "; ".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def importtime(statement: str) -> tuple[float, dict[str, float]]:
+    """statementを実行したときのimport時間の合計（秒）とトップレベルのパッケージごとの時間"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, check=True,
+        cwd=ROOT,
+    )
+    total = 0.0
+    packages: dict[str, float] = defaultdict(float)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        total += int(self_us) / 1e6
+        packages[package] += int(self_us) / 1e6
+    return total, packages
+
+
+def main(repeat: int, top: int) -> None:
+    cases = {"streamlitのみ": "import streamlit"}
+    cases.update({page: f"import views.{module}" for page, module in PAGES.items()})
+    cases.update({f"{page}（app.py経由）": f"{app_imports()}; import views.{module}" for page, module in PAGES.items()})
+    cases["全ページ（分割前相当）"] = "; ".join(f"import views.{module}" for module in PAGES.values())
+
+    print(f"{'ページ':<30} {'import(ms)':>11}  時間のかかったパッケージ")
+    for name, statement in cases.items():
+        runs = [importtime(statement) for _ in range(repeat)]
+        total, packages = min(runs, key=lambda run: run[0])
+        heaviest = sorted(packages.items(), key=lambda item: -item[1])[:top]
+        detail = ", ".join(f"{package} {seconds * 1000:.0f}" for package, seconds in heaviest)
+        print(f"{name:<30} {total * 1000:>11.0f}  {detail}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 3, args[1] if len(args) > 1 else 4)
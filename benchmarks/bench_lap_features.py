@@ -0,0 +1,90 @@
+"""ドライビング特性の集計（ドライバーごとのループと特徴量テーブル）のベンチマーク
+
+20人・57周の合成レースで、pick_driverとTimedeltaの変換をドライバーごとに
+3回繰り返す従来の方法と、特徴量テーブルを1回作ってgroupbyで集計する方法を比べる。
+
+使い方: python -m benchmarks.bench_lap_features [ドライバー数] [周回数]
+"""
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from fastf1.core import Laps
+
+from core.lap_features import build_lap_features, compound_pace, pace_stability, sector_means
+
+
+def synthetic_laps(drivers: int = 20, laps: int = 57, seed: int = 0) -> Laps:
+    """3スティント（SOFT→HARD→MEDIUM）の合成レース"""
+    rng = np.random.default_rng(seed)
+    lap_number = np.tile(np.arange(1, laps + 1), drivers)
+    stint = np.select([lap_number <= laps // 3, lap_number <= 2 * laps // 3], [1, 2], 3)
+    tyre_life = lap_number - np.select([stint == 1, stint == 2], [0, laps // 3], 2 * laps // 3)
+    lap_time = 92 + rng.normal(0, 0.4, len(lap_number)) + 0.03 * tyre_life
+    lap_time[rng.random(len(lap_time)) < 0.03] += 20  # ピットイン・セーフティカー
+    return Laps(pd.DataFrame({
+        'Driver': np.repeat([f'D{i:02d}' for i in range(drivers)], laps),
+        'LapNumber': lap_number.astype(float),
+        'Stint': stint.astype(float),
+        'Compound': np.array(['SOFT', 'HARD', 'MEDIUM'])[stint - 1],
+        'TyreLife': tyre_life.astype(float),
+        'LapTime': pd.to_timedelta(lap_time, unit='s'),
+        'Sector1Time': pd.to_timedelta(lap_time * 0.31, unit='s'),
+        'Sector2Time': pd.to_timedelta(lap_time * 0.37, unit='s'),
+        'Sector3Time': pd.to_timedelta(lap_time * 0.32, unit='s'),
+    }))
+
+
+def per_driver_loops(laps: Laps, drivers) -> None:
+    """従来の方法（セクター・タイヤ・安定性でそれぞれドライバーごとにループ）"""
+    laps = laps.copy()
+    laps['LapTimeSeconds'] = laps['LapTime'].dt.total_seconds()
+    for driver in drivers:
+        driver_laps = laps.pick_driver(driver)
+        [driver_laps[f'Sector{i}Time'].dt.total_seconds().dropna().mean() for i in (1, 2, 3)]
+    for driver in drivers:
+        driver_laps = laps.pick_driver(driver)
+        for compound in driver_laps['Compound'].dropna().unique():
+            times = driver_laps[driver_laps['Compound'] == compound]['LapTimeSeconds'].dropna()
+            median = times.median()
+            times[(times < median * 1.1) & (times > median * 0.9)].mean()
+    for driver in drivers:
+        times = laps.pick_driver(driver)['LapTimeSeconds'].dropna()
+        median = times.median()
+        times = times[(times < median * 1.1) & (times > median * 0.9)]
+        times.std(), times.mean()
+
+
+def feature_table(features: pd.DataFrame, drivers) -> None:
+    sector_means(features, drivers)
+    compound_pace(features, drivers)
+    pace_stability(features, drivers)
+
+
+def _timeit(func, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(drivers: int, laps: int) -> None:
+    warnings.filterwarnings('ignore')
+    race = synthetic_laps(drivers, laps)
+    names = sorted(race['Driver'].unique())
+    build = _timeit(lambda: build_lap_features(race))
+    features = build_lap_features(race)
+    print(f"{drivers}人 x {laps}周 ({len(race)}ラップ)")
+    print(f"{'方法':<28} {'時間(ms)':>10}")
+    print(f"{'ドライバーごとのループ':<24} {_timeit(lambda: per_driver_loops(race, names)) * 1000:>10.1f}")
+    print(f"{'特徴量テーブルの作成（1回のみ）':<20} {build * 1000:>10.1f}")
+    print(f"{'特徴量テーブルからの集計':<23} {_timeit(lambda: feature_table(features, names)) * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 20, args[1] if len(args) > 1 else 57)
@@ -0,0 +1,45 @@
+"""店舗の近傍検索（KD木と全件走査）のベンチマーク
+
+使い方: python -m benchmarks.bench_store_index [店舗数 ...]
+"""
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.bench_store_map import synthetic_stores
+from core.store_index import StoreIndex, haversine_km
+
+# 検索地点（東京駅）
+TOKYO_STATION = (35.6812, 139.7671)
+
+
+def _per_query(func, queries: int = 200) -> float:
+    started = time.perf_counter()
+    for _ in range(queries):
+        func()
+    return (time.perf_counter() - started) / queries
+
+
+def main(sizes):
+    lat, lon = TOKYO_STATION
+    print(f"{'店舗数':>8} {'作成(ms)':>10} {'k=10(µs)':>10} {'10km(µs)':>10} {'全件走査(µs)':>12}")
+    for n in sizes:
+        df = synthetic_stores(n)
+        started = time.perf_counter()
+        index = StoreIndex(df)
+        build = time.perf_counter() - started
+
+        lats, lons = df["緯度"].to_numpy(np.float64), df["経度"].to_numpy(np.float64)
+        scan = _per_query(lambda: np.argsort(haversine_km(lat, lon, lats, lons))[:10], queries=20)
+        knn = _per_query(lambda: index.nearest(lat, lon, k=10))
+        radius = _per_query(lambda: index.within(lat, lon, 10))
+
+        # 全件走査と同じ店舗が返ることを確認する
+        expected = np.argsort(haversine_km(lat, lon, lats, lons), kind="stable")[:10]
+        assert set(index.nearest(lat, lon, k=10).index) == set(expected)
+        print(f"{n:>8} {build * 1000:>10.1f} {knn * 1e6:>10.0f} {radius * 1e6:>10.0f} {scan * 1e6:>12.0f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [150, 10_000, 100_000, 1_000_000])
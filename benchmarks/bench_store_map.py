@@ -0,0 +1,57 @@
+"""店舗マップのHTMLサイズと作成時間のベンチマーク
+
+使い方: python -m benchmarks.bench_store_map [店舗数 ...]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.store_map import MODE_CLUSTER, MODE_MARKERS, build_store_map, cull_to_bounds
+
+# 個別マーカーは点数が多いと極端に遅いので上限を設ける
+MAX_MARKERS = 10_000
+
+# カリング時の表示範囲（東京周辺）
+TOKYO_BOUNDS = {"_southWest": {"lat": 35.5, "lng": 139.4}, "_northEast": {"lat": 35.9, "lng": 139.95}}
+
+
+def synthetic_stores(n: int, seed: int = 0) -> pd.DataFrame:
+    """日本周辺にランダムに配置した合成店舗データ"""
+    rng = np.random.default_rng(seed)
+    prefectures = np.array(['東京都', '神奈川県', '埼玉県', '千葉県', '大阪府', '愛知県'])
+    pref = prefectures[rng.integers(0, len(prefectures), n)]
+    return pd.DataFrame({
+        'No': np.arange(1, n + 1, dtype=np.int32),
+        '店舗名': [f'テスト店舗{i}号店' for i in range(n)],
+        '住所': [f'{p}テスト市{i % 100}-{i % 7}' for i, p in enumerate(pref)],
+        '緯度': rng.uniform(33.0, 37.0, n).astype(np.float32),
+        '経度': rng.uniform(133.0, 141.0, n).astype(np.float32),
+        '都道府県': pd.Categorical(pref),
+    })
+
+
+def measure(df: pd.DataFrame, mode: str, bounds=None) -> tuple[float, int]:
+    """地図作成 + HTML化の時間（秒）とHTMLサイズ（バイト）"""
+    started = time.perf_counter()
+    m = build_store_map(df, mode=mode, bounds=bounds)
+    html = m.get_root().render()
+    return time.perf_counter() - started, len(html.encode('utf-8'))
+
+
+def main(sizes):
+    print(f"{'店舗数':>8} {'方式':<10} {'描画店舗数':>10} {'時間(ms)':>10} {'HTML(KB)':>10}")
+    for n in sizes:
+        df = synthetic_stores(n)
+        cases = [(MODE_CLUSTER, None), (MODE_CLUSTER, TOKYO_BOUNDS)]
+        if n <= MAX_MARKERS:
+            cases = [(MODE_MARKERS, None), (MODE_MARKERS, TOKYO_BOUNDS)] + cases
+        for mode, bounds in cases:
+            elapsed, size = measure(df, mode, bounds)
+            label = mode + ('+cull' if bounds else '')
+            print(f"{n:>8} {label:<10} {len(cull_to_bounds(df, bounds)):>10} {elapsed * 1000:>10.1f} {size / 1024:>10.1f}")
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [100, 1_000, 10_000, 100_000])
@@ -0,0 +1,39 @@
+"""店舗検索（バイグラム索引とstr.contains）のベンチマーク
+
+使い方: python -m benchmarks.bench_store_search [店舗数 ...]
+"""
+import sys
+import time
+
+from benchmarks.bench_store_map import synthetic_stores
+from core.store_search import SearchIndex
+
+QUERIES = ["テスト店舗12号", "ﾃｽﾄ店舗999", "神奈川県テスト市4", "東京都", "市4-"]
+
+
+def _per_query(func, queries: int = 50) -> float:
+    started = time.perf_counter()
+    for _ in range(queries):
+        func()
+    return (time.perf_counter() - started) / queries
+
+
+def main(sizes):
+    print(f"{'店舗数':>8} {'クエリ':<16} {'件数':>8} {'索引(µs)':>10} {'contains(µs)':>14}")
+    for n in sizes:
+        df = synthetic_stores(n)
+        started = time.perf_counter()
+        index = SearchIndex(df)
+        print(f"{n:>8} 索引の作成: {(time.perf_counter() - started) * 1000:.0f} ms")
+        for query in QUERIES:
+            hits = len(index.search(query))
+            indexed = _per_query(lambda: index.search(query))
+            scan = _per_query(
+                lambda: df['店舗名'].str.contains(query, case=False) | df['住所'].str.contains(query, case=False),
+                queries=5,
+            )
+            print(f"{n:>8} {query:<16} {hits:>8} {indexed * 1e6:>10.0f} {scan * 1e6:>14.0f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 100_000])
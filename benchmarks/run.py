@@ -0,0 +1,235 @@
+"""ページの計算・描画処理のベンチマークスイート
+
+株価（指標の計算・チャート作成）、店舗（データセットの読み込み・集計・
+近傍検索の索引・地図のHTML化）、F1（ラップの特徴量テーブルと集計）の処理を、
+合成データで行数を変えながら計測する。ネットワークは使わない。
+
+結果はJSON（既定は data/benchmarks/latest.json）に保存し、リポジトリに置いた
+基準の結果（benchmarks/baseline.json）とケース・行数ごとに最小時間を比べ、
+閾値より遅くなったものを回帰として表示して終了コード1を返す。基準は
+--save-baseline で更新する（実行環境が変わったときも更新してコミットする）。
+
+使い方:
+  python -m benchmarks.run                          # 1k〜1M行
+  python -m benchmarks.run --sizes 1000 1000000 -k store
+  python -m benchmarks.run --save-baseline          # 今回の結果を基準にする
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.bench_charts import synthetic_ohlcv
+from benchmarks.bench_lap_features import synthetic_laps
+from benchmarks.bench_store_map import TOKYO_BOUNDS, synthetic_stores
+from core.charts import price_figure
+from core.downsample import DEFAULT_MAX_POINTS, aggregate_ohlc
+from core.indicators import add_indicators
+from core.lap_features import build_lap_features, clean_laps, compound_pace, lap_time_stats, pace_stability, sector_means
+from core.store_data import SCHEMA, load_store_dataset
+from core.store_index import StoreIndex
+from core.store_map import MODE_CLUSTER, build_store_map
+from core.store_stats import PrefectureStats
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_OUTPUT = "data/benchmarks/latest.json"
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25  # 基準より25%以上遅ければ回帰
+MIN_DELTA = 0.002  # 2 ms未満の差は誤差として扱う
+
+F1_DRIVERS = 20
+
+
+@dataclass(frozen=True)
+class Case:
+    """1つの計測対象（setupで行数からデータを作り、runの時間だけを計る）"""
+    name: str
+    setup: Callable[[int], object]
+    run: Callable[[object], object]
+    max_rows: Optional[int] = None  # これより大きい行数では実行しない
+
+
+@dataclass(frozen=True)
+class Result:
+    name: str
+    rows: int
+    repeat: int
+    min: float
+    median: float
+    mean: float
+
+
+def _store_dataset(n: int, root: str) -> str:
+    """合成店舗データをアプリと同じスキーマのArrow IPCファイルに書き出す"""
+    path = os.path.join(root, f"stores_{n}.arrow")
+    if not os.path.exists(path):
+        table = pa.Table.from_pandas(synthetic_stores(n), schema=SCHEMA, preserve_index=False)
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, SCHEMA) as writer:
+                writer.write_table(table)
+    return path
+
+
+def _f1_aggregate(features: pd.DataFrame) -> None:
+    """F1ページの「ラップタイム」「ドライビング特性」タブと同じ集計"""
+    drivers = sorted(features["Driver"].unique())
+    lap_time_stats(clean_laps(features, drivers))
+    sector_means(features, drivers)
+    compound_pace(features, drivers)
+    pace_stability(features, drivers)
+
+
+def make_cases(root: str) -> list[Case]:
+    """計測対象の一覧（root は店舗データセットの書き出し先）"""
+    stocks = lambda n: synthetic_ohlcv(n)  # noqa: E731
+    stores = lambda n: load_store_dataset(_store_dataset(n, root))  # noqa: E731
+    laps = lambda n: synthetic_laps(F1_DRIVERS, max(n // F1_DRIVERS, 3))  # noqa: E731
+    return [
+        Case("stocks.indicators", stocks, add_indicators),
+        Case("stocks.chart", lambda n: add_indicators(stocks(n)),
+             lambda df: price_figure(aggregate_ohlc(df, DEFAULT_MAX_POINTS)).to_json()),
+        Case("store.load", lambda n: _store_dataset(n, root), load_store_dataset),
+        Case("store.stats", stores, PrefectureStats),
+        Case("store.index", stores, StoreIndex),
+        Case("store.map", stores, lambda df: build_store_map(df, mode=MODE_CLUSTER).get_root().render(),
+             max_rows=100_000),
+        Case("store.map_culled", stores,
+             lambda df: build_store_map(df, mode=MODE_CLUSTER, bounds=TOKYO_BOUNDS).get_root().render()),
+        Case("f1.lap_features", laps, build_lap_features),
+        Case("f1.aggregate", lambda n: build_lap_features(laps(n)), _f1_aggregate),
+    ]
+
+
+def measure(func: Callable[[], object], repeat: int, budget: float = 10.0) -> list[float]:
+    """1回空実行してから repeat 回計る（1回が長いものは budget 秒までで打ち切る）"""
+    func()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+        if sum(times) > budget:
+            break
+    return times
+
+
+def run_suite(cases: list[Case], sizes, repeat: int, progress=print) -> tuple[list[Result], list[dict]]:
+    """計測結果と、行数の上限を超えたため実行しなかったケースを返す"""
+    results, skipped = [], []
+    for case in cases:
+        for n in sizes:
+            if case.max_rows is not None and n > case.max_rows:
+                skipped.append({"name": case.name, "rows": n, "reason": f"上限 {case.max_rows:,}行"})
+                progress(f"{case.name:<20} {n:>10,} {'スキップ':>10}（上限 {case.max_rows:,}行）")
+                continue
+            data = case.setup(n)
+            times = measure(lambda: case.run(data), repeat)
+            result = Result(case.name, n, len(times), min(times), statistics.median(times), statistics.fmean(times))
+            results.append(result)
+            progress(f"{case.name:<20} {n:>10,} {result.min * 1000:>10.2f} {result.median * 1000:>10.2f}")
+    return results, skipped
+
+
+def environment() -> dict:
+    """結果を比べるときに確認する実行環境"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "pyarrow": pa.__version__,
+    }
+
+
+def save(path: str, results: list[Result], skipped: list[dict]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": [asdict(r) for r in results], "skipped": skipped}, f,
+                  ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(path + ".tmp", path)
+
+
+def load(path: str) -> dict[tuple[str, int], dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return {(r["name"], r["rows"]): r for r in json.load(f)["results"]}
+
+
+def compare(results: list[Result], baseline: dict[tuple[str, int], dict], threshold: float) -> list[Result]:
+    """基準と最小時間を比べて表示し、回帰したものを返す"""
+    print(f"\n{'ケース':<18} {'行数':>10} {'基準(ms)':>10} {'今回(ms)':>10} {'比':>7}")
+    regressions = []
+    for result in results:
+        base = baseline.get((result.name, result.rows))
+        if base is None:
+            print(f"{result.name:<20} {result.rows:>10,} {'-':>10} {result.min * 1000:>10.2f} {'新規':>6}")
+            continue
+        ratio = result.min / base["min"] if base["min"] > 0 else float("inf")
+        regressed = ratio > 1 + threshold and result.min - base["min"] > MIN_DELTA
+        if regressed:
+            regressions.append(result)
+        mark = "  回帰" if regressed else ""
+        print(f"{result.name:<20} {result.rows:>10,} {base['min'] * 1000:>10.2f} {result.min * 1000:>10.2f} "
+              f"{ratio:>7.2f}{mark}")
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="ページの計算・描画処理のベンチマーク（合成データ）")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="行数")
+    parser.add_argument("-k", "--filter", default="", help="名前にこの文字列を含むケースだけ実行する")
+    parser.add_argument("--repeat", type=int, default=5, help="計測回数（最小・中央値を記録する）")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="結果のJSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="比べる基準の結果のJSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="回帰とみなす遅くなった割合")
+    parser.add_argument("--save-baseline", action="store_true", help="今回の結果を基準として保存する")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    with tempfile.TemporaryDirectory() as root:
+        cases = [case for case in make_cases(root) if args.filter in case.name]
+        print(f"{'ケース':<18} {'行数':>10} {'最小(ms)':>10} {'中央値(ms)':>10}")
+        results, skipped = run_suite(cases, args.sizes, args.repeat)
+
+    save(args.output, results, skipped)
+    print(f"\n結果を保存しました: {args.output}")
+    if skipped:
+        print(f"{len(skipped)}件は行数の上限を超えるため実行しませんでした")
+    if args.save_baseline:
+        save(args.baseline, results, skipped)
+        print(f"基準として保存しました: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"基準の結果がありません（--save-baseline で {args.baseline} に保存できます）")
+        return 0
+
+    regressions = compare(results, load(args.baseline), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)}件が基準より{args.threshold:.0%}以上遅くなりました")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1 @@
+"""Streamlitアプリから切り出したデータ取得・計算ロジック"""
@@ -0,0 +1,130 @@
+"""株価ダッシュボードのPlotly図の作成
+
+色などのスタイル配列は行ごとのループではなく、元のNumPy配列から
+``np.where`` でまとめて作る。色は文字列配列ではなく0/1の数値配列と
+2色のカラースケールで渡す（Plotlyは文字列の色配列を1要素ずつ検証するため遅い）。
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+UP_COLOR = "green"
+DOWN_COLOR = "red"
+
+
+def direction_colors(values: np.ndarray, reference: np.ndarray | float = 0.0) -> np.ndarray:
+    """values < reference なら下落色、それ以外は上昇色の配列を返す"""
+    return np.where(np.asarray(values) < reference, DOWN_COLOR, UP_COLOR)
+
+
+def direction_marker(values: np.ndarray, reference: np.ndarray | float = 0.0) -> dict:
+    """direction_colors と同じ配色を数値配列 + カラースケールで表すmarker設定"""
+    down = np.where(np.asarray(values) < reference, 1, 0).astype(np.int8)
+    return dict(color=down, colorscale=[[0, UP_COLOR], [1, DOWN_COLOR]], cmin=0, cmax=1)
+
+
+def price_figure(df: pd.DataFrame) -> go.Figure:
+    """ローソク足 + 移動平均線 + 出来高の図"""
+    x = df.index
+    open_, high, low, close = (df[c].to_numpy() for c in ("Open", "High", "Low", "Close"))
+
+    fig = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.03,
+        row_heights=[0.7, 0.3],
+        subplot_titles=('株価', '出来高')
+    )
+
+    # ローソク足
+    fig.add_trace(
+        go.Candlestick(x=x, open=open_, high=high, low=low, close=close, name='株価'),
+        row=1, col=1
+    )
+
+    # 移動平均線
+    for name, color in (('MA5', 'orange'), ('MA25', 'blue'), ('MA75', 'red')):
+        if name in df.columns:
+            fig.add_trace(
+                go.Scatter(x=x, y=df[name].to_numpy(), name=name, line=dict(color=color, width=1)),
+                row=1, col=1
+            )
+
+    # 出来高（陰線は赤、陽線は緑）
+    fig.add_trace(
+        go.Bar(x=x, y=df['Volume'].to_numpy(), name='出来高', marker=direction_marker(close, open_)),
+        row=2, col=1
+    )
+
+    fig.update_layout(
+        height=700,
+        xaxis_rangeslider_visible=False,
+        hovermode='x unified'
+    )
+    fig.update_yaxes(title_text="価格 (¥)", row=1, col=1)
+    fig.update_yaxes(title_text="出来高", row=2, col=1)
+    return fig
+
+
+def rsi_figure(df: pd.DataFrame) -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=df.index, y=df['RSI'].to_numpy(), name='RSI', line=dict(color='purple')))
+    fig.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="買われすぎ")
+    fig.add_hline(y=30, line_dash="dash", line_color="green", annotation_text="売られすぎ")
+    fig.update_layout(height=300, yaxis_range=[0, 100])
+    return fig
+
+
+def macd_figure(df: pd.DataFrame) -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=df.index, y=df['MACD'].to_numpy(), name='MACD', line=dict(color='blue')))
+    fig.add_trace(go.Scatter(x=df.index, y=df['Signal'].to_numpy(), name='Signal', line=dict(color='red')))
+    fig.add_trace(go.Bar(x=df.index, y=df['Histogram'].to_numpy(), name='Histogram', marker_color='gray'))
+    fig.update_layout(height=300)
+    return fig
+
+
+def bollinger_figure(df: pd.DataFrame) -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=df.index, y=df['Close'].to_numpy(), name='終値', line=dict(color='black')))
+    fig.add_trace(go.Scatter(x=df.index, y=df['BB_upper'].to_numpy(), name='上限', line=dict(color='red', dash='dash')))
+    fig.add_trace(go.Scatter(x=df.index, y=df['BB_middle'].to_numpy(), name='中央', line=dict(color='blue')))
+    fig.add_trace(go.Scatter(x=df.index, y=df['BB_lower'].to_numpy(), name='下限', line=dict(color='green', dash='dash')))
+    fig.update_layout(height=400)
+    return fig
+
+
+def returns_histogram(close: pd.Series) -> go.Figure:
+    """日次リターン分布のヒストグラム"""
+    values = close.to_numpy(dtype=np.float64)
+    returns = (values[1:] / values[:-1] - 1) * 100
+    fig = go.Figure()
+    fig.add_trace(go.Histogram(x=returns[~np.isnan(returns)], nbinsx=50, name='日次リターン'))
+    fig.update_layout(
+        xaxis_title='リターン (%)',
+        yaxis_title='頻度',
+        height=300
+    )
+    return fig
+
+
+def monthly_returns_figure(close: pd.Series) -> go.Figure:
+    """月次リターンの棒グラフ（マイナスは赤、プラスは緑）"""
+    monthly = close.resample('ME').last().pct_change() * 100
+    values = monthly.to_numpy()
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=monthly.index,
+        y=values,
+        marker=direction_marker(values),
+        name='月次リターン'
+    ))
+    fig.update_layout(
+        xaxis_title='月',
+        yaxis_title='リターン (%)',
+        height=300
+    )
+    return fig
@@ -0,0 +1,99 @@
+"""長い時系列の描画前ダウンサンプリング
+
+折れ線にはLargest-Triangle-Three-Buckets (LTTB)、階段状の信号には
+バケットごとの最小・最大、ローソク足にはOHLC集約を使う。
+いずれも点数が上限以下のときは元データをそのまま返すので、
+表示範囲を絞れば全解像度のデータが描画される。
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_POINTS = 2000
+
+
+def _as_float(x) -> np.ndarray:
+    if isinstance(x, pd.DatetimeIndex) or np.issubdtype(np.asarray(x).dtype, np.datetime64):
+        return np.asarray(pd.DatetimeIndex(x).asi8, dtype=np.float64)
+    return np.asarray(x, dtype=np.float64)
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """LTTBで残す点のインデックスを返す（NaNの点は除外して計算する）"""
+    x, y = _as_float(x), _as_float(y)
+    valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    n = len(valid)
+    if n_out >= n or n_out < 3:
+        return valid
+    xv, yv = x[valid], y[valid]
+
+    # 先頭と末尾を除いた点を n_out - 2 個のバケットに分ける
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nlo, nhi = edges[i + 1], edges[i + 2]
+        else:
+            nlo, nhi = n - 1, n
+        cx, cy = xv[nlo:nhi].mean(), yv[nlo:nhi].mean()
+        ax, ay = xv[a], yv[a]
+        area = np.abs((ax - cx) * (yv[lo:hi] - ay) - (ax - xv[lo:hi]) * (cy - ay))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return valid[out]
+
+
+def minmax_indices(y, n_out: int) -> np.ndarray:
+    """各バケットの最小点と最大点のインデックスを返す（ギアやブレーキなど階段状の信号向け）"""
+    y = _as_float(y)
+    n = len(y)
+    buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+    starts = np.linspace(0, n, buckets, endpoint=False).astype(np.int64)
+    bucket_id = np.repeat(np.arange(buckets), np.diff(np.r_[starts, n]))
+    filled = np.nan_to_num(y, nan=0.0)
+    # バケットごとに (バケット番号, 値) で並べ替え、先頭と末尾を最小・最大として取る
+    order = np.lexsort((filled, bucket_id))
+    ends = np.r_[starts[1:], n] - 1
+    return np.unique(np.r_[order[starts], order[ends]])
+
+
+def aggregate_ohlc(df: pd.DataFrame, n_out: int) -> pd.DataFrame:
+    """連続するバーを n_out 本のOHLCバーに集約する
+
+    Open/Closeはバケットの最初・最後、High/Lowは最大・最小、Volumeは合計、
+    それ以外の列（移動平均など）はバケット最後の値を使う。
+    """
+    n = len(df)
+    if n <= n_out:
+        return df
+    starts = np.linspace(0, n, n_out, endpoint=False).astype(np.int64)
+    ends = np.r_[starts[1:], n] - 1
+
+    out = {}
+    for column in df.columns:
+        values = df[column].to_numpy()
+        if column == 'Open':
+            out[column] = values[starts]
+        elif column == 'High':
+            out[column] = np.fmax.reduceat(values.astype(np.float64), starts)
+        elif column == 'Low':
+            out[column] = np.fmin.reduceat(values.astype(np.float64), starts)
+        elif column == 'Volume':
+            out[column] = np.add.reduceat(np.nan_to_num(values.astype(np.float64)), starts)
+        else:
+            out[column] = values[ends]
+    return pd.DataFrame(out, index=df.index[starts])
+
+
+def downsample_lines(df: pd.DataFrame, column: str, n_out: int, x=None) -> pd.DataFrame:
+    """column のLTTBで選んだ行だけを残す（同じ図の他の列も同じ行で間引く）"""
+    x = df.index if x is None else df[x]
+    if len(df) <= n_out:
+        return df
+    return df.iloc[lttb_indices(x, df[column], n_out)]
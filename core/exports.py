@@ -0,0 +1,151 @@
+"""データのエクスポート（CSV・Parquet・Arrow IPC）
+
+ダウンロードボタンには書き出し関数を渡し、ファイルはクリックされたときに
+だけ作る。書き出したファイルは内容のハッシュを名前にしてディスクに残し、
+同じ内容のダウンロードでは書き出し直さない。大きなデータ（セッション全体の
+テレメトリなど）はDataFrameのまとまりごとに追記し、全体を連結しない。
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from typing import Callable, Hashable, Iterable, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+# 形式 -> (拡張子, MIMEタイプ)
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow": ("arrow", "application/vnd.apache.arrow.file"),
+}
+CHUNK_ROWS = 100_000
+
+
+def frame_hash(df: pd.DataFrame, index: bool = True) -> str:
+    """DataFrameの内容（列名・型・値）のハッシュ"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=index).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def key_hash(key: Iterable[Hashable]) -> str:
+    """内容が変わらないデータ（セッションのテレメトリなど）を識別するキーのハッシュ"""
+    return hashlib.blake2b(repr(tuple(key)).encode(), digest_size=16).hexdigest()
+
+
+def _chunks(df: pd.DataFrame, rows: int = CHUNK_ROWS) -> Iterable[pd.DataFrame]:
+    for start in range(0, max(len(df), 1), rows):
+        yield df.iloc[start:start + rows]
+
+
+def write_frames(frames: Iterable[pd.DataFrame], path: str, fmt: str, index: bool = False) -> None:
+    """DataFrameのまとまりを順に1つのファイルへ書き出す（列は最初のまとまりに揃える）
+
+    Parquetはまとまりごとに行グループ、Arrowはレコードバッチになる。
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"不明な形式: {fmt}")
+    writer = None
+    schema = None
+    with open(path, "wb") as f:
+        try:
+            for frame in frames:
+                if fmt == "CSV":
+                    frame.to_csv(f, index=index, header=schema is None)
+                    schema = True
+                    continue
+                table = pa.Table.from_pandas(frame, schema=schema, preserve_index=index)
+                if writer is None:
+                    schema = table.schema
+                    writer = pq.ParquetWriter(f, schema) if fmt == "Parquet" else ipc.new_file(f, schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+class ExportCache:
+    """書き出したファイルをハッシュごとに保持する（合計 max_bytes を超えたら古いものから消す）
+
+    書き出しはファイルごとのロックで行い、別の内容のダウンロードは並行して書き出せる
+    （同じ内容を同時に求められたときだけ、先に始めた書き出しを待つ）。
+    """
+
+    def __init__(self, root: str = "data/exports", max_bytes: int = 1024 ** 3):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()  # _locks・ヒット数・削除を守る
+
+    def _path(self, digest: str, fmt: str) -> str:
+        return os.path.join(self.root, f"{digest}.{FORMATS[fmt][0]}")
+
+    def _file_lock(self, path: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def _build(self, digest: str, fmt: str, frames: Callable[[], Iterable[pd.DataFrame]], index: bool) -> bytes:
+        path = self._path(digest, fmt)
+        with self._file_lock(path):
+            hit = os.path.exists(path)
+            with self._lock:
+                if hit:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if hit:
+                os.utime(path)
+            else:
+                os.makedirs(self.root, exist_ok=True)
+                tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+                write_frames(frames(), tmp, fmt, index)
+                os.replace(tmp, path)
+            # ダウンロードボタンはバイト列を受け取るので、削除される前に読んでおく
+            with open(path, "rb") as f:
+                data = f.read()
+        if not hit:
+            self._prune(keep=path)
+        return data
+
+    def _prune(self, keep: str) -> None:
+        """古いものから削除する（書き出し・読み込み中のファイルは飛ばす）"""
+        with self._lock:
+            files = [os.path.join(self.root, name) for name in os.listdir(self.root) if not name.endswith(".tmp")]
+            files.sort(key=os.path.getmtime)
+            total = sum(os.path.getsize(path) for path in files)
+            for path in files:
+                if total <= self.max_bytes:
+                    break
+                lock = self._locks.setdefault(path, threading.Lock())
+                if path == keep or not lock.acquire(blocking=False):
+                    continue
+                try:
+                    total -= os.path.getsize(path)
+                    os.remove(path)
+                    del self._locks[path]
+                finally:
+                    lock.release()
+
+    def frame(self, df: pd.DataFrame, fmt: str, index: bool = False) -> Callable[[], bytes]:
+        """ダウンロードボタンに渡す書き出し関数（呼ばれたときに内容をハッシュして書き出す）"""
+        return lambda: self._build(frame_hash(df, index) + f"-{int(index)}", fmt, lambda: _chunks(df), index)
+
+    def frames(self, key: Iterable[Hashable], frames: Callable[[], Iterable[pd.DataFrame]], fmt: str) -> Callable[[], bytes]:
+        """まとまりごとに作るデータの書き出し関数（内容は key で識別し、frames は書き出すときだけ呼ぶ）"""
+        return lambda: self._build(key_hash(key), fmt, frames, False)
+
+
+def download_name(stem: str, fmt: str) -> str:
+    return f"{stem}.{FORMATS[fmt][0]}"
+
+
+def mime_type(fmt: str) -> Optional[str]:
+    return FORMATS[fmt][1]
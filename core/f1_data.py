@@ -0,0 +1,203 @@
+"""F1セッションデータの段階的な読み込み
+
+fastf1の ``Session.load()`` はラップ・テレメトリ・天候・メッセージをすべて
+読み込むため、最初はラップだけを読み込み、テレメトリなどは表示に必要に
+なった時点で追加で読み込む。データの種類ごとに読み込み時間と、fastf1の
+ディスクキャッシュに既にあったか（warm/cold）を記録する。
+
+レースコントロールのメッセージはラップと一緒に ``load()`` で読み込む
+（トラックリミットで取り消されたラップの Deleted 列はメッセージから作られる
+ため、通常の ``load()`` と同じラップになる）。テレメトリと天候の追加の
+読み込みはfastf1の非公開のメソッドを呼ぶので、requirements.txt で確認済みの
+範囲にバージョンを固定し、メソッドが無いときは公開の ``load()`` で読み直す。
+
+読み込んだセッションは ``SessionCache`` でプロセス内に保持し、再実行や
+他のブラウザセッションでも解析し直さずに使い回す。
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import pandas as pd
+
+from core.lap_features import build_lap_features
+
+DATA_CLASSES = ("laps", "telemetry", "weather")  # メッセージは "laps" に含む
+
+# データの種類ごとに、fastf1のディスクキャッシュに保存されるAPIの名前
+CACHE_FILES = {
+    "laps": ("_extended_timing_data", "timing_app_data", "race_control_messages"),
+    "telemetry": ("car_data", "position_data"),
+    "weather": ("weather_data",),
+}
+
+# ラップ以外を追加で読み込むSessionのメソッド（load()はすべてを読み直すため個別に呼ぶ）。
+# fastf1の非公開のメソッドなので、無くなっていたら load() で読み直す（fastf1 3.8.3で確認）
+_LOADERS = {
+    "telemetry": "_load_telemetry",
+    "weather": "_load_weather_data",
+}
+
+
+def fastf1_get_session(year: int, gp: str, session_type: str):
+    """fastf1からセッションを取得する（デフォルトの取得関数）"""
+    import fastf1
+
+    return fastf1.get_session(year, gp, session_type)
+
+
+@dataclass(frozen=True)
+class LoadTiming:
+    """データの種類ごとの読み込み時間"""
+    data_class: str
+    seconds: float
+    warm: bool  # fastf1のディスクキャッシュに既にあったか
+
+
+class SessionData:
+    """1セッション分のfastf1データを必要な種類だけ読み込んで保持する"""
+
+    def __init__(
+        self,
+        year: int,
+        gp: str,
+        session_type: str,
+        cache_dir: Optional[str] = "cache",
+        get_session: Optional[Callable] = None,
+        on_load: Optional[Callable[[LoadTiming], None]] = None,
+    ):
+        self.year = year
+        self.gp = gp
+        self.session_type = session_type
+        self.cache_dir = cache_dir
+        self.get_session = get_session or fastf1_get_session
+        self.on_load = on_load  # データの種類を1つ読み込むたびに LoadTiming を渡して呼ぶ
+        self.session = None
+        self.loaded: set[str] = set()
+        self.timings: list[LoadTiming] = []
+        self.memory_bytes = 0
+        self._lap_features: Optional[pd.DataFrame] = None
+        self._lock = threading.Lock()
+
+    def is_cached(self, data_class: str) -> bool:
+        """fastf1のディスクキャッシュにその種類のデータが保存済みか"""
+        if self.cache_dir is None or self.session is None:
+            return False
+        directory = os.path.join(self.cache_dir, self.session.api_path[len("/static/"):])
+        return all(os.path.isfile(os.path.join(directory, f"{name}.ff1pkl")) for name in CACHE_FILES[data_class])
+
+    def ensure(self, *data_classes: str):
+        """指定した種類のデータ（ラップは常に含む）を読み込んでfastf1のSessionを返す"""
+        unknown = set(data_classes) - set(DATA_CLASSES)
+        if unknown:
+            raise ValueError(f"不明なデータの種類: {sorted(unknown)}")
+        with self._lock:
+            if self.session is None:
+                self.session = self.get_session(self.year, self.gp, self.session_type)
+            for data_class in DATA_CLASSES:
+                if data_class in self.loaded or (data_class != "laps" and data_class not in data_classes):
+                    continue
+                warm = self.is_cached(data_class)
+                started = time.perf_counter()
+                if data_class == "laps":
+                    self.session.load(laps=True, telemetry=False, weather=False, messages=True)
+                elif hasattr(self.session, _LOADERS[data_class]):
+                    getattr(self.session, _LOADERS[data_class])()
+                else:
+                    loaded = self.loaded | {data_class}
+                    self.session.load(laps=True, telemetry="telemetry" in loaded,
+                                      weather="weather" in loaded, messages=True)
+                timing = LoadTiming(data_class, time.perf_counter() - started, warm)
+                self.timings.append(timing)
+                if self.on_load is not None:
+                    self.on_load(timing)
+                self.loaded.add(data_class)
+                self.memory_bytes = self._memory_usage()
+            return self.session
+
+    def lap_features(self) -> pd.DataFrame:
+        """ラップの特徴量テーブル（最初に呼ばれたときに1回だけ作る）"""
+        with self._lock:
+            if self._lap_features is None:
+                self._lap_features = build_lap_features(self.session.laps)
+                self.memory_bytes = self._memory_usage()
+            return self._lap_features
+
+    def _memory_usage(self) -> int:
+        """読み込んだDataFrameのおおよそのメモリ使用量（バイト）"""
+        frames = [] if self._lap_features is None else [self._lap_features]
+        for name in ("laps", "weather_data", "race_control_messages"):
+            try:
+                frames.append(getattr(self.session, name))
+            except Exception:  # 未読み込みの属性はfastf1が例外にする
+                pass
+        for name in ("car_data", "pos_data"):
+            data = getattr(self.session, name, None)
+            if isinstance(data, dict):
+                frames.extend(data.values())
+        return int(sum(f.memory_usage(deep=True).sum() for f in frames if hasattr(f, "memory_usage")))
+
+
+class SessionCache:
+    """読み込み済みのセッションをプロセス内で共有するLRUキャッシュ
+
+    保持するのは最大 max_sessions 件、合計 max_bytes までで、超えた分は
+    最後に使われたのが古いものから捨てる（直前に使ったセッションは残す）。
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 4,
+        max_bytes: int = 2 * 1024 ** 3,
+        cache_dir: Optional[str] = "cache",
+        get_session: Optional[Callable] = None,
+        on_load: Optional[Callable[[LoadTiming], None]] = None,
+    ):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.get_session = get_session
+        self.on_load = on_load
+        self._sessions: OrderedDict[tuple, SessionData] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, year: int, gp: str, session_type: str, *data_classes: str) -> SessionData:
+        """セッションを返す（指定した種類のデータは読み込み済みにする）"""
+        key = (year, gp, session_type)
+        with self._lock:
+            data = self._sessions.get(key)
+            if data is None:
+                data = SessionData(year, gp, session_type, self.cache_dir, self.get_session, self.on_load)
+                self._sessions[key] = data
+            self._sessions.move_to_end(key)
+        try:
+            data.ensure(*data_classes)
+        except Exception:
+            # ラップすら読み込めなかったセッションは保持しない（次回は最初から読み込み直す）
+            with self._lock:
+                if "laps" not in data.loaded and self._sessions.get(key) is data:
+                    del self._sessions[key]
+            raise
+        self._evict()
+        return data
+
+    def _evict(self) -> None:
+        with self._lock:
+            while len(self._sessions) > 1 and (
+                len(self._sessions) > self.max_sessions or self.memory_bytes > self.max_bytes
+            ):
+                self._sessions.popitem(last=False)
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(data.memory_bytes for data in self._sessions.values())
+
+    def keys(self) -> list[tuple]:
+        """保持しているセッションのキー（古い順）"""
+        with self._lock:
+            return list(self._sessions)
@@ -0,0 +1,303 @@
+"""シーズン単位のF1セッションの先読み
+
+グランプリを最初に選んだ利用者がfastf1のダウンロードを待たなくて済むよう、
+シーズン内のセッションをまとめて読み込んでfastf1のディスクキャッシュを
+温めておく。並列数を制限して読み込み、失敗したセッションは間隔を空けて
+再試行する。読み込めたセッションはキャッシュディレクトリのマニフェスト
+（prefetch.json）に記録し、サイドバーではそれを見て温まっているかを表示する。
+
+既定ではラップだけを読み込む。テレメトリの重ね合わせやエクスポートを最初に
+開いたときの待ち時間もなくすには ``--data-classes laps telemetry`` を指定する。
+アプリ内（サイドバー）からの先読みはサーバーのメモリを圧迫しないよう1件ずつ
+読み込むので、多くのセッションを温めるときはCLIかDockerのビルドで実行する。
+
+ネットワークなしで試すときは ``--fixture`` でラップ表のCSVを置いたディレクトリ
+（<年>/<グランプリ>/<セッション>.csv）を渡す。
+
+使い方: python -m core.f1_prefetch [--year 2024 ...] [--session Race ...] [--data-classes laps ...]
+                                   [--cache cache] [--workers 3] [--retries 2] [--fixture ディレクトリ] [--force]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Optional
+
+import pandas as pd
+
+from core.f1_data import DATA_CLASSES, SessionData
+
+# アプリで選べるシーズンとグランプリ
+SEASONS = [2024, 2023, 2022, 2021, 2020]
+GRAND_PRIX = {
+    year: ["Bahrain", "Saudi Arabia", "Australia", "Japan", "Miami", "Monaco", "Spain", "Canada", "Austria", "Great Britain"]
+    for year in SEASONS
+}
+SESSION_TYPES = ["Race", "Qualifying", "Sprint", "Practice 1", "Practice 2", "Practice 3"]
+
+MANIFEST_FILE = "prefetch.json"
+
+# 先読みの対象: (年, グランプリ, セッション)
+Target = tuple[int, str, str]
+
+
+@dataclass
+class PrefetchResult:
+    """1セッション分の先読みの結果"""
+    year: int
+    gp: str
+    session_type: str
+    attempts: int
+    seconds: float
+    error: Optional[str] = None
+    skipped: bool = False  # マニフェストで温まっていたので読み込まなかった
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class WarmManifest:
+    """先読み（または画面で読み込み）済みのセッションを記録するJSON
+
+    CLIとアプリの別プロセスから更新されるので、ファイルの更新時刻が
+    変わっていたら読み直す。書き込みは一時ファイルからの置き換えで行う。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: dict[str, dict] = {}
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(year: int, gp: str, session_type: str) -> str:
+        return f"{year}/{gp}/{session_type}"
+
+    def _reload(self) -> None:
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+            self._mtime = mtime
+
+    def is_warm(self, year: int, gp: str, session_type: str, data_classes: Iterable[str] = ("laps",)) -> bool:
+        with self._lock:
+            self._reload()
+            entry = self._entries.get(self._key(year, gp, session_type))
+        return entry is not None and set(data_classes) <= set(entry["data_classes"])
+
+    def status(self, year: int, gps: Iterable[str], session_type: str) -> dict[str, bool]:
+        """グランプリごとに温まっているか（ラップ）"""
+        return {gp: self.is_warm(year, gp, session_type) for gp in gps}
+
+    def mark(self, year: int, gp: str, session_type: str, data_classes: Iterable[str]) -> None:
+        with self._lock:
+            self._reload()
+            key = self._key(year, gp, session_type)
+            known = set(self._entries.get(key, {}).get("data_classes", []))
+            self._entries[key] = {
+                "data_classes": sorted(known | set(data_classes)),
+                "warmed_at": datetime.now(timezone.utc).isoformat(),
+            }
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=1)
+            os.replace(self.path + ".tmp", self.path)
+            self._mtime = os.path.getmtime(self.path)
+
+
+def season_targets(years: Iterable[int], session_types: Iterable[str] = ("Race",)) -> list[Target]:
+    """シーズンの全グランプリ×セッション種別"""
+    return [(year, gp, session_type) for year in years for gp in GRAND_PRIX.get(year, []) for session_type in session_types]
+
+
+def prefetch_sessions(
+    targets: Iterable[Target],
+    data_classes: Iterable[str] = ("laps",),
+    cache_dir: Optional[str] = "cache",
+    get_session: Optional[Callable] = None,
+    manifest: Optional[WarmManifest] = None,
+    max_workers: int = 3,
+    retries: int = 2,
+    backoff: float = 2.0,
+    force: bool = False,
+    progress: Optional[Callable[[int, int, PrefetchResult], None]] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> list[PrefetchResult]:
+    """セッションを並列に読み込んでfastf1のディスクキャッシュを温める
+
+    失敗したセッションは backoff, 2*backoff, ... 秒待って最大 retries 回まで再試行する。
+    マニフェストで温まっているセッションは force でなければ読み込まない。
+    読み込んだデータはディスクキャッシュを作るためだけなので、メモリには残さない。
+    """
+    targets = list(dict.fromkeys(targets))
+    data_classes = tuple(data_classes)
+
+    def task(target: Target) -> PrefetchResult:
+        year, gp, session_type = target
+        if manifest is not None and not force and manifest.is_warm(year, gp, session_type, data_classes):
+            return PrefetchResult(year, gp, session_type, 0, 0.0, skipped=True)
+        started = time.perf_counter()
+        error = None
+        for attempt in range(1, retries + 2):
+            try:
+                data = SessionData(year, gp, session_type, cache_dir, get_session)
+                session = data.ensure(*data_classes)
+                # fastf1は取得に失敗しても例外にせずラップを空にすることがある
+                if session.laps is None or len(session.laps) == 0:
+                    raise RuntimeError("ラップデータがありません")
+                if manifest is not None:
+                    manifest.mark(year, gp, session_type, data.loaded)
+                return PrefetchResult(year, gp, session_type, attempt, time.perf_counter() - started)
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                if attempt <= retries:
+                    sleep(backoff * 2 ** (attempt - 1))
+        return PrefetchResult(year, gp, session_type, retries + 1, time.perf_counter() - started, error)
+
+    if not targets:
+        return []
+    results = []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(targets)), thread_name_prefix="f1-prefetch") as pool:
+        futures = [pool.submit(task, target) for target in targets]
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results.append(result)
+            if progress:
+                progress(done, len(targets), result)
+    order = {target: i for i, target in enumerate(targets)}
+    return sorted(results, key=lambda r: order[(r.year, r.gp, r.session_type)])
+
+
+class SeasonPrefetcher:
+    """アプリからシーズンの先読みをバックグラウンドで実行する
+
+    Streamlitのサーバープロセスの中で読み込むため、先読みは同時に1つ、
+    セッションも1件ずつ読み込む（読み込んだデータはすぐに捨てる）。
+    """
+
+    def __init__(self, cache_dir: str = "cache", get_session: Optional[Callable] = None):
+        self.cache_dir = cache_dir
+        self.get_session = get_session
+        self.manifest = WarmManifest(os.path.join(cache_dir, MANIFEST_FILE))
+        self.done = 0
+        self.total = 0
+        self._future: Optional[Future] = None
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="season-prefetch")
+
+    def start(self, targets: Iterable[Target], data_classes: Iterable[str] = ("laps",)) -> Future:
+        """先読みを始める（実行中なら同じFutureを返す）"""
+        with self._lock:
+            if self._future is None or self._future.done():
+                targets = list(targets)
+                self.done, self.total = 0, len(targets)
+                self._future = self._pool.submit(
+                    prefetch_sessions, targets, tuple(data_classes), self.cache_dir, self.get_session,
+                    self.manifest, max_workers=1, progress=self._progress,
+                )
+            return self._future
+
+    def _progress(self, done: int, total: int, result: PrefetchResult) -> None:
+        self.done = done
+
+    @property
+    def running(self) -> bool:
+        with self._lock:
+            return self._future is not None and not self._future.done()
+
+
+class FixtureSession:
+    """ローカルのラップ表（CSV）から作るテスト用のセッション
+
+    CSVの列はfastf1のラップと同じ名前で、"Time" で終わる列は秒で書く。
+    ファイルが無いセッションは読み込み時に FileNotFoundError になる。
+    """
+
+    def __init__(self, path: str, year: int, gp: str, session_type: str):
+        self.path = path
+        self.api_path = f"/static/{year}/{gp.replace(' ', '_')}/{session_type.replace(' ', '_')}/"
+        self.laps = None
+
+    def load(self, laps: bool = True, **kwargs) -> None:
+        frame = pd.read_csv(self.path)
+        for column in frame.columns:
+            if column.endswith("Time"):
+                frame[column] = pd.to_timedelta(frame[column], unit="s")
+        self.laps = frame
+
+    def _load_telemetry(self) -> None:
+        pass
+
+    def _load_weather_data(self) -> None:
+        pass
+
+
+def fixture_get_session(root: str) -> Callable:
+    """root/<年>/<グランプリ>/<セッション>.csv からセッションを作る取得関数"""
+
+    def get_session(year: int, gp: str, session_type: str) -> FixtureSession:
+        return FixtureSession(os.path.join(root, str(year), gp, f"{session_type}.csv"), year, gp, session_type)
+
+    return get_session
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="シーズンのF1セッションを読み込んでfastf1のキャッシュを温める")
+    parser.add_argument("--year", type=int, nargs="+", default=[SEASONS[0]], choices=SEASONS)
+    parser.add_argument("--session", nargs="+", default=["Race"], choices=SESSION_TYPES)
+    parser.add_argument("--data-classes", nargs="+", default=["laps"], choices=DATA_CLASSES,
+                        help="読み込むデータの種類（ラップは常に含む）")
+    parser.add_argument("--cache", default="cache")
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--backoff", type=float, default=2.0, help="最初の再試行までの秒数（以降は倍）")
+    parser.add_argument("--fixture", help="fastf1の代わりに使うラップ表CSVのディレクトリ")
+    parser.add_argument("--force", action="store_true", help="温まっているセッションも読み込み直す")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.cache, exist_ok=True)
+    if args.fixture:
+        get_session = fixture_get_session(args.fixture)
+    else:
+        import fastf1
+
+        fastf1.Cache.enable_cache(args.cache)
+        fastf1.set_log_level("WARNING")
+        get_session = None
+    manifest = WarmManifest(os.path.join(args.cache, MANIFEST_FILE))
+    targets = season_targets(args.year, args.session)
+
+    def progress(done, total, result):
+        if result.skipped:
+            state = "温まっています"
+        elif result.ok:
+            state = f"{result.seconds:.1f}秒（{result.attempts}回目）"
+        else:
+            state = f"失敗: {result.error}"
+        print(f"[{done}/{total}] {result.year} {result.gp} {result.session_type}: {state}")
+
+    results = prefetch_sessions(
+        targets, data_classes=args.data_classes, cache_dir=args.cache, get_session=get_session, manifest=manifest,
+        max_workers=args.workers, retries=args.retries, backoff=args.backoff, force=args.force, progress=progress,
+    )
+    failures = [r for r in results if not r.ok]
+    for result in failures:
+        print(f"エラー: {result.year} {result.gp} {result.session_type}: {result.error}", file=sys.stderr)
+    print(f"{len(results) - len(failures)}/{len(results)}件のセッションが温まっています（{args.cache}）")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
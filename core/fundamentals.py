@@ -0,0 +1,127 @@
+"""企業情報（ファンダメンタルズ）のキャッシュ
+
+yfinanceの ``Ticker.info`` は遅く、内容も1日に1回程度しか変わらないため、
+価格履歴とは別にティッカーごとのJSONへ保存し、有効期限は1日とする。
+取得はバックグラウンドのスレッドで行い、呼び出し側は待たずに
+キャッシュ済みの値（期限切れでも）を受け取れる。
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+# 画面に表示する項目だけを保存する
+FIELDS = [
+    "longName", "sector", "industry", "marketCap", "trailingPE", "priceToBook",
+    "dividendYield", "fiftyTwoWeekHigh", "fiftyTwoWeekLow",
+]
+
+Fetcher = Callable[[str], dict]
+
+
+def yfinance_fetcher(ticker: str) -> dict:
+    """yfinanceから企業情報を取得する（デフォルトの取得関数）"""
+    import yfinance as yf
+
+    return yf.Ticker(ticker).info
+
+
+class FundamentalsCache:
+    """ティッカーごとの企業情報をディスクとメモリにキャッシュする"""
+
+    def __init__(
+        self,
+        root: str = "data/fundamentals",
+        fetcher: Optional[Fetcher] = None,
+        ttl: timedelta = timedelta(days=1),
+        retry_after: timedelta = timedelta(minutes=1),
+        max_workers: int = 2,
+        clock: Optional[Callable[[], datetime]] = None,
+    ):
+        self.root = root
+        self.fetcher = fetcher or yfinance_fetcher
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self._entries: dict[str, tuple[datetime, dict]] = {}
+        self._pending: dict[str, Future] = {}
+        self._errors: dict[str, tuple[datetime, str]] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fundamentals")
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker.replace('/', '_').replace('^', '_')}.json")
+
+    def _load(self, ticker: str) -> Optional[tuple[datetime, dict]]:
+        if ticker in self._entries:
+            return self._entries[ticker]
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        entry = (datetime.fromisoformat(data["fetched_at"]), data["info"])
+        self._entries[ticker] = entry
+        return entry
+
+    def _fetch(self, ticker: str) -> dict:
+        try:
+            raw = self.fetcher(ticker) or {}
+            info = {k: raw[k] for k in FIELDS if k in raw}
+            fetched_at = self.clock()
+            os.makedirs(self.root, exist_ok=True)
+            path = self._path(ticker)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"fetched_at": fetched_at.isoformat(), "info": info}, f, ensure_ascii=False, default=str)
+            os.replace(path + ".tmp", path)
+            with self._lock:
+                self._entries[ticker] = (fetched_at, info)
+                self._errors.pop(ticker, None)
+            return info
+        except Exception as e:
+            with self._lock:
+                self._errors[ticker] = (self.clock(), str(e))
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(ticker, None)
+
+    def refresh(self, ticker: str) -> Future:
+        """バックグラウンドでの再取得を予約する（実行中なら同じFutureを返す）"""
+        with self._lock:
+            future = self._pending.get(ticker)
+            if future is None:
+                future = self._pool.submit(self._fetch, ticker)
+                self._pending[ticker] = future
+            return future
+
+    def get_nowait(self, ticker: str) -> Optional[dict]:
+        """キャッシュ済みの値をすぐに返す。未取得・期限切れならバックグラウンドで取得を始める"""
+        now = self.clock()
+        with self._lock:
+            entry = self._load(ticker)
+            failed = ticker in self._errors and now - self._errors[ticker][0] < self.retry_after
+        if (entry is None or now - entry[0] >= self.ttl) and not failed:
+            self.refresh(ticker)
+        return entry[1] if entry else None
+
+    def get(self, ticker: str, timeout: Optional[float] = None) -> dict:
+        """値が得られるまで待って返す"""
+        info = self.get_nowait(ticker)
+        if info is not None:
+            return info
+        return self.refresh(ticker).result(timeout=timeout)
+
+    def is_loading(self, ticker: str) -> bool:
+        with self._lock:
+            return ticker in self._pending
+
+    def error(self, ticker: str) -> Optional[str]:
+        """直近の取得失敗の理由"""
+        with self._lock:
+            error = self._errors.get(ticker)
+        return error[1] if error else None
@@ -0,0 +1,194 @@
+"""店舗住所の一括ジオコーディング
+
+list_store.txt で緯度経度が空の店舗について、住所から座標を求めて
+SQLiteのキャッシュ（正規化した住所がキー）に保存する。結果は1件ごとに
+コミットするので、途中で止めても再実行すれば未取得の住所だけを処理する。
+店舗データセットのビルド時にこのキャッシュで空の緯度経度を補う。
+
+ジオコーダーは差し替え可能で、デフォルトはgeopyのNominatim。
+ネットワークなしで試すときは ``--fixture`` で住所→座標のJSONを渡す。
+
+使い方: python -m core.geocoding [--source list_store.txt] [--cache data/geocode.sqlite]
+                                 [--fixture 座標.json] [--rate 1.0] [--workers 4]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Optional
+
+DEFAULT_CACHE = "data/geocode.sqlite"
+
+# ジオコーダーの型: 住所 -> (緯度, 経度)。見つからなければ None
+Geocoder = Callable[[str], Optional[tuple[float, float]]]
+
+
+def normalize_address(address: str) -> str:
+    """キャッシュのキーにする住所（全角英数の統一・郵便番号と空白の除去）"""
+    address = unicodedata.normalize("NFKC", address)
+    address = re.sub(r"〒?\d{3}-\d{4}", "", address)
+    return re.sub(r"\s+", "", address)
+
+
+def nominatim_geocoder(user_agent: str = "ito-yokado-store-map", timeout: float = 10) -> Geocoder:
+    """geopyのNominatimを使うジオコーダー（デフォルト）"""
+    from geopy.geocoders import Nominatim
+
+    nominatim = Nominatim(user_agent=user_agent, timeout=timeout)
+
+    def geocode(address: str) -> Optional[tuple[float, float]]:
+        location = nominatim.geocode(address, country_codes="jp")
+        return (location.latitude, location.longitude) if location else None
+
+    return geocode
+
+
+def fixture_geocoder(path: str) -> Geocoder:
+    """住所→[緯度, 経度] のJSONから引くだけのジオコーダー（ネットワーク不要）"""
+    with open(path, "r", encoding="utf-8") as f:
+        table = {normalize_address(k): tuple(v) for k, v in json.load(f).items()}
+    return lambda address: table.get(normalize_address(address))
+
+
+class RateLimit:
+    """複数スレッドで共有する呼び出し間隔の制限（1秒あたり rate 回まで）"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class GeocodeCache:
+    """正規化した住所をキーにしたジオコーディング結果のSQLiteキャッシュ
+
+    見つからなかった住所も緯度経度NULLで保存し、再実行時に問い合わせない。
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                " address TEXT PRIMARY KEY, lat REAL, lon REAL, geocoded_at TEXT NOT NULL)"
+            )
+
+    def __contains__(self, address: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM geocode WHERE address = ?", (normalize_address(address),)
+            ).fetchone()
+        return row is not None
+
+    def get(self, address: str) -> Optional[tuple[float, float]]:
+        """キャッシュ済みの座標（未取得・見つからなかった住所は None）"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT lat, lon FROM geocode WHERE address = ?", (normalize_address(address),)
+            ).fetchone()
+        return (row[0], row[1]) if row and row[0] is not None else None
+
+    def put(self, address: str, coords: Optional[tuple[float, float]]) -> None:
+        lat, lon = coords if coords else (None, None)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?)",
+                (normalize_address(address), lat, lon, datetime.now(timezone.utc).isoformat()),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def geocode_addresses(
+    addresses: Iterable[str],
+    geocoder: Geocoder,
+    cache: GeocodeCache,
+    rate: float = 1.0,
+    max_workers: int = 4,
+    progress: Optional[Callable[[int, int, str, Optional[tuple[float, float]]], None]] = None,
+) -> tuple[dict[str, Optional[tuple[float, float]]], dict[str, str]]:
+    """キャッシュに無い住所だけを並列にジオコーディングし、(結果, 失敗) を返す
+
+    問い合わせは全スレッド合計で1秒あたり rate 回までに抑える。例外になった住所は
+    キャッシュせず失敗として返すので、再実行時にもう一度問い合わせる。
+    """
+    pending = list(dict.fromkeys(a for a in addresses if a not in cache))
+    limit = RateLimit(rate)
+    results, failures = {}, {}
+
+    def task(address: str) -> Optional[tuple[float, float]]:
+        limit.wait()
+        coords = geocoder(address)
+        cache.put(address, coords)
+        return coords
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="geocode") as pool:
+        futures = {pool.submit(task, address): address for address in pending}
+        for done, future in enumerate(as_completed(futures), start=1):
+            address = futures[future]
+            try:
+                results[address] = future.result()
+            except Exception as e:
+                failures[address] = str(e)
+            if progress:
+                progress(done, len(pending), address, results.get(address))
+    return results, failures
+
+
+def main(argv: list[str]) -> int:
+    from core.store_data import DEFAULT_SOURCE, read_store_table
+
+    parser = argparse.ArgumentParser(description="緯度経度が空の店舗の住所をジオコーディングする")
+    parser.add_argument("--source", default=DEFAULT_SOURCE)
+    parser.add_argument("--cache", default=DEFAULT_CACHE)
+    parser.add_argument("--fixture", help="Nominatimの代わりに使う 住所→[緯度, 経度] のJSON")
+    parser.add_argument("--rate", type=float, default=1.0, help="1秒あたりの最大問い合わせ数")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    raw = read_store_table(args.source)
+    missing = raw[(raw["No"] != "") & ((raw["緯度"] == "") | (raw["経度"] == ""))]
+    geocoder = fixture_geocoder(args.fixture) if args.fixture else nominatim_geocoder()
+    cache = GeocodeCache(args.cache)
+    cached = sum(address in cache for address in missing["住所"])
+    print(f"緯度経度が空の店舗: {len(missing)}件（キャッシュ済み: {cached}件）")
+
+    def progress(done, total, address, coords):
+        print(f"[{done}/{total}] {address} -> {coords if coords else '見つかりません'}")
+
+    results, failures = geocode_addresses(
+        missing["住所"], geocoder, cache, rate=args.rate, max_workers=args.workers, progress=progress
+    )
+    for address, error in failures.items():
+        print(f"エラー: {address}: {error}", file=sys.stderr)
+    print(f"{len(results)}件を取得しました（{args.cache}）")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,195 @@
+"""テクニカル指標の計算エンジン
+
+終値の連続したfloat配列からMA・RSI・MACD・ボリンジャーバンドをまとめて計算する。
+入力は1次元（1銘柄）または2次元（銘柄 × 日付）の配列で、最後の軸を時系列とみなす。
+結果はpandasの ``rolling`` / ``ewm(adjust=False)`` と同じ値になる。ただし終値の
+欠損（NaN）は、EMA（MACD）では直前の終値で埋めて計算する（IIRフィルタでは
+1つのNaNがそれ以降のすべての値に伝わるため）。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+MA_WINDOWS = (5, 25, 75)
+RSI_WINDOW = 14
+BB_WINDOW = 20
+BB_K = 2.0
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+
+# 逐次更新で保持する終値の本数
+_KEEP = max(max(MA_WINDOWS), BB_WINDOW)
+
+INDICATOR_COLUMNS = [f"MA{w}" for w in MA_WINDOWS] + [
+    "RSI", "MACD", "Signal", "Histogram", "BB_middle", "BB_upper", "BB_lower",
+]
+
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] >= window:
+        out[..., window - 1:] = sliding_window_view(x, window, axis=-1).mean(axis=-1)
+    return out
+
+
+def _ffill(x: np.ndarray) -> np.ndarray:
+    """最後の軸に沿ってNaNを直前の値で埋める（先頭のNaNはそのまま）"""
+    index = np.where(np.isnan(x), 0, np.arange(x.shape[-1]))
+    np.maximum.accumulate(index, axis=-1, out=index)
+    return np.take_along_axis(x, index, axis=-1)
+
+
+def _ewm(x: np.ndarray, span: int) -> np.ndarray:
+    """ewm(span, adjust=False).mean() と同じ再帰式をIIRフィルタで計算する
+
+    途中のNaNは直前の値で埋め、最初の有効な値より前はNaNのままにする。
+    """
+    alpha = 2.0 / (span + 1)
+    x = _ffill(x)
+    leading = np.isnan(x)
+    if leading.any():
+        first = np.take_along_axis(x, np.argmax(~leading, axis=-1)[..., None], axis=-1)
+        x = np.where(leading, first, x)
+    zi = (1 - alpha) * x[..., :1]
+    y, _ = lfilter([alpha], [1.0, alpha - 1.0], x, axis=-1, zi=zi)
+    y[leading] = np.nan
+    return y
+
+
+def _rsi_from_means(gain: np.ndarray, loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + gain / loss)
+
+
+def compute_indicators(close: np.ndarray) -> dict[str, np.ndarray]:
+    """全指標を計算して ``{列名: 配列}`` を返す"""
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    result = {}
+
+    for w in MA_WINDOWS:
+        result[f"MA{w}"] = _rolling_mean(close, w)
+
+    # RSI（先頭の差分は0として扱う）
+    delta = np.zeros_like(close)
+    delta[..., 1:] = np.diff(close, axis=-1)
+    gain = _rolling_mean(np.where(delta > 0, delta, 0.0), RSI_WINDOW)
+    loss = _rolling_mean(np.where(delta < 0, -delta, 0.0), RSI_WINDOW)
+    result["RSI"] = _rsi_from_means(gain, loss)
+
+    # MACD
+    if close.shape[-1]:
+        macd = _ewm(close, MACD_FAST) - _ewm(close, MACD_SLOW)
+        signal = _ewm(macd, MACD_SIGNAL)
+    else:
+        macd = signal = np.empty_like(close)
+    result["MACD"] = macd
+    result["Signal"] = signal
+    result["Histogram"] = macd - signal
+
+    # ボリンジャーバンド（平均と標準偏差で同じ窓を共有する）
+    middle = np.full(close.shape, np.nan)
+    std = np.full(close.shape, np.nan)
+    if close.shape[-1] >= BB_WINDOW:
+        windows = sliding_window_view(close, BB_WINDOW, axis=-1)
+        middle[..., BB_WINDOW - 1:] = windows.mean(axis=-1)
+        std[..., BB_WINDOW - 1:] = windows.std(axis=-1, ddof=1)
+    result["BB_middle"] = middle
+    result["BB_upper"] = middle + BB_K * std
+    result["BB_lower"] = middle - BB_K * std
+
+    return result
+
+
+def annualized_stats(close: np.ndarray, periods_per_year: int = 252) -> tuple[float, float]:
+    """日次リターンから年率ボラティリティ(%)とシャープレシオ（リスクフリーレート0%）を返す"""
+    close = np.asarray(close, dtype=np.float64)
+    if len(close) < 3:
+        return np.nan, np.nan
+    returns = close[1:] / close[:-1] - 1
+    std = returns.std(ddof=1)
+    sharpe = returns.mean() / std * np.sqrt(periods_per_year) if std > 0 else np.nan
+    return std * np.sqrt(periods_per_year) * 100, sharpe
+
+
+def add_indicators(df):
+    """OHLCVのDataFrameに指標列を追加した新しいDataFrameを返す（引数は変更しない）"""
+    if df.empty:
+        return df
+    return df.assign(**compute_indicators(df["Close"].to_numpy()))
+
+
+@dataclass
+class IndicatorState:
+    """1本ずつバーを追加するための計算状態（1銘柄分）"""
+    closes: np.ndarray = field(default_factory=lambda: np.empty(0))
+    gains: np.ndarray = field(default_factory=lambda: np.empty(0))
+    losses: np.ndarray = field(default_factory=lambda: np.empty(0))
+    ema_fast: float = np.nan
+    ema_slow: float = np.nan
+    signal: float = np.nan
+    last_close: float = np.nan  # EMAで使う直前の有効な終値
+
+    @classmethod
+    def from_history(cls, close: np.ndarray) -> "IndicatorState":
+        """既存の終値系列から状態を復元する"""
+        close = np.asarray(close, dtype=np.float64)
+        delta = np.diff(close, prepend=close[:1])
+        state = cls(
+            closes=close[-_KEEP:].copy(),
+            gains=np.where(delta > 0, delta, 0.0)[-RSI_WINDOW:],
+            losses=np.where(delta < 0, -delta, 0.0)[-RSI_WINDOW:],
+        )
+        if len(close):
+            fast, slow = _ewm(close, MACD_FAST), _ewm(close, MACD_SLOW)
+            state.ema_fast, state.ema_slow = fast[-1], slow[-1]
+            state.signal = _ewm(fast - slow, MACD_SIGNAL)[-1]
+            state.last_close = _ffill(close)[-1]
+        return state
+
+    def update(self, close: float) -> dict[str, float]:
+        """新しい終値を1本追加し、そのバーの指標値を返す
+
+        終値の欠損（NaN）は ``compute_indicators`` と同じに扱う（EMAは直前の
+        有効な終値で埋め、RSIの差分は0、NaNを含む窓のMA・BBはNaN）。
+        """
+        delta = close - self.closes[-1] if len(self.closes) else 0.0
+        self.closes = np.append(self.closes, close)[-_KEEP:]
+        self.gains = np.append(self.gains, delta if delta > 0 else 0.0)[-RSI_WINDOW:]
+        self.losses = np.append(self.losses, -delta if delta < 0 else 0.0)[-RSI_WINDOW:]
+
+        if not np.isnan(close):
+            self.last_close = close
+        close = self.last_close
+        if np.isnan(close):
+            pass  # 有効な終値がまだ無い
+        elif np.isnan(self.ema_fast):
+            self.ema_fast = self.ema_slow = close
+            self.signal = 0.0
+        else:
+            a_fast, a_slow, a_sig = (2.0 / (s + 1) for s in (MACD_FAST, MACD_SLOW, MACD_SIGNAL))
+            self.ema_fast += a_fast * (close - self.ema_fast)
+            self.ema_slow += a_slow * (close - self.ema_slow)
+            self.signal += a_sig * ((self.ema_fast - self.ema_slow) - self.signal)
+
+        row = {}
+        for w in MA_WINDOWS:
+            row[f"MA{w}"] = self.closes[-w:].mean() if len(self.closes) >= w else np.nan
+        if len(self.gains) >= RSI_WINDOW:
+            row["RSI"] = float(_rsi_from_means(np.float64(self.gains.mean()), np.float64(self.losses.mean())))
+        else:
+            row["RSI"] = np.nan
+        row["MACD"] = self.ema_fast - self.ema_slow
+        row["Signal"] = self.signal
+        row["Histogram"] = row["MACD"] - self.signal
+        if len(self.closes) >= BB_WINDOW:
+            window = self.closes[-BB_WINDOW:]
+            middle, std = window.mean(), window.std(ddof=1)
+        else:
+            middle = std = np.nan
+        row["BB_middle"] = middle
+        row["BB_upper"] = middle + BB_K * std
+        row["BB_lower"] = middle - BB_K * std
+        return row
@@ -0,0 +1,85 @@
+"""分足データの逐次更新
+
+ローカルキャッシュから最新の分足を取得し、新しく増えたバー（と確定前だった
+最終バー）についてだけ指標を計算し直してフレームに追加する。
+"""
+from __future__ import annotations
+
+import copy
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pandas as pd
+
+from core.indicators import INDICATOR_COLUMNS, IndicatorState, add_indicators
+from core.price_store import PriceStore, market_for
+
+# 足種ごとの取得可能期間（yfinanceの制約: 1分足は7日、5分足は60日まで）
+INTRADAY_PERIODS = {
+    "5m": {"1日": 1, "5日": 5, "1ヶ月": 30, "60日": 59},
+    "1m": {"1日": 1, "3日": 3, "7日": 7},
+}
+
+
+def bars_per_year(ticker: str, interval: str) -> int:
+    """年率換算に使う1年あたりのバー数"""
+    if interval == "1d":
+        return 252
+    return 252 * market_for(ticker).session_minutes // int(interval.rstrip("m"))
+
+
+class IntradayFeed:
+    """1銘柄・1足種の分足フレーム（指標付き）を保持し、末尾だけを更新する"""
+
+    def __init__(
+        self,
+        store: PriceStore,
+        ticker: str,
+        interval: str,
+        lookback: timedelta,
+        min_refresh: timedelta = timedelta(seconds=30),
+    ):
+        self.store = store
+        self.ticker = ticker
+        self.interval = interval
+        self.lookback = lookback
+        self.min_refresh = min_refresh
+        self.frame = pd.DataFrame()
+        self.updated_at: Optional[datetime] = None
+        self._state_before_last: Optional[IndicatorState] = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> int:
+        """最新のバーを取り込み、新しく追加されたバーの本数を返す"""
+        with self._lock:
+            now = self.store.clock()
+            if self.updated_at and now - self.updated_at < self.min_refresh:
+                return 0
+            self.updated_at = now
+            latest = self.store.get(self.ticker, now - self.lookback, now, self.interval)
+            if latest.empty:
+                return 0
+
+            if self.frame.empty:
+                self.frame = add_indicators(latest.copy())
+                self._state_before_last = IndicatorState.from_history(latest["Close"].to_numpy()[:-1])
+                return len(latest)
+
+            # 最終バーは確定前の値で計算しているので、1本前の状態から計算し直す
+            last_ts = self.frame.index[-1]
+            tail = latest[latest.index >= last_ts].copy()
+            if tail.empty:
+                return 0
+            state = copy.deepcopy(self._state_before_last)
+            rows = []
+            for close in tail["Close"].to_numpy():
+                before_last = copy.deepcopy(state)
+                rows.append(state.update(close))
+            for column in INDICATOR_COLUMNS:
+                tail[column] = [row[column] for row in rows]
+
+            frame = pd.concat([self.frame[self.frame.index < last_ts], tail])
+            self.frame = frame[frame.index >= now - self.lookback]
+            self._state_before_last = before_last
+            return int((tail.index > last_ts).sum())
@@ -0,0 +1,104 @@
+"""ラップの特徴量テーブルと集計
+
+fastf1のラップ（Timedelta列）から、秒単位のラップ・セクタータイム、タイヤ、
+スティント、タイヤ寿命と、外れ値判定に使う中央値を1回だけ計算して
+特徴量テーブルにする。各表示の集計はこのテーブルに対するgroupbyで求める。
+外れ値はどの集計でも「中央値の±10%の外」とする。
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+SECTOR_COLUMNS = ["Sector1Seconds", "Sector2Seconds", "Sector3Seconds"]
+OUTLIER_TOLERANCE = 0.1
+
+
+def _seconds(laps: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in laps.columns:
+        return np.full(len(laps), np.nan)
+    return pd.to_timedelta(laps[column]).dt.total_seconds().to_numpy()
+
+
+def _column(laps: pd.DataFrame, column: str, default=np.nan) -> np.ndarray:
+    return laps[column].to_numpy() if column in laps.columns else np.full(len(laps), default, dtype=object)
+
+
+def build_lap_features(laps: pd.DataFrame) -> pd.DataFrame:
+    """ラップデータから特徴量テーブルを作る（元のラップと同じ行順）"""
+    features = pd.DataFrame({
+        "Driver": laps["Driver"].to_numpy(),
+        "LapNumber": laps["LapNumber"].to_numpy(),
+        "Stint": _column(laps, "Stint"),
+        "Compound": _column(laps, "Compound", None),
+        "TyreLife": _column(laps, "TyreLife"),
+        "LapTimeSeconds": _seconds(laps, "LapTime"),
+        "Sector1Seconds": _seconds(laps, "Sector1Time"),
+        "Sector2Seconds": _seconds(laps, "Sector2Time"),
+        "Sector3Seconds": _seconds(laps, "Sector3Time"),
+    })
+    # 外れ値判定用の中央値（セッション全体・ドライバー別・ドライバー×タイヤ別）
+    lap_time = features["LapTimeSeconds"]
+    features["SessionMedian"] = lap_time.median()
+    features["DriverMedian"] = lap_time.groupby(features["Driver"]).transform("median")
+    features["CompoundMedian"] = lap_time.groupby(
+        [features["Driver"], features["Compound"]], dropna=False
+    ).transform("median")
+    return features
+
+
+def within_median(values: pd.Series, median, tolerance: float = OUTLIER_TOLERANCE) -> pd.Series:
+    """中央値の±tolerance以内か（NaNはFalse）"""
+    return (values < median * (1 + tolerance)) & (values > median * (1 - tolerance))
+
+
+def clean_laps(features: pd.DataFrame, drivers=None) -> pd.DataFrame:
+    """セッション全体の中央値で外れ値を除いたラップ（driversを渡すとそのドライバーだけ）"""
+    keep = within_median(features["LapTimeSeconds"], features["SessionMedian"])
+    if drivers is not None:
+        keep &= features["Driver"].isin(drivers)
+    return features[keep]
+
+
+def lap_time_stats(laps: pd.DataFrame) -> pd.DataFrame:
+    """ドライバー別のラップタイム統計（平均の速い順）"""
+    stats = laps.groupby("Driver")["LapTimeSeconds"].agg(["mean", "min", "max", "std", "size"]).reset_index()
+    stats.columns = ["ドライバー", "平均 (秒)", "最速 (秒)", "最遅 (秒)", "標準偏差", "ラップ数"]
+    return stats.sort_values("平均 (秒)")
+
+
+def sector_means(features: pd.DataFrame, drivers, labels=("セクター1", "セクター2", "セクター3")) -> pd.DataFrame:
+    """ドライバー別のセクター平均タイム（driversの順。セクタータイムが欠けるドライバーは除く）"""
+    means = features[features["Driver"].isin(drivers)].groupby("Driver")[SECTOR_COLUMNS].mean()
+    means = means.reindex(list(drivers)).dropna()
+    means.columns = list(labels)
+    return means.rename_axis("ドライバー").reset_index()
+
+
+def compound_pace(features: pd.DataFrame, drivers) -> pd.DataFrame:
+    """ドライバー×タイヤ別の平均ラップタイム（ドライバー×タイヤごとの中央値で外れ値を除く）"""
+    laps = features[
+        features["Driver"].isin(drivers)
+        & features["Compound"].notna()
+        & within_median(features["LapTimeSeconds"], features["CompoundMedian"])
+    ]
+    pace = laps.groupby(["Driver", "Compound"], sort=False)["LapTimeSeconds"].agg(["mean", "size"]).reset_index()
+    pace.columns = ["ドライバー", "タイヤ", "平均ラップタイム (秒)", "ラップ数"]
+    order = {driver: i for i, driver in enumerate(drivers)}
+    return pace.sort_values("ドライバー", key=lambda d: d.map(order), kind="stable").reset_index(drop=True)
+
+
+def pace_stability(features: pd.DataFrame, drivers) -> pd.DataFrame:
+    """ドライバー別のペース安定性（ドライバーごとの中央値で外れ値を除き、2周以上あるドライバーのみ）"""
+    selected = features[features["Driver"].isin(drivers)]
+    valid_counts = selected.groupby("Driver")["LapTimeSeconds"].count()
+    laps = selected[within_median(selected["LapTimeSeconds"], selected["DriverMedian"])]
+    stats = laps.groupby("Driver")["LapTimeSeconds"].agg(["std", "mean", "size"])
+    stats = stats[(stats["size"] > 1) & (valid_counts.reindex(stats.index) > 1)]
+    result = pd.DataFrame({
+        "ドライバー": stats.index,
+        "標準偏差 (秒)": stats["std"].to_numpy(),
+        "平均 (秒)": stats["mean"].to_numpy(),
+        "変動係数 (%)": (stats["std"] / stats["mean"] * 100).to_numpy(),
+    })
+    return result.sort_values("標準偏差 (秒)").reset_index(drop=True)
@@ -0,0 +1,285 @@
+"""アプリのメトリクス（Prometheusのテキスト形式）
+
+各ページがデータ取得の時間・キャッシュのヒット数・再実行の時間などを
+プロセス内のレジストリに記録し、別ポートのHTTPサーバー（/metrics）で
+テキスト形式（version 0.0.4）として返す。レプリカごとにスクレイプする想定で、
+ライブラリには依存しない。
+
+ヒット数などを自分で数えているキャッシュ（hits / misses 属性を持つもの）は
+``Registry.track_cache`` で登録しておくと、スクレイプ時に値を読む。
+
+使い方: python -m core.metrics [URL]   # スクレイプして値を表示する（既定は http://localhost:9101/metrics）
+"""
+from __future__ import annotations
+
+import math
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+DEFAULT_PORT = 9101
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 秒単位の既定のバケット（10 ms〜1分）
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} のラベルは {self.labelnames} です: {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self.samples())
+
+
+class Counter(_Metric):
+    """増えるだけの値"""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """任意に上下する値（関数を渡すとスクレイプ時に呼んで値を読む）"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._functions: dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, func: Callable[[], float], **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = func
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, func in functions.items():
+            try:
+                values[key] = float(func())
+            except Exception:  # 読めない値はその回だけ出さない
+                values.pop(key, None)
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    """値の分布（バケットごとの累積件数・合計・件数）"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, list(c), self._sums[k]) for k, c in self._counts.items())
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """メトリクスの登録先（同じ名前で登録すると既存のものを返す）"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.cache_hits = self.counter_function(
+            "app_cache_hits_total", "キャッシュのヒット数", ("cache",))
+        self.cache_misses = self.counter_function(
+            "app_cache_misses_total", "キャッシュのミス数", ("cache",))
+
+    def _get(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} は {metric.kind} として登録済みです")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._get(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._get(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, labelnames, buckets)
+
+    def counter_function(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        """スクレイプ時に値を読むカウンター（値は呼び出し側が数える）"""
+        metric = self._get(Gauge, name, help, labelnames)
+        metric.kind = "counter"
+        return metric
+
+    def track_cache(self, name: str, cache) -> None:
+        """hits / misses 属性を持つキャッシュをヒット数・ミス数として公開する"""
+        self.cache_hits.set_function(lambda: cache.hits, cache=name)
+        self.cache_misses.set_function(lambda: cache.misses, cache=name)
+
+    def render(self) -> str:
+        """テキスト形式（version 0.0.4）"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+# 各ページが更新する共通のメトリクス
+FETCH_SECONDS = REGISTRY.histogram(
+    "app_fetch_seconds", "外部データの取得時間（秒）", ("source", "kind"))
+FETCH_ERRORS = REGISTRY.counter(
+    "app_fetch_errors_total", "外部データの取得の失敗数", ("source", "kind"))
+RERUN_SECONDS = REGISTRY.histogram(
+    "app_rerun_seconds", "Streamlitの再実行時間（秒）", ("page", "scope"))
+
+
+def timed(func: Callable, source: str, kind: str) -> Callable:
+    """関数の呼び出し時間を app_fetch_seconds に、例外を app_fetch_errors_total に記録する"""
+
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            FETCH_ERRORS.inc(source=source, kind=kind)
+            raise
+        finally:
+            FETCH_SECONDS.observe(time.perf_counter() - started, source=source, kind=kind)
+
+    return wrapper
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """/metrics でレジストリの内容を返す"""
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/metrics/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header('Content-type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # スクレイプのたびにログを出さない
+
+
+def start_server(port: int = DEFAULT_PORT, host: str = "0.0.0.0", registry: Registry = REGISTRY) -> ThreadingHTTPServer:
+    """メトリクスのHTTPサーバーをデーモンスレッドで起動する"""
+    handler = type("Handler", (MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*\})?\s+(\S+)$')
+
+
+def parse_text(text: str) -> dict[tuple[str, str], float]:
+    """テキスト形式を {(名前, ラベル): 値} にする（確認用）"""
+    samples = {}
+    for line in text.splitlines():
+        match = _SAMPLE.match(line)
+        if match and not line.startswith("#"):
+            samples[(match.group(1), match.group(2) or "")] = float(match.group(3))
+    return samples
+
+
+def main(argv: list[str]) -> int:
+    import urllib.request
+
+    url = argv[0] if argv else f"http://localhost:{DEFAULT_PORT}/metrics"
+    with urllib.request.urlopen(url, timeout=5) as response:
+        samples = parse_text(response.read().decode("utf-8"))
+    for (name, labels), value in samples.items():
+        if not name.endswith("_bucket"):
+            print(f"{name}{labels} {_format_value(value)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
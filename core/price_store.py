@@ -0,0 +1,232 @@
+"""株価OHLCVデータのローカルキャッシュ
+
+ティッカーごとにParquetファイルへ価格履歴を保存し、取得済みの期間は
+ネットワークに問い合わせずに返す。足りない先頭・末尾の期間だけを
+ダウンローダーで補完する。ダウンローダーは差し替え可能なので、
+ネットワークなしでもフェイクを渡して動作確認できる。
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import Callable, Optional
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+# ダウンローダーの型: (ticker, start, end, interval) -> DataFrame
+Downloader = Callable[[str, datetime, datetime, str], pd.DataFrame]
+
+
+def yfinance_downloader(ticker: str, start: datetime, end: datetime, interval: str = "1d") -> pd.DataFrame:
+    """yfinanceから価格履歴を取得する（デフォルトのダウンローダー）"""
+    import yfinance as yf
+
+    return yf.Ticker(ticker).history(start=start, end=end, interval=interval)
+
+
+@dataclass(frozen=True)
+class MarketHours:
+    """取引所の立会時間（昼休みがあれば lunch に開始・終了時刻）"""
+    tz: str
+    open: time
+    close: time
+    lunch: Optional[tuple[time, time]] = None
+
+    def is_open(self, now: datetime) -> bool:
+        local = now.astimezone(ZoneInfo(self.tz))
+        if self.lunch and self.lunch[0] <= local.time() < self.lunch[1]:
+            return False
+        return local.weekday() < 5 and self.open <= local.time() < self.close
+
+    @property
+    def session_minutes(self) -> int:
+        """1日の立会時間（分、昼休みを除く）"""
+        minutes = _minutes(self.close) - _minutes(self.open)
+        if self.lunch:
+            minutes -= _minutes(self.lunch[1]) - _minutes(self.lunch[0])
+        return minutes
+
+    def last_close(self, now: datetime) -> datetime:
+        """nowより前の直近の取引の終了時刻（UTC）。昼休み中は前場の終了時刻"""
+        local = now.astimezone(ZoneInfo(self.tz))
+        day = local.date()
+        if self.lunch and local.weekday() < 5 and self.lunch[0] <= local.time() < self.lunch[1]:
+            return datetime.combine(day, self.lunch[0], tzinfo=ZoneInfo(self.tz)).astimezone(timezone.utc)
+        if local.time() < self.close:
+            day -= timedelta(days=1)
+        while day.weekday() >= 5:
+            day -= timedelta(days=1)
+        close = datetime.combine(day, self.close, tzinfo=ZoneInfo(self.tz))
+        return close.astimezone(timezone.utc)
+
+
+def _minutes(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+
+TSE = MarketHours("Asia/Tokyo", time(9, 0), time(15, 30), lunch=(time(11, 30), time(12, 30)))
+NYSE = MarketHours("America/New_York", time(9, 30), time(16, 0))
+
+# 分足の取引時間中のキャッシュ有効期間（指定のない足種は intraday_ttl を使う）
+INTERVAL_TTL = {
+    "1m": timedelta(minutes=1),
+    "5m": timedelta(minutes=5),
+}
+
+# 分足をローカルに残す期間（yfinanceで取得できる期間より少し長く）。これより古いバーは書き込み時に捨てる
+INTERVAL_RETENTION = {
+    "1m": timedelta(days=8),
+    "5m": timedelta(days=61),
+}
+
+
+def market_for(ticker: str) -> MarketHours:
+    """ティッカーのサフィックスから取引所を判定する"""
+    return TSE if ticker.upper().endswith(".T") else NYSE
+
+
+def _utc(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def _align(ts: datetime, index: pd.DatetimeIndex) -> pd.Timestamp:
+    """インデックスのタイムゾーンに合わせた比較用タイムスタンプ"""
+    ts = pd.Timestamp(ts)
+    if index.tz is None:
+        return ts.tz_localize(None) if ts.tzinfo else ts
+    if ts.tzinfo is None:
+        return ts.tz_localize(index.tz)
+    return ts.tz_convert(index.tz)
+
+
+class PriceStore:
+    """ティッカー単位のParquetパーティションによるOHLCVキャッシュ
+
+    取引時間中は ``intraday_ttl``（分足は ``INTERVAL_TTL``）を過ぎると末尾を再取得し、
+    取引時間外（昼休みを含む）は直近の取引の終了以降に取得済みであれば再取得しない。
+    分足は ``INTERVAL_RETENTION`` より古いバーを残さない。
+    """
+
+    def __init__(
+        self,
+        root: str = "data/prices",
+        downloader: Optional[Downloader] = None,
+        intraday_ttl: timedelta = timedelta(minutes=15),
+        clock: Optional[Callable[[], datetime]] = None,
+    ):
+        self.root = root
+        self.downloader = downloader or yfinance_downloader
+        self.intraday_ttl = intraday_ttl
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self._locks: dict[tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.download_count = 0
+        self.hits = 0  # ダウンロードせずに返した回数
+        self.misses = 0
+
+    # ---- パス・メタデータ ----
+
+    def _paths(self, ticker: str, interval: str) -> tuple[str, str]:
+        directory = os.path.join(self.root, interval)
+        safe = ticker.replace("/", "_").replace("^", "_")
+        return (os.path.join(directory, f"{safe}.parquet"),
+                os.path.join(directory, f"{safe}.meta.json"))
+
+    def _lock(self, ticker: str, interval: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault((ticker, interval), threading.Lock())
+
+    def _read(self, ticker: str, interval: str) -> tuple[Optional[pd.DataFrame], Optional[dict]]:
+        data_path, meta_path = self._paths(ticker, interval)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None, None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        meta = {k: datetime.fromisoformat(v) for k, v in meta.items()}
+        return pd.read_parquet(data_path), meta
+
+    def _write(self, ticker: str, interval: str, df: pd.DataFrame, meta: dict) -> None:
+        data_path, meta_path = self._paths(ticker, interval)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        # 書き込み途中のファイルを読まないよう一時ファイル経由で置き換える
+        df.to_parquet(data_path + ".tmp")
+        os.replace(data_path + ".tmp", data_path)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({k: v.isoformat() for k, v in meta.items()}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def _trim(self, df: pd.DataFrame, meta: dict, interval: str, now: datetime) -> pd.DataFrame:
+        """保持期間より古いバーを捨てる"""
+        retention = INTERVAL_RETENTION.get(interval)
+        if retention is None or df.empty:
+            return df
+        cutoff = now - retention
+        meta["start"] = max(meta["start"], cutoff)
+        return df[df.index >= _align(cutoff, df.index)]
+
+    def _download(self, ticker: str, start: datetime, end: datetime, interval: str) -> pd.DataFrame:
+        self.download_count += 1
+        return self.downloader(ticker, start, end, interval)
+
+    # ---- 公開API ----
+
+    def is_fresh(self, ticker: str, fetched_at: datetime, interval: str = "1d") -> bool:
+        """取得時刻から見て末尾データが最新とみなせるか"""
+        now = self.clock()
+        market = market_for(ticker)
+        if market.is_open(now):
+            return now - fetched_at < INTERVAL_TTL.get(interval, self.intraday_ttl)
+        return fetched_at >= market.last_close(now)
+
+    def get(self, ticker: str, start: datetime, end: datetime, interval: str = "1d") -> pd.DataFrame:
+        """[start, end) の価格履歴を返す。不足分のみダウンロードする"""
+        start, end = _utc(start), _utc(end)
+        with self._lock(ticker, interval):
+            df, meta = self._read(ticker, interval)
+            now = self.clock()
+
+            if df is None:
+                self.misses += 1
+                df = self._download(ticker, start, end, interval)
+                # 空でも取得時刻を保存し、is_fresh の間は取り直さない
+                meta = {"start": start, "end": min(end, now), "fetched_at": now}
+                df = self._trim(df, meta, interval, now)
+                self._write(ticker, interval, df, meta)
+            else:
+                parts = [df]
+                changed = False
+
+                # 先頭側の不足分
+                if start < meta["start"]:
+                    parts.insert(0, self._download(ticker, start, meta["start"], interval))
+                    meta["start"] = start
+                    changed = True
+
+                # 末尾側の不足分（最終バーは確定していない可能性があるので取り直す）
+                if end > meta["end"] and not self.is_fresh(ticker, meta["fetched_at"], interval):
+                    tail_start = df.index[-1].to_pydatetime() if not df.empty else meta["end"]
+                    parts.append(self._download(ticker, _utc(tail_start), end, interval))
+                    meta["end"] = min(end, now)
+                    meta["fetched_at"] = now
+                    changed = True
+
+                if not changed:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                    parts = [p for p in parts if not p.empty]
+                    if parts:
+                        df = pd.concat(parts)
+                    df = df[~df.index.duplicated(keep="last")].sort_index()
+                    df = self._trim(df, meta, interval, now)
+                    self._write(ticker, interval, df, meta)
+
+        if df.empty:
+            return df
+        return df[(df.index >= _align(start, df.index)) & (df.index < _align(end, df.index))]
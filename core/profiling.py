@@ -0,0 +1,163 @@
+"""再実行のプロファイリング（段階ごとの時間とプロファイラの出力）
+
+ページの処理を「取得」「計算」「描画」の段階に分けて ``stage()`` で囲み、
+1回の再実行の中でいつ・どれだけ時間がかかったかを記録する。プロファイル
+モードでないとき（有効な Profiler が無いとき）の ``stage()`` は何もしない。
+
+モードは環境変数 APP_PROFILE かクエリパラメータ ?profile= で指定する:
+  1 / on      段階ごとの時間だけ
+  cprofile    さらにcProfileの結果を .prof に保存（snakevizやpstatsで見る）
+  pyinstrument さらにpyinstrumentの結果を .html に保存（未インストールならcProfile）
+保存先は APP_PROFILE_DIR（既定は data/profiles）で、新しいものから
+APP_PROFILE_KEEP 件（既定は50件）だけを残す。
+"""
+from __future__ import annotations
+
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, Optional
+
+FETCH = "取得"
+COMPUTE = "計算"
+RENDER = "描画"
+KINDS = (FETCH, COMPUTE, RENDER)
+
+MODES = ("timers", "cprofile", "pyinstrument")
+DEFAULT_DIR = "data/profiles"
+DEFAULT_KEEP = 50
+OUTPUT_SUFFIXES = (".prof", ".html")
+
+# 実行中の再実行のプロファイラ（Streamlitはブラウザセッションごとに別のスレッドで実行する）
+_current: ContextVar[Optional["Profiler"]] = ContextVar("profiler", default=None)
+
+
+def profile_mode(value: Optional[str]) -> Optional[str]:
+    """APP_PROFILE / ?profile= の値をモード名にする（無効なら None）"""
+    value = (value or "").strip().lower()
+    if value in ("", "0", "off", "false", "no"):
+        return None
+    return value if value in MODES else "timers"
+
+
+@dataclass(frozen=True)
+class Stage:
+    """1つの段階の記録（開始は再実行の開始からの秒数）"""
+    name: str
+    kind: str
+    start: float
+    seconds: float
+    depth: int  # 一番外側の段階が1
+
+
+class Profiler:
+    """1回の再実行（またはフラグメントだけの再実行）の段階を記録する"""
+
+    def __init__(self, label: str, mode: str = "timers", out_dir: str = DEFAULT_DIR, keep: int = DEFAULT_KEEP):
+        self.label = label
+        self.mode = mode
+        self.out_dir = out_dir
+        self.keep = keep  # out_dir に残す出力の数
+        self.stages: list[Stage] = []
+        self.total = 0.0
+        self.output: Optional[str] = None  # 保存したプロファイラの出力のパス
+        self._started = 0.0
+        self._depth = 0
+
+    @contextmanager
+    def activate(self) -> Iterator["Profiler"]:
+        """この中の stage() をこのプロファイラに記録し、モードに応じてプロファイラを動かす"""
+        backend = self._start_backend()
+        token = _current.set(self)
+        self._started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.total = time.perf_counter() - self._started
+            _current.reset(token)
+            if backend is not None:
+                self.output = self._dump(backend)
+
+    @contextmanager
+    def stage(self, name: str, kind: str = COMPUTE) -> Iterator[None]:
+        started = time.perf_counter()
+        self._depth += 1
+        depth = self._depth
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.stages.append(Stage(name, kind, started - self._started, time.perf_counter() - started, depth))
+
+    def summary(self) -> list[dict]:
+        """段階ごとの開始・時間（ミリ秒）を開始順に"""
+        return [
+            {"段階": s.name, "種類": s.kind, "開始 (ms)": round(s.start * 1000, 1), "時間 (ms)": round(s.seconds * 1000, 1)}
+            for s in sorted(self.stages, key=lambda s: (s.start, s.depth))
+        ]
+
+    def _start_backend(self):
+        if self.mode == "pyinstrument":
+            try:
+                from pyinstrument import Profiler as Instrument
+            except ImportError:
+                self.mode = "cprofile"
+            else:
+                instrument = Instrument()
+                instrument.start()
+                return instrument
+        if self.mode == "cprofile":
+            import cProfile
+
+            profile = cProfile.Profile()
+            profile.enable()
+            return profile
+        return None
+
+    def _dump(self, backend) -> str:
+        os.makedirs(self.out_dir, exist_ok=True)
+        stem = f"{datetime.now():%Y%m%d-%H%M%S-%f}_{re.sub(r'[^0-9A-Za-z_-]+', '_', self.label).strip('_') or 'page'}"
+        if self.mode == "pyinstrument":
+            backend.stop()
+            path = os.path.join(self.out_dir, f"{stem}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(backend.output_html())
+        else:
+            backend.disable()
+            path = os.path.join(self.out_dir, f"{stem}.prof")
+            backend.dump_stats(path)
+        prune(self.out_dir, self.keep)
+        return path
+
+
+def prune(out_dir: str, keep: int) -> None:
+    """プロファイラの出力を新しいものから keep 件だけ残して削除する"""
+    outputs = sorted(
+        (entry for entry in os.scandir(out_dir) if entry.is_file() and entry.name.endswith(OUTPUT_SUFFIXES)),
+        key=lambda entry: entry.stat().st_mtime, reverse=True,
+    )
+    for entry in outputs[keep:]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:  # 別のスレッドが先に削除した
+            pass
+
+
+def current() -> Optional[Profiler]:
+    """実行中の再実行のプロファイラ（プロファイルモードでなければ None）"""
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str, kind: str = COMPUTE) -> Iterator[None]:
+    """処理を段階として記録する（プロファイルモードでなければ何もしない）"""
+    profiler = _current.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name, kind):
+        yield
@@ -0,0 +1,172 @@
+"""店舗データセットのビルドと読み込み
+
+list_store.txt のMarkdown表を検証して、型付きの列指向ファイル（Arrow IPC）に
+変換する。都道府県は辞書エンコード（pandasではcategorical）、緯度経度は
+float32で保存する。読み込みではテキストの解析や型変換をせず、ファイルの
+列をそのままpandasの列にする（pandasへの変換で全体を1回コピーする）。
+緯度経度が空の店舗はジオコーディングのキャッシュ（core.geocoding）に
+座標があればそれで補う。
+
+使い方: python -m core.store_data [入力ファイル] [出力ファイル]
+"""
+from __future__ import annotations
+
+import os
+import sys
+from typing import Callable, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from core.geocoding import DEFAULT_CACHE as DEFAULT_GEOCODE_CACHE
+from core.geocoding import GeocodeCache
+
+DEFAULT_SOURCE = "list_store.txt"
+DEFAULT_DATASET = "data/stores.arrow"
+
+SCHEMA = pa.schema([
+    ("No", pa.int32()),
+    ("店舗名", pa.string()),
+    ("住所", pa.string()),
+    ("緯度", pa.float32()),
+    ("経度", pa.float32()),
+    ("都道府県", pa.dictionary(pa.int16(), pa.string())),
+])
+
+
+class StoreDataError(ValueError):
+    """店舗データの検証エラー（行番号付きのメッセージを保持する）"""
+
+    def __init__(self, errors: list[str]):
+        self.errors = errors
+        super().__init__(f"{len(errors)}件のエラー:\n" + "\n".join(errors))
+
+
+def read_store_table(path: str) -> pd.DataFrame:
+    """Markdown表の行を文字列のまま読み込む（line列に元ファイルの行番号を持つ）"""
+    rows = []
+    with open(path, "r", encoding="utf-8") as f:
+        table_lines = [(n, line) for n, line in enumerate(f, start=1) if line.startswith("|")]
+    for n, line in table_lines[2:]:  # ヘッダー行と区切り行をスキップ
+        parts = [p.strip() for p in line.strip().strip("|").split("|")]
+        parts += [""] * (5 - len(parts))
+        rows.append([n] + parts[:5])
+    return pd.DataFrame(rows, columns=["line", "No", "店舗名", "住所", "緯度", "経度"])
+
+
+def parse_store_table(
+    path: str, geocode: Optional[Callable[[str], Optional[tuple[float, float]]]] = None
+) -> tuple[pd.DataFrame, list[str]]:
+    """店舗表を検証して型付きのDataFrameにする
+
+    緯度経度が空の行は geocode（住所 -> 座標）で補い、それでも空なら除外して
+    警告として返す。数値に変換できない値や都道府県を判定できない住所は
+    まとめて StoreDataError にする。
+    """
+    raw = read_store_table(path)
+    raw = raw[raw["No"] != ""].copy()
+    errors, warnings = [], []
+
+    if geocode is not None:
+        empty = (raw["緯度"] == "") | (raw["経度"] == "")
+        for i, address in raw.loc[empty, "住所"].items():
+            coords = geocode(address)
+            if coords:
+                raw.loc[i, ["緯度", "経度"]] = [str(coords[0]), str(coords[1])]
+
+    no = pd.to_numeric(raw["No"], errors="coerce")
+    for n, value in raw.loc[no.isna(), ["line", "No"]].itertuples(index=False):
+        errors.append((n, f"{path}:{n}: Noが整数ではありません: {value!r}"))
+
+    # 郵便番号を削除して住所のみ抽出し、都道府県を取り出す
+    address = raw["住所"].str.replace(r"〒\d{3}-\d{4}\s*", "", regex=True)
+    prefecture = address.str.extract(r"^([^都道府県]+[都道府県])", expand=False)
+    for n, value in raw.loc[prefecture.isna(), ["line", "住所"]].itertuples(index=False):
+        errors.append((n, f"{path}:{n}: 都道府県を判定できません: {value!r}"))
+
+    missing = (raw["緯度"] == "") | (raw["経度"] == "")
+    for n, name in raw.loc[missing, ["line", "店舗名"]].itertuples(index=False):
+        warnings.append(f"{path}:{n}: 緯度経度が未入力のため除外しました: {name}")
+
+    lat = pd.to_numeric(raw["緯度"].where(~missing), errors="coerce")
+    lon = pd.to_numeric(raw["経度"].where(~missing), errors="coerce")
+    invalid = ~missing & (lat.isna() | lon.isna() | ~lat.between(-90, 90) | ~lon.between(-180, 180))
+    for n, la, lo in raw.loc[invalid, ["line", "緯度", "経度"]].itertuples(index=False):
+        errors.append((n, f"{path}:{n}: 緯度経度が不正です: ({la!r}, {lo!r})"))
+
+    if errors:
+        raise StoreDataError([message for _, message in sorted(errors, key=lambda e: e[0])])
+
+    keep = ~missing
+    df = pd.DataFrame({
+        "No": no[keep].astype("int32"),
+        "店舗名": raw.loc[keep, "店舗名"],
+        "住所": address[keep],
+        "緯度": lat[keep].astype("float32"),
+        "経度": lon[keep].astype("float32"),
+        "都道府県": prefecture[keep].astype("category"),
+    }).reset_index(drop=True)
+    return df, warnings
+
+
+def build_store_dataset(
+    source: str = DEFAULT_SOURCE,
+    dataset: str = DEFAULT_DATASET,
+    geocode_cache: str = DEFAULT_GEOCODE_CACHE,
+) -> list[str]:
+    """店舗表をArrow IPCファイルに変換し、警告の一覧を返す"""
+    if os.path.exists(geocode_cache):
+        cache = GeocodeCache(geocode_cache)
+        try:
+            df, warnings = parse_store_table(source, cache.get)
+        finally:
+            cache.close()
+    else:
+        df, warnings = parse_store_table(source)
+    table = pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+    os.makedirs(os.path.dirname(dataset) or ".", exist_ok=True)
+    with pa.OSFile(dataset + ".tmp", "wb") as sink:
+        with pa.ipc.new_file(sink, SCHEMA) as writer:
+            writer.write_table(table)
+    os.replace(dataset + ".tmp", dataset)
+    return warnings
+
+
+def load_store_dataset(dataset: str = DEFAULT_DATASET) -> pd.DataFrame:
+    """ビルド済みのデータセットをDataFrameとして読み込む
+
+    メモリマップで開くのでArrowの読み込みではバッファをコピーしないが、
+    DataFrameにするときに全体をコピーする（ページは全列を使う）。
+    """
+    with pa.memory_map(dataset, "r") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def load_stores(
+    source: str = DEFAULT_SOURCE,
+    dataset: str = DEFAULT_DATASET,
+    geocode_cache: str = DEFAULT_GEOCODE_CACHE,
+) -> pd.DataFrame:
+    """データセットが無いか元ファイル・ジオコーディング結果より古ければビルドしてから読み込む"""
+    inputs = [source] + ([geocode_cache] if os.path.exists(geocode_cache) else [])
+    if not os.path.exists(dataset) or os.path.getmtime(dataset) < max(map(os.path.getmtime, inputs)):
+        build_store_dataset(source, dataset, geocode_cache)
+    return load_store_dataset(dataset)
+
+
+def main(argv: list[str]) -> int:
+    source = argv[0] if argv else DEFAULT_SOURCE
+    dataset = argv[1] if len(argv) > 1 else DEFAULT_DATASET
+    try:
+        warnings = build_store_dataset(source, dataset)
+    except StoreDataError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for warning in warnings:
+        print(f"警告: {warning}", file=sys.stderr)
+    print(f"{dataset} を作成しました（{len(load_store_dataset(dataset))}店舗）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,72 @@
+"""店舗の近傍検索（空間インデックス）
+
+緯度経度を単位球面上の3次元座標に変換してKD木（scipyのcKDTree）を作る。
+球面上の直線距離（弦の長さ）は大圏距離と単調な関係にあるので、
+k近傍・半径検索をKD木のまま行い、結果の距離だけをkmに換算する。
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+EARTH_RADIUS_KM = 6371.0088
+
+DISTANCE_COLUMN = "距離 (km)"
+
+
+def to_unit_xyz(lat, lon) -> np.ndarray:
+    """緯度経度（度）を単位球面上の座標 (n, 3) に変換する"""
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def chord_to_km(chord) -> np.ndarray:
+    """単位球面上の弦の長さを大圏距離（km）に換算する"""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+def km_to_chord(km: float) -> float:
+    """大圏距離（km）を単位球面上の弦の長さに換算する"""
+    return 2 * np.sin(min(km / EARTH_RADIUS_KM, np.pi) / 2)
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """2点間の大圏距離（km）"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class StoreIndex:
+    """店舗データの緯度経度に対するKD木。作成は1回だけで、検索結果は距離の近い順に返す"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.reset_index(drop=True)
+        self._tree = cKDTree(to_unit_xyz(self.df["緯度"].to_numpy(), self.df["経度"].to_numpy()))
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def _result(self, chord: np.ndarray, rows: np.ndarray) -> pd.DataFrame:
+        result = self.df.iloc[rows].copy()
+        result[DISTANCE_COLUMN] = chord_to_km(chord)
+        return result
+
+    def nearest(self, lat: float, lon: float, k: int = 5) -> pd.DataFrame:
+        """(lat, lon) に近い順にk店舗を返す"""
+        k = min(k, len(self.df))
+        if k <= 0:
+            return self._result(np.empty(0), np.empty(0, dtype=np.intp))
+        chord, rows = self._tree.query(to_unit_xyz(lat, lon)[0], k=k)
+        return self._result(np.atleast_1d(chord), np.atleast_1d(rows))
+
+    def within(self, lat: float, lon: float, radius_km: float) -> pd.DataFrame:
+        """(lat, lon) から radius_km 以内の店舗を近い順に返す"""
+        point = to_unit_xyz(lat, lon)[0]
+        rows = np.asarray(self._tree.query_ball_point(point, km_to_chord(radius_km)), dtype=np.intp)
+        chord = np.linalg.norm(self._tree.data[rows] - point, axis=1)
+        order = np.argsort(chord, kind="stable")
+        return self._result(chord[order], rows[order])
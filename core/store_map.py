@@ -0,0 +1,194 @@
+"""店舗マップ（Folium）の作成
+
+個別マーカー表示のほかに、全店舗を1つの配列としてブラウザへ渡し
+クライアント側でクラスタリングするモードと、地図の表示範囲の外にある
+店舗を描画しないビューポートカリングに対応する。作成したマップは
+HTMLに変換してから、絞り込み条件をキーにした ``MapCache`` に保持して
+再実行時・他のセッションで使い回す（foliumのオブジェクトは描画時に
+書き換えられるため共有しない）。
+"""
+from __future__ import annotations
+
+import html
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+import folium
+import numpy as np
+import pandas as pd
+from folium.plugins import FastMarkerCluster
+
+MODE_MARKERS = "markers"
+MODE_CLUSTER = "cluster"
+
+POPUP_TEMPLATE = """
+<div style="font-family: Arial; width: 200px;">
+    <h4 style="color: #00843D; margin-bottom: 10px;">🏪 {name}</h4>
+    <p style="margin: 5px 0;"><strong>住所:</strong><br>{address}</p>
+    <p style="margin: 5px 0;"><strong>都道府県:</strong> {prefecture}</p>
+</div>
+"""
+
+# FastMarkerClusterの各行 [緯度, 経度, 店舗名, 住所, 都道府県] からマーカーを作るJS
+CLUSTER_CALLBACK = """
+var callback = function (row) {
+    var icon = L.AwesomeMarkers.icon({markerColor: 'green', icon: 'shopping-cart', prefix: 'fa'});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindTooltip(row[2]);
+    marker.bindPopup(
+        '<div style="font-family: Arial; width: 200px;">' +
+        '<h4 style="color: #00843D; margin-bottom: 10px;">🏪 ' + row[2] + '</h4>' +
+        '<p style="margin: 5px 0;"><strong>住所:</strong><br>' + row[3] + '</p>' +
+        '<p style="margin: 5px 0;"><strong>都道府県:</strong> ' + row[4] + '</p></div>',
+        {maxWidth: 300}
+    );
+    return marker;
+};
+"""
+
+
+def expand_bounds(bounds: dict, ratio: float = 0.5) -> dict:
+    """st_foliumの返すbounds（_southWest/_northEast）を縦横にratio分ずつ広げる"""
+    south, west = bounds["_southWest"]["lat"], bounds["_southWest"]["lng"]
+    north, east = bounds["_northEast"]["lat"], bounds["_northEast"]["lng"]
+    dlat, dlng = (north - south) * ratio, (east - west) * ratio
+    return {
+        "_southWest": {"lat": south - dlat, "lng": west - dlng},
+        "_northEast": {"lat": north + dlat, "lng": east + dlng},
+    }
+
+
+def contains_bounds(outer: dict, inner: dict) -> bool:
+    """outer の範囲が inner を完全に含むか"""
+    return (
+        outer["_southWest"]["lat"] <= inner["_southWest"]["lat"]
+        and outer["_southWest"]["lng"] <= inner["_southWest"]["lng"]
+        and outer["_northEast"]["lat"] >= inner["_northEast"]["lat"]
+        and outer["_northEast"]["lng"] >= inner["_northEast"]["lng"]
+    )
+
+
+def cull_to_bounds(df: pd.DataFrame, bounds: Optional[dict]) -> pd.DataFrame:
+    """表示範囲の外にある店舗を除く"""
+    if not bounds or bounds.get("_southWest", {}).get("lat") is None:
+        return df
+    lat, lon = df["緯度"].to_numpy(), df["経度"].to_numpy()
+    inside = (
+        (lat >= bounds["_southWest"]["lat"]) & (lat <= bounds["_northEast"]["lat"])
+        & (lon >= bounds["_southWest"]["lng"]) & (lon <= bounds["_northEast"]["lng"])
+    )
+    return df[inside]
+
+
+def _add_markers(m: folium.Map, df: pd.DataFrame) -> None:
+    for name, address, prefecture, lat, lon in zip(
+        df["店舗名"], df["住所"], df["都道府県"], df["緯度"].to_numpy(), df["経度"].to_numpy()
+    ):
+        popup_html = POPUP_TEMPLATE.format(
+            name=html.escape(name), address=html.escape(address), prefecture=html.escape(str(prefecture))
+        )
+        folium.Marker(
+            location=[float(lat), float(lon)],
+            popup=folium.Popup(popup_html, max_width=300),
+            tooltip=name,
+            icon=folium.Icon(color='green', icon='shopping-cart', prefix='fa')
+        ).add_to(m)
+
+
+def _add_cluster(m: folium.Map, df: pd.DataFrame) -> None:
+    data = list(zip(
+        np.round(df["緯度"].to_numpy(dtype=np.float64), 5).tolist(),
+        np.round(df["経度"].to_numpy(dtype=np.float64), 5).tolist(),
+        df["店舗名"].map(html.escape).tolist(),
+        df["住所"].map(html.escape).tolist(),
+        df["都道府県"].astype(str).map(html.escape).tolist(),
+    ))
+    FastMarkerCluster(data, callback=CLUSTER_CALLBACK).add_to(m)
+
+
+def build_store_map(
+    df: pd.DataFrame,
+    mode: str = MODE_CLUSTER,
+    bounds: Optional[dict] = None,
+    center: Optional[tuple[float, float]] = None,
+    zoom: int = 6,
+    fit: Optional[dict] = None,
+) -> folium.Map:
+    """店舗マップを作成する。boundsを渡すとその範囲内の店舗だけを描画する
+
+    fit（boundsと同じ形式）を渡すと、初期表示をその範囲に合わせる。
+    """
+    if center is None:
+        center = (float(df["緯度"].mean()), float(df["経度"].mean()))
+
+    m = folium.Map(
+        location=list(center),
+        zoom_start=zoom,
+        tiles='OpenStreetMap'
+    )
+
+    if fit is not None:
+        m.fit_bounds([[fit["_southWest"]["lat"], fit["_southWest"]["lng"]],
+                      [fit["_northEast"]["lat"], fit["_northEast"]["lng"]]])
+
+    visible = cull_to_bounds(df, bounds)
+    if mode == MODE_CLUSTER:
+        _add_cluster(m, visible)
+    else:
+        _add_markers(m, visible)
+    return m
+
+
+def map_cache_key(
+    prefectures,
+    mode: str,
+    bounds: Optional[dict] = None,
+    center: Optional[tuple[float, float]] = None,
+    zoom: int = 6,
+) -> tuple:
+    """マップの内容を決める条件（都道府県の集合・描画方式・表示範囲）からキーを作る"""
+    bounds_key = None
+    if bounds:
+        bounds_key = (bounds["_southWest"]["lat"], bounds["_southWest"]["lng"],
+                      bounds["_northEast"]["lat"], bounds["_northEast"]["lng"])
+    return (frozenset(prefectures), mode, bounds_key, tuple(center) if center else None, zoom)
+
+
+def render_map_html(m: folium.Map) -> str:
+    """マップを単独で表示できるHTML文字列にする"""
+    return m.get_root().render()
+
+
+class MapCache:
+    """HTML化したマップを保持するLRUキャッシュ（maxsize件を超えたら古いものから捨てる）"""
+
+    def __init__(self, maxsize: int = 8):
+        self.maxsize = maxsize
+        self._maps: OrderedDict[Hashable, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], str]) -> str:
+        """キーに対応するマップのHTMLを返す。無ければ builder で作成して保持する"""
+        with self._lock:
+            if key in self._maps:
+                self._maps.move_to_end(key)
+                self.hits += 1
+                return self._maps[key]
+        html_text = builder()
+        with self._lock:
+            self.misses += 1
+            self._maps[key] = html_text
+            self._maps.move_to_end(key)
+            while len(self._maps) > self.maxsize:
+                self._maps.popitem(last=False)
+        return html_text
+
+    def __len__(self) -> int:
+        return len(self._maps)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._maps.clear()
@@ -0,0 +1,127 @@
+"""店舗一覧の検索インデックス
+
+店舗名と住所を正規化（全角半角・カタカナ/ひらがな・異体字の統一）したうえで、
+文字バイグラムの位置付き転置インデックスを作る。部分一致・前方一致は
+クエリの各バイグラムの出現位置が連続する行を、出現数の少ないバイグラムから
+順に絞り込んで求める。一致が無いときのあいまい検索は、クエリのバイグラムを
+いくつ含むかの割合で行を並べる。
+"""
+from __future__ import annotations
+
+import unicodedata
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+SEARCH_FIELDS = ("店舗名", "住所")
+
+# 位置キー = 行番号 * STRIDE + フィールドの開始位置 + 文字位置
+STRIDE = 1 << 10
+FIELD_WIDTH = STRIDE // 2
+END = "\0"  # フィールドの末尾（1文字のクエリでも末尾の文字を探せるように付ける）
+
+_CODE_BASE = 0x110000
+_KATAKANA_TO_HIRAGANA = {c: c - 0x60 for c in range(ord("ァ"), ord("ヶ") + 1)}
+_VARIANTS = str.maketrans({
+    "髙": "高", "﨑": "崎", "濵": "浜", "濱": "浜", "邊": "辺", "邉": "辺", "澤": "沢",
+    "齋": "斎", "齊": "斉", "ゖ": "け", "ゕ": "か",
+    "‐": "-", "−": "-", "–": "-", "—": "-", "―": "-",
+})
+
+
+def normalize_text(text: str) -> str:
+    """検索用の正規化（NFKC・小文字・カタカナをひらがなに・異体字の統一・空白除去）"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = text.translate(_KATAKANA_TO_HIRAGANA).translate(_VARIANTS)
+    return "".join(text.split())
+
+
+def _bigram_code(pair: str) -> int:
+    return ord(pair[0]) * _CODE_BASE + ord(pair[1])
+
+
+class SearchIndex:
+    """店舗名・住所の位置付きバイグラム索引。検索結果はdfの行位置（iloc）で返す"""
+
+    def __init__(self, df: pd.DataFrame, fields: Sequence[str] = SEARCH_FIELDS):
+        if len(fields) * FIELD_WIDTH > STRIDE:
+            raise ValueError(f"フィールドは{STRIDE // FIELD_WIDTH}個までです")
+        self.size = len(df)
+        codes, keys = [], []
+        for i, field in enumerate(fields):
+            c, k = self._field_bigrams(df[field].astype(str), i * FIELD_WIDTH)
+            codes.append(c)
+            keys.append(k)
+        codes, keys = np.concatenate(codes), np.concatenate(keys)
+        order = np.lexsort((keys, codes))
+        # バイグラムのコード順に並べ、同じバイグラム内は位置キー順にする
+        self._codes = codes[order]
+        self._keys = keys[order]
+
+    def _field_bigrams(self, values: pd.Series, offset: int) -> tuple[np.ndarray, np.ndarray]:
+        texts = [normalize_text(v)[:FIELD_WIDTH - 2] + END for v in values]
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        chars = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+        starts = np.cumsum(lengths) - lengths
+        pos = np.arange(len(chars)) - np.repeat(starts, lengths)
+        at = np.nonzero(pos < np.repeat(lengths, lengths) - 1)[0]
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+        return chars[at] * _CODE_BASE + chars[at + 1], rows[at] * STRIDE + offset + pos[at]
+
+    def _postings(self, lo: int, hi: int) -> np.ndarray:
+        """コードが [lo, hi) のバイグラムの位置キー"""
+        start, stop = np.searchsorted(self._codes, [lo, hi])
+        return self._keys[start:stop]
+
+    def _matches(self, q: str) -> np.ndarray:
+        """クエリが始まる位置キー"""
+        if len(q) == 1:
+            # 1文字ならその文字で始まる全バイグラム
+            return self._postings(ord(q) * _CODE_BASE, (ord(q) + 1) * _CODE_BASE)
+        grams = []
+        for i in range(len(q) - 1):
+            code = _bigram_code(q[i:i + 2])
+            grams.append((self._postings(code, code + 1), i))
+        grams.sort(key=lambda g: len(g[0]))
+        keys, i = grams[0]
+        candidates = keys - i
+        for keys, i in grams[1:]:
+            if len(candidates) == 0 or len(keys) == 0:
+                return candidates[:0]
+            target = candidates + i
+            j = np.minimum(np.searchsorted(keys, target), len(keys) - 1)
+            candidates = candidates[keys[j] == target]
+        return candidates
+
+    def search(self, query: str, prefix: bool = False) -> np.ndarray:
+        """query を含む（prefix=True ならフィールドの先頭が一致する）行の位置を行順で返す"""
+        q = normalize_text(query)
+        if not q:
+            return np.arange(self.size)
+        starts = self._matches(q)
+        if prefix:
+            starts = starts[starts % FIELD_WIDTH == 0]
+        return self._rows(starts)
+
+    def _rows(self, keys: np.ndarray) -> np.ndarray:
+        """位置キーを重複のない行位置（行順）にする。ソートせずに済むようマスクを使う"""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[keys // STRIDE] = True
+        return np.flatnonzero(mask)
+
+    def fuzzy(self, query: str, min_score: float = 0.5, limit: int = 50) -> tuple[np.ndarray, np.ndarray]:
+        """query のバイグラムを含む割合が min_score 以上の行を、割合の高い順に (行位置, 割合) で返す"""
+        q = normalize_text(query)
+        grams = {q[i:i + 2] for i in range(len(q) - 1)}
+        if not grams:
+            rows = self.search(q)[:limit]
+            return rows, np.ones(len(rows))
+        counts = np.zeros(self.size, dtype=np.int32)
+        for code in map(_bigram_code, grams):
+            counts[self._rows(self._postings(code, code + 1))] += 1
+        scores = counts / len(grams)
+        rows = np.flatnonzero(scores >= min_score)
+        scores = scores[rows]
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return rows[order], scores[order]
@@ -0,0 +1,91 @@
+"""都道府県別の集計と絞り込みマスク
+
+読み込み時に都道府県ごとの店舗数・範囲（緯度経度の最小最大）・重心を1回だけ
+計算しておき、絞り込み後の指標やグラフはこの集計表から求める。都道府県の
+選択に対応する行マスクは、都道府県のコード列から作ってLRUで保持する。
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class PrefectureStats:
+    """店舗データの都道府県別集計（都道府県名順）"""
+
+    def __init__(self, df: pd.DataFrame, mask_cache_size: int = 16):
+        prefecture = df["都道府県"].astype("category")
+        self.size = len(df)
+        self._codes = prefecture.cat.codes.to_numpy()
+        self._categories = list(prefecture.cat.categories)
+
+        lat = df["緯度"].to_numpy(dtype=np.float64)
+        lon = df["経度"].to_numpy(dtype=np.float64)
+        table = pd.DataFrame({"code": self._codes, "lat": lat, "lon": lon}).groupby("code").agg(
+            店舗数=("lat", "size"),
+            南端=("lat", "min"), 北端=("lat", "max"),
+            西端=("lon", "min"), 東端=("lon", "max"),
+            緯度=("lat", "mean"), 経度=("lon", "mean"),
+        )
+        table.index = pd.Index([self._categories[c] for c in table.index], name="都道府県")
+        self.table = table[table["店舗数"] > 0].sort_index()
+
+        self._masks: OrderedDict[frozenset, np.ndarray] = OrderedDict()
+        self._mask_cache_size = mask_cache_size
+        self._lock = threading.Lock()
+
+    @property
+    def prefectures(self) -> list[str]:
+        """店舗のある都道府県（名前順）"""
+        return list(self.table.index)
+
+    def selection(self, prefectures: Iterable[str]) -> pd.DataFrame:
+        """選択した都道府県の行だけの集計表"""
+        return self.table[self.table.index.isin(list(prefectures))]
+
+    def count(self, prefectures: Iterable[str]) -> int:
+        return int(self.selection(prefectures)["店舗数"].sum())
+
+    def counts(self, prefectures: Iterable[str]) -> pd.DataFrame:
+        """都道府県別店舗数（列: 都道府県, 店舗数）を店舗数の多い順に"""
+        counts = self.selection(prefectures)["店舗数"].sort_values(ascending=False, kind="stable")
+        return counts.reset_index()
+
+    def bounds(self, prefectures: Iterable[str]) -> Optional[dict]:
+        """選択範囲を囲む範囲（st_foliumのbounds形式）。選択が空なら None"""
+        sel = self.selection(prefectures)
+        if sel.empty:
+            return None
+        return {
+            "_southWest": {"lat": float(sel["南端"].min()), "lng": float(sel["西端"].min())},
+            "_northEast": {"lat": float(sel["北端"].max()), "lng": float(sel["東端"].max())},
+        }
+
+    def centroid(self, prefectures: Iterable[str]) -> Optional[tuple[float, float]]:
+        """選択した店舗全体の重心（都道府県の重心を店舗数で重み付け）"""
+        sel = self.selection(prefectures)
+        if sel.empty:
+            return None
+        weights = sel["店舗数"].to_numpy()
+        return (float(np.average(sel["緯度"], weights=weights)),
+                float(np.average(sel["経度"], weights=weights)))
+
+    def mask(self, prefectures: Iterable[str]) -> np.ndarray:
+        """選択した都道府県の店舗を True とする行マスク（読み取り専用・LRUで保持）"""
+        key = frozenset(prefectures)
+        with self._lock:
+            if key in self._masks:
+                self._masks.move_to_end(key)
+                return self._masks[key]
+        selected = np.array([c in key for c in self._categories] + [False])  # 末尾はコード-1（欠損）用
+        mask = selected[self._codes]
+        mask.flags.writeable = False
+        with self._lock:
+            self._masks[key] = mask
+            while len(self._masks) > self._mask_cache_size:
+                self._masks.popitem(last=False)
+        return mask
@@ -0,0 +1,127 @@
+"""テレメトリの距離グリッドへのリサンプリングとディスクキャッシュ
+
+複数のラップ・ドライバーを重ねて比較できるよう、各ラップのテレメトリを
+スタートからの距離で一定間隔（既定は5 m）のグリッドに補間する。補間は
+全ラップを距離方向にずらして1本の系列に並べ、チャンネルごとに1回の
+np.interpでまとめて行う。リサンプリング済みのラップはnpzでディスクに
+保存し、次回からはfastf1のテレメトリを読み込まずに使う。
+"""
+from __future__ import annotations
+
+import os
+from typing import Callable, Hashable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_STEP = 5.0
+
+# 線形補間するチャンネルと、階段状なので直前の値を使うチャンネル
+LINEAR_CHANNELS = ("Time", "Speed", "Throttle")
+STEP_CHANNELS = ("Brake", "nGear")
+CHANNELS = LINEAR_CHANNELS + STEP_CHANNELS
+
+
+def _channel(telemetry: pd.DataFrame, name: str) -> np.ndarray:
+    values = telemetry[name]
+    if name == "Time" and pd.api.types.is_timedelta64_dtype(values):
+        values = values.dt.total_seconds()
+    return values.to_numpy(dtype=np.float64)
+
+
+def resample_laps(telemetries: Sequence[pd.DataFrame], step: float = DEFAULT_STEP) -> list[pd.DataFrame]:
+    """各ラップのテレメトリを距離 0, step, 2*step, ... のグリッドに補間する
+
+    戻り値はラップごとのDataFrame（列: Distance と CHANNELS）。Time はラップ開始からの秒数。
+    """
+    distances = [np.maximum.accumulate(_channel(t, "Distance")) for t in telemetries]
+    if not distances or all(len(d) == 0 for d in distances):
+        return [pd.DataFrame(columns=["Distance", *CHANNELS], dtype=np.float32) for _ in telemetries]
+
+    grids = [np.arange(0, d[-1] + step / 2, step) if len(d) else np.empty(0) for d in distances]
+    # ラップごとに距離をずらして連結し、補間がラップをまたがないようにする
+    offset = max(d[-1] for d in distances if len(d)) + 2 * step
+    x = np.concatenate([d + i * offset for i, d in enumerate(distances)])
+    q = np.concatenate([
+        np.clip(g, d[0], d[-1]) + i * offset for i, (g, d) in enumerate(zip(grids, distances)) if len(d)
+    ])
+    starts = np.repeat(
+        np.cumsum([0] + [len(d) for d in distances[:-1]]),
+        [len(g) for g in grids],
+    )
+    previous = np.maximum(np.searchsorted(x, q, side="right") - 1, starts)
+
+    columns = {"Distance": np.concatenate(grids)}
+    for name in CHANNELS:
+        y = np.concatenate([_channel(t, name) for t in telemetries])
+        columns[name] = np.interp(q, x, y) if name in LINEAR_CHANNELS else y[previous]
+
+    bounds = np.cumsum([0] + [len(g) for g in grids])
+    return [
+        pd.DataFrame({k: v[lo:hi].astype(np.float32) for k, v in columns.items()})
+        for lo, hi in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def overlay(laps: Sequence[pd.DataFrame], channel: str) -> tuple[np.ndarray, np.ndarray]:
+    """リサンプリング済みのラップを (距離グリッド, ラップ数 x グリッド長の配列) に揃える（短いラップの末尾はNaN）"""
+    longest = max(laps, key=len)
+    values = np.full((len(laps), len(longest)), np.nan, dtype=np.float64)
+    for i, lap in enumerate(laps):
+        values[i, :len(lap)] = lap[channel].to_numpy()
+    return longest["Distance"].to_numpy(dtype=np.float64), values
+
+
+def delta_time(laps: Sequence[pd.DataFrame], reference: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """基準ラップに対する各ラップのタイム差（秒、正なら基準より遅い）を距離グリッド上で返す"""
+    distance, time = overlay(laps, "Time")
+    return distance, time - time[reference]
+
+
+class TelemetryCache:
+    """リサンプリング済みのラップをラップ単位のnpzファイルに保存する"""
+
+    def __init__(self, root: str = "data/telemetry", step: float = DEFAULT_STEP):
+        self.root = root
+        self.step = step
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: tuple) -> str:
+        safe = [str(part).replace("/", "_").replace(" ", "_") for part in key]
+        return os.path.join(self.root, *safe[:-1], f"{safe[-1]}_{self.step:g}m.npz")
+
+    def _read(self, key: tuple) -> Optional[pd.DataFrame]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return pd.DataFrame({name: data[name] for name in ["Distance", *CHANNELS]})
+
+    def _write(self, key: tuple, lap: pd.DataFrame) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            np.savez(f, **{name: lap[name].to_numpy() for name in lap.columns})
+        os.replace(path + ".tmp", path)
+
+    def get_many(
+        self,
+        keys: Sequence[tuple[Hashable, ...]],
+        fetch: Callable[[list[tuple]], list[pd.DataFrame]],
+    ) -> list[pd.DataFrame]:
+        """keysの各ラップを返す。キャッシュに無いラップだけを fetch でまとめて取得してリサンプリングする
+
+        キーは (年, グランプリ, セッション, ドライバー, ラップ番号) のようなタプルで、
+        ファイルの階層にそのまま使う。
+        """
+        laps = [self._read(key) for key in keys]
+        missing = [key for key, lap in zip(keys, laps) if lap is None]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            resampled = dict(zip(missing, resample_laps(fetch(missing), self.step)))
+            for key, lap in resampled.items():
+                self._write(key, lap)
+            laps = [resampled[key] if lap is None else lap for key, lap in zip(keys, laps)]
+        return laps
@@ -0,0 +1,56 @@
+"""再実行時間の記録
+
+Streamlitの再実行（ページ全体、またはフラグメントだけ）にかかった時間を
+範囲ごとに記録する。ブラウザセッションごとに1つ持ち、直近の記録だけを残す。
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+PAGE_SCOPE = "ページ全体"
+
+
+@dataclass(frozen=True)
+class RerunTiming:
+    """1回の再実行の時間"""
+    scope: str  # PAGE_SCOPE かフラグメントの名前
+    seconds: float
+    finished_at: float  # time.time()
+
+
+class RerunTimer:
+    """範囲ごとの再実行時間を直近 history 件まで保持する"""
+
+    def __init__(self, history: int = 50):
+        self.records: deque[RerunTiming] = deque(maxlen=history)
+
+    @contextmanager
+    def measure(self, scope: str = PAGE_SCOPE) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.records.append(RerunTiming(scope, time.perf_counter() - started, time.time()))
+
+    def last(self, scope: str = PAGE_SCOPE) -> Optional[RerunTiming]:
+        return next((r for r in reversed(self.records) if r.scope == scope), None)
+
+    def summary(self) -> list[dict]:
+        """範囲ごとの回数・直近・中央値（ミリ秒）"""
+        scopes: dict[str, list[float]] = {}
+        for record in self.records:
+            scopes.setdefault(record.scope, []).append(record.seconds * 1000)
+        rows = []
+        for scope, values in scopes.items():
+            ordered = sorted(values)
+            rows.append({
+                "範囲": scope,
+                "回数": len(values),
+                "直近 (ms)": round(values[-1], 1),
+                "中央値 (ms)": round(ordered[len(ordered) // 2], 1),
+            })
+        return rows
@@ -0,0 +1,87 @@
+"""複数銘柄（ウォッチリスト）の並列取得とサマリー作成"""
+from __future__ import annotations
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from core.indicators import annualized_stats, compute_indicators
+from core.price_store import PriceStore
+
+
+@dataclass
+class FetchResult:
+    """1銘柄分の取得結果"""
+    ticker: str
+    frame: Optional[pd.DataFrame]
+    latency: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.frame is not None and not self.frame.empty
+
+
+def parse_tickers(text: str) -> list[str]:
+    """カンマ・空白・改行区切りのティッカー文字列を重複なしのリストにする"""
+    tickers = []
+    for token in re.split(r"[\s,、]+", text):
+        token = token.strip().upper()
+        if token and token not in tickers:
+            tickers.append(token)
+    return tickers
+
+
+def fetch_watchlist(
+    store: PriceStore,
+    tickers: list[str],
+    start: datetime,
+    end: datetime,
+    max_workers: int = 8,
+) -> list[FetchResult]:
+    """スレッドプールで各銘柄を並列取得する。失敗した銘柄はerrorに理由を入れて返す"""
+
+    def fetch(ticker: str) -> FetchResult:
+        started = time.perf_counter()
+        try:
+            frame = store.get(ticker, start, end)
+            error = None if not frame.empty else "データなし"
+        except Exception as e:
+            frame, error = None, str(e)
+        return FetchResult(ticker, frame, time.perf_counter() - started, error)
+
+    if not tickers:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as pool:
+        return list(pool.map(fetch, tickers))
+
+
+def summarize(results: list[FetchResult]) -> pd.DataFrame:
+    """ウォッチリストのサマリー表（現在値・前日比・RSI・ボラティリティ・シャープレシオ）"""
+    rows = []
+    for result in results:
+        row = {
+            "ティッカー": result.ticker,
+            "現在値": np.nan,
+            "前日比 (%)": np.nan,
+            "RSI": np.nan,
+            "年率ボラティリティ (%)": np.nan,
+            "シャープレシオ": np.nan,
+            "取得時間 (ms)": result.latency * 1000,
+            "状態": "OK" if result.ok else f"失敗: {result.error}",
+        }
+        if result.ok:
+            close = result.frame["Close"].to_numpy(dtype=np.float64)
+            row["現在値"] = close[-1]
+            if len(close) > 1:
+                row["前日比 (%)"] = (close[-1] / close[-2] - 1) * 100
+            row["RSI"] = compute_indicators(close)["RSI"][-1]
+            row["年率ボラティリティ (%)"], row["シャープレシオ"] = annualized_stats(close)
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,87 @@
+"""シーズンの先読み（FixtureSessionで、ネットワークなし）"""
+import pytest
+
+from core.f1_prefetch import MANIFEST_FILE, FixtureSession, WarmManifest, fixture_get_session, prefetch_sessions
+
+BAHRAIN = (2024, "Bahrain", "Race")
+JAPAN = (2024, "Japan", "Race")
+
+
+@pytest.fixture
+def fixtures(tmp_path):
+    root = tmp_path / "fixtures"
+    for gp in ("Bahrain", "Japan"):
+        (root / "2024" / gp).mkdir(parents=True)
+        (root / "2024" / gp / "Race.csv").write_text(
+            "Driver,LapNumber,LapTime\nVER,1,92.1\nVER,2,91.8\nLEC,1,92.4\n", encoding="utf-8")
+    return str(root)
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return WarmManifest(str(tmp_path / "cache" / MANIFEST_FILE))
+
+
+def test_fixture_session_reads_lap_times_as_timedeltas(fixtures):
+    session = fixture_get_session(fixtures)(*BAHRAIN)
+    assert isinstance(session, FixtureSession)
+    session.load()
+    assert len(session.laps) == 3
+    assert session.laps["LapTime"].iloc[0].total_seconds() == pytest.approx(92.1)
+
+
+def test_sessions_are_loaded_and_marked_warm(fixtures, manifest, tmp_path):
+    results = prefetch_sessions([BAHRAIN, JAPAN, BAHRAIN], cache_dir=str(tmp_path / "cache"),
+                                get_session=fixture_get_session(fixtures), manifest=manifest, sleep=lambda s: None)
+
+    assert [(r.gp, r.ok, r.attempts) for r in results] == [("Bahrain", True, 1), ("Japan", True, 1)]
+    assert manifest.status(2024, ["Bahrain", "Japan", "Monaco"], "Race") == {
+        "Bahrain": True, "Japan": True, "Monaco": False}
+    # 別のプロセス（アプリ）からもファイル経由で見える
+    assert WarmManifest(manifest.path).is_warm(*JAPAN)
+
+
+def test_warm_sessions_are_skipped_unless_forced(fixtures, manifest, tmp_path):
+    loads = []
+
+    def get_session(*target):
+        loads.append(target)
+        return fixture_get_session(fixtures)(*target)
+
+    kwargs = dict(cache_dir=str(tmp_path / "cache"), get_session=get_session, manifest=manifest, sleep=lambda s: None)
+    prefetch_sessions([BAHRAIN], **kwargs)
+    [result] = prefetch_sessions([BAHRAIN], **kwargs)
+    assert result.skipped and loads == [BAHRAIN]
+
+    # ラップだけ温まっているセッションはテレメトリを求めると読み込み直す
+    [result] = prefetch_sessions([BAHRAIN], data_classes=("laps", "telemetry"), **kwargs)
+    assert not result.skipped and manifest.is_warm(*BAHRAIN, ["laps", "telemetry"])
+
+    [result] = prefetch_sessions([BAHRAIN], force=True, **kwargs)
+    assert not result.skipped and len(loads) == 3
+
+
+def test_failures_are_retried_with_backoff(fixtures, manifest, tmp_path):
+    attempts, sleeps = [], []
+
+    def flaky(*target):
+        attempts.append(target)
+        if len(attempts) < 3:
+            raise ConnectionError("503")
+        return fixture_get_session(fixtures)(*target)
+
+    [result] = prefetch_sessions([BAHRAIN], cache_dir=str(tmp_path / "cache"), get_session=flaky,
+                                 manifest=manifest, retries=2, backoff=2.0, sleep=sleeps.append)
+    assert result.ok and result.attempts == 3
+    assert sleeps == [2.0, 4.0]
+    assert manifest.is_warm(*BAHRAIN)
+
+
+def test_missing_sessions_fail_after_the_retries(fixtures, manifest, tmp_path):
+    sleeps = []
+    [result] = prefetch_sessions([(2024, "Monaco", "Race")], cache_dir=str(tmp_path / "cache"),
+                                 get_session=fixture_get_session(fixtures), manifest=manifest,
+                                 retries=1, backoff=0.5, sleep=sleeps.append)
+    assert not result.ok and result.attempts == 2 and "Race.csv" in result.error
+    assert sleeps == [0.5]
+    assert not manifest.is_warm(2024, "Monaco", "Race")
@@ -0,0 +1,86 @@
+"""ジオコーディングのキャッシュと一括処理（フィクスチャのジオコーダーで、ネットワークなし）"""
+import json
+
+import pytest
+
+from core.geocoding import GeocodeCache, fixture_geocoder, geocode_addresses, normalize_address
+from core.store_data import parse_store_table
+
+SHINJUKU = "〒160-0022 東京都新宿区新宿３丁目"
+UNKNOWN = "東京都どこか区1-2-3"
+
+
+@pytest.fixture
+def geocoder(tmp_path):
+    path = tmp_path / "coords.json"
+    path.write_text(json.dumps({"東京都新宿区新宿3丁目": [35.69, 139.70]}, ensure_ascii=False), encoding="utf-8")
+    return fixture_geocoder(str(path))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = GeocodeCache(str(tmp_path / "geocode.sqlite"))
+    yield cache
+    cache.close()
+
+
+def test_normalize_address_drops_postcode_and_width():
+    assert normalize_address(SHINJUKU) == "東京都新宿区新宿3丁目"
+
+
+def test_fixture_geocoder_matches_normalized_addresses(geocoder):
+    assert geocoder(SHINJUKU) == (35.69, 139.70)
+    assert geocoder(UNKNOWN) is None
+
+
+def test_results_and_misses_are_cached(geocoder, cache):
+    results, failures = geocode_addresses([SHINJUKU, UNKNOWN, SHINJUKU], geocoder, cache, rate=0)
+
+    assert results == {SHINJUKU: (35.69, 139.70), UNKNOWN: None}
+    assert failures == {}
+    assert len(cache) == 2
+    assert cache.get("東京都新宿区新宿3丁目") == (35.69, 139.70)
+    assert UNKNOWN in cache and cache.get(UNKNOWN) is None
+
+
+def test_cached_addresses_are_not_queried_again(geocoder, cache):
+    geocode_addresses([SHINJUKU], geocoder, cache, rate=0)
+    calls = []
+
+    def counting(address):
+        calls.append(address)
+        return geocoder(address)
+
+    results, _ = geocode_addresses([SHINJUKU, UNKNOWN], counting, cache, rate=0)
+    assert calls == [UNKNOWN]
+    assert list(results) == [UNKNOWN]
+
+
+def test_errors_are_reported_and_retried_next_time(geocoder, cache):
+    def flaky(address):
+        raise TimeoutError("timed out")
+
+    results, failures = geocode_addresses([SHINJUKU], flaky, cache, rate=0)
+    assert results == {} and failures == {SHINJUKU: "timed out"}
+    assert SHINJUKU not in cache
+
+    results, failures = geocode_addresses([SHINJUKU], geocoder, cache, rate=0)
+    assert results == {SHINJUKU: (35.69, 139.70)} and failures == {}
+
+
+def test_store_table_is_filled_from_the_cache(tmp_path, geocoder, cache):
+    source = tmp_path / "list_store.txt"
+    source.write_text(
+        "| No | 店舗名 | 住所 | 緯度 | 経度 |\n"
+        "|---|---|---|---|---|\n"
+        f"| 1 | 新宿店 | {SHINJUKU} | | |\n"
+        f"| 2 | 不明店 | {UNKNOWN} | | |\n"
+        "| 3 | 大宮店 | 埼玉県さいたま市大宮区 | 35.90 | 139.62 |\n",
+        encoding="utf-8",
+    )
+    geocode_addresses([SHINJUKU, UNKNOWN], geocoder, cache, rate=0)
+
+    df, warnings = parse_store_table(str(source), cache.get)
+    assert list(df["店舗名"]) == ["新宿店", "大宮店"]
+    assert df.loc[0, "緯度"] == pytest.approx(35.69, abs=1e-4)
+    assert len(warnings) == 1 and "不明店" in warnings[0]
@@ -0,0 +1,24 @@
+"""指標の逐次更新（IndicatorState）と一括計算（compute_indicators）の一致"""
+import numpy as np
+import pytest
+
+from core.indicators import INDICATOR_COLUMNS, IndicatorState, compute_indicators
+
+
+def incremental(close, history=0):
+    """先頭 history 本から状態を復元し、残りを1本ずつ追加した結果"""
+    state = IndicatorState.from_history(close[:history])
+    rows = [state.update(value) for value in close[history:]]
+    return {column: np.array([row[column] for row in rows]) for column in INDICATOR_COLUMNS}
+
+
+@pytest.mark.parametrize("history", [0, 10, 40])
+@pytest.mark.parametrize("missing", [[], [0, 1], [30], [30, 31, 45]])
+def test_incremental_matches_batch_with_missing_closes(history, missing):
+    close = np.linspace(100, 160, 80)
+    close[missing] = np.nan
+
+    batch = compute_indicators(close)
+    result = incremental(close, history)
+    for column in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(result[column], batch[column][history:], rtol=1e-9, err_msg=column)
@@ -0,0 +1,113 @@
+"""メトリクスのレジストリと /metrics のスクレイプ（ローカルのサーバー）"""
+import math
+import urllib.error
+import urllib.request
+
+import pytest
+
+from core.metrics import CONTENT_TYPE, Registry, parse_text, start_server, timed
+
+
+@pytest.fixture
+def registry():
+    return Registry()
+
+
+@pytest.fixture
+def scrape(registry):
+    server = start_server(0, host="127.0.0.1", registry=registry)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def get(path="/metrics"):
+        with urllib.request.urlopen(url + path, timeout=5) as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            return parse_text(response.read().decode("utf-8"))
+
+    yield get
+    server.shutdown()
+    server.server_close()
+
+
+def test_counter_gauge_and_histogram_are_scraped(registry, scrape):
+    requests = registry.counter("app_requests_total", "リクエスト数", ("page",))
+    requests.inc(page="f1")
+    requests.inc(2, page="f1")
+    registry.gauge("app_sessions", "セッション数").set(3)
+    seconds = registry.histogram("app_load_seconds", "読み込み時間", ("kind",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        seconds.observe(value, kind="laps")
+
+    samples = scrape()
+    assert samples[("app_requests_total", '{page="f1"}')] == 3
+    assert samples[("app_sessions", "")] == 3
+    assert samples[("app_load_seconds_bucket", '{kind="laps",le="0.1"}')] == 1
+    assert samples[("app_load_seconds_bucket", '{kind="laps",le="1"}')] == 2
+    assert samples[("app_load_seconds_bucket", '{kind="laps",le="+Inf"}')] == 3
+    assert samples[("app_load_seconds_count", '{kind="laps"}')] == 3
+    assert samples[("app_load_seconds_sum", '{kind="laps"}')] == pytest.approx(5.55)
+
+
+def test_function_gauges_and_caches_are_read_at_scrape_time(registry, scrape):
+    class Cache:
+        hits, misses = 0, 0
+
+    cache = Cache()
+    registry.track_cache("prices", cache)
+    size = registry.gauge("app_cache_bytes", "サイズ")
+    size.set_function(lambda: 1024)
+    assert scrape()[("app_cache_hits_total", '{cache="prices"}')] == 0
+
+    cache.hits, cache.misses = 5, 2
+    samples = scrape()
+    assert samples[("app_cache_hits_total", '{cache="prices"}')] == 5
+    assert samples[("app_cache_misses_total", '{cache="prices"}')] == 2
+    assert samples[("app_cache_bytes", "")] == 1024
+
+
+def test_render_declares_types(registry):
+    registry.counter("app_errors_total", "失敗数")
+    text = registry.render()
+    assert "# TYPE app_errors_total counter" in text
+    assert "# TYPE app_cache_hits_total counter" in text
+    assert text.endswith("\n")
+
+
+def test_nan_and_inf_use_the_text_format_spelling(registry):
+    registry.gauge("app_last_seconds", "空の計測").set(float("nan"))
+    registry.gauge("app_limit", "上限").set(float("inf"))
+    text = registry.render()
+    assert "app_last_seconds NaN\n" in text
+    assert "app_limit +Inf\n" in text
+    assert math.isnan(parse_text(text)[("app_last_seconds", "")])
+
+
+def test_labels_must_match(registry):
+    counter = registry.counter("app_fetch_total", "取得数", ("source",))
+    with pytest.raises(ValueError):
+        counter.inc(kind="prices")
+    with pytest.raises(ValueError):
+        registry.gauge("app_fetch_total", "同じ名前")
+
+
+def test_timed_records_calls_and_errors(monkeypatch):
+    from core import metrics
+
+    registry = Registry()
+    monkeypatch.setattr(metrics, "FETCH_SECONDS", registry.histogram("app_fetch_seconds", "", ("source", "kind")))
+    monkeypatch.setattr(metrics, "FETCH_ERRORS", registry.counter("app_fetch_errors_total", "", ("source", "kind")))
+
+    def fail():
+        raise RuntimeError("down")
+
+    assert timed(lambda: 42, "yfinance", "prices")() == 42
+    with pytest.raises(RuntimeError):
+        timed(fail, "yfinance", "prices")()
+    samples = parse_text(registry.render())
+    assert samples[("app_fetch_seconds_count", '{source="yfinance",kind="prices"}')] == 2
+    assert samples[("app_fetch_errors_total", '{source="yfinance",kind="prices"}')] == 1
+
+
+def test_other_paths_are_not_found(scrape):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        scrape("/")
+    assert error.value.code == 404
@@ -0,0 +1,152 @@
+"""PriceStoreの補完（フェイクのダウンローダーと時計で、ネットワークなし）"""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.price_store import PriceStore
+
+SATURDAY = datetime(2024, 6, 8, 12, 0, tzinfo=timezone.utc)  # 取引時間外
+MONDAY_OPEN = datetime(2024, 6, 10, 15, 0, tzinfo=timezone.utc)  # NYSEの取引時間中
+
+
+class FakeDownloader:
+    """[start, end) の平日ごとに1本の日足を返し、呼び出しを記録する"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, ticker, start, end, interval="1d"):
+        self.calls.append((ticker, start, end, interval))
+        index = pd.date_range(pd.Timestamp(start).floor("D"), end, freq="B")
+        index = index[(index >= start) & (index < end)]
+        close = np.arange(len(index), dtype=float) + 100
+        return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close,
+                             "Volume": np.full(len(index), 1000)}, index=index)
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def store(tmp_path):
+    downloader, clock = FakeDownloader(), Clock(SATURDAY)
+    return PriceStore(str(tmp_path), downloader=downloader, clock=clock), downloader, clock
+
+
+def test_second_request_is_served_from_disk(store):
+    prices, downloader, _ = store
+    start = SATURDAY - timedelta(days=30)
+    first = prices.get("AAPL", start, SATURDAY)
+    second = prices.get("AAPL", start, SATURDAY)
+
+    assert len(downloader.calls) == 1
+    pd.testing.assert_frame_equal(first, second, check_freq=False)
+    assert (prices.hits, prices.misses) == (1, 1)
+
+
+def test_only_the_missing_head_is_downloaded(store):
+    prices, downloader, _ = store
+    prices.get("AAPL", SATURDAY - timedelta(days=30), SATURDAY)
+    df = prices.get("AAPL", SATURDAY - timedelta(days=60), SATURDAY)
+
+    assert len(downloader.calls) == 2
+    _, start, end, _ = downloader.calls[-1]
+    assert (start, end) == (SATURDAY - timedelta(days=60), SATURDAY - timedelta(days=30))
+    assert df.index.is_monotonic_increasing and not df.index.has_duplicates
+    assert df.index[0] >= SATURDAY - timedelta(days=60)
+
+
+def test_tail_is_topped_up_from_the_last_bar_while_the_market_is_open(store):
+    prices, downloader, clock = store
+    before = prices.get("AAPL", SATURDAY - timedelta(days=30), SATURDAY)
+
+    clock.now = MONDAY_OPEN
+    after = prices.get("AAPL", SATURDAY - timedelta(days=30), clock.now)
+    assert len(downloader.calls) == 2
+    assert downloader.calls[-1][1] == before.index[-1].to_pydatetime()
+    assert after.index[-1] == pd.Timestamp("2024-06-10", tz="UTC")
+
+    # TTL（15分）以内はもう一度取りに行かない
+    clock.now = MONDAY_OPEN + timedelta(minutes=5)
+    prices.get("AAPL", SATURDAY - timedelta(days=30), clock.now)
+    assert len(downloader.calls) == 2
+
+
+def test_no_download_after_the_close_once_fetched(tmp_path):
+    downloader = FakeDownloader()
+    prices = PriceStore(str(tmp_path), downloader=downloader, clock=Clock(SATURDAY))
+    prices.get("AAPL", SATURDAY - timedelta(days=30), SATURDAY)
+
+    def offline(*args):
+        raise AssertionError("ダウンロードしないはず")
+
+    reopened = PriceStore(str(tmp_path), downloader=offline, clock=Clock(SATURDAY + timedelta(hours=6)))
+    assert not reopened.get("AAPL", SATURDAY - timedelta(days=30), SATURDAY).empty
+
+
+def test_tse_lunch_break_is_not_trading_time():
+    from core.price_store import TSE
+
+    jst = timezone(timedelta(hours=9))
+    assert TSE.is_open(datetime(2024, 6, 10, 11, 0, tzinfo=jst))
+    assert not TSE.is_open(datetime(2024, 6, 10, 12, 0, tzinfo=jst))
+    assert TSE.is_open(datetime(2024, 6, 10, 13, 0, tzinfo=jst))
+    assert TSE.last_close(datetime(2024, 6, 10, 12, 0, tzinfo=jst)) == datetime(2024, 6, 10, 11, 30, tzinfo=jst)
+    assert TSE.session_minutes == 330
+
+
+def test_minute_bars_are_not_refetched_during_the_lunch_break(tmp_path):
+    jst = timezone(timedelta(hours=9))
+    downloader = FakeDownloader()
+    clock = Clock(datetime(2024, 6, 10, 11, 40, tzinfo=jst))
+    prices = PriceStore(str(tmp_path), downloader=downloader, clock=clock)
+    prices.get("7203.T", clock.now - timedelta(days=1), clock.now, "1m")
+
+    clock.now = datetime(2024, 6, 10, 12, 20, tzinfo=jst)
+    prices.get("7203.T", clock.now - timedelta(days=1), clock.now, "1m")
+    assert len(downloader.calls) == 1
+
+    clock.now = datetime(2024, 6, 10, 12, 35, tzinfo=jst)
+    prices.get("7203.T", clock.now - timedelta(days=1), clock.now, "1m")
+    assert len(downloader.calls) == 2
+
+
+def test_old_minute_bars_are_dropped(tmp_path):
+    from core.price_store import INTERVAL_RETENTION
+
+    clock = Clock(SATURDAY)
+    prices = PriceStore(str(tmp_path), downloader=FakeDownloader(), clock=clock)
+    prices.get("AAPL", SATURDAY - timedelta(days=5), SATURDAY, "1m")
+
+    clock.now = SATURDAY + timedelta(days=9)  # 月曜の取引時間外
+    prices.get("AAPL", clock.now - timedelta(days=5), clock.now, "1m")
+    stored = pd.read_parquet(tmp_path / "1m" / "AAPL.parquet")
+    assert stored.index[0] >= clock.now - INTERVAL_RETENTION["1m"]
+
+
+def test_empty_first_download_is_not_retried_while_fresh(tmp_path):
+    calls = []
+
+    def empty(ticker, start, end, interval="1d"):
+        calls.append((start, end))
+        return pd.DataFrame()
+
+    clock = Clock(MONDAY_OPEN)
+    prices = PriceStore(str(tmp_path), downloader=empty, clock=clock)
+    assert prices.get("AAPL", MONDAY_OPEN - timedelta(days=1), clock.now, "1m").empty
+
+    # TTL（1分足は1分）以内は取り直さない
+    clock.now = MONDAY_OPEN + timedelta(seconds=30)
+    assert prices.get("AAPL", MONDAY_OPEN - timedelta(days=1), clock.now, "1m").empty
+    assert len(calls) == 1
+
+    clock.now = MONDAY_OPEN + timedelta(minutes=5)
+    assert prices.get("AAPL", MONDAY_OPEN - timedelta(days=1), clock.now, "1m").empty
+    assert calls[-1] == (MONDAY_OPEN, clock.now)
@@ -0,0 +1,27 @@
+"""サイドバーで選ぶ各デモのページ
+
+ページごとのモジュールは最初に選ばれたときにだけimportする。fastf1や
+yfinance、foliumなどの重いライブラリは、それを使うページを開くまで
+読み込まれない（importしたモジュールはプロセス内で使い回す）。
+"""
+import importlib
+
+from core.profiling import COMPUTE, stage
+
+# サイドバーの表示名 -> views内のモジュール名（この順にサイドバーへ並べる）
+PAGES = {
+    "ホーム": "home",
+    "データ可視化": "data_viz",
+    "インタラクティブUI": "interactive",
+    "チャート": "charts",
+    "株価分析": "stocks",
+    "イトーヨーカドー店舗マップ": "store_map",
+    "F1分析": "f1",
+}
+
+
+def render(page: str) -> None:
+    """ページのモジュールをimportして描画する"""
+    with stage("ページのimport", COMPUTE):
+        module = importlib.import_module(f"{__name__}.{PAGES[page]}")
+    module.render()
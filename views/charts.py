@@ -0,0 +1,31 @@
+"""各種チャートデモ"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+def render():
+    st.header("📈 各種チャートデモ")
+
+    # ランダムデータ生成
+    chart_data = pd.DataFrame(
+        np.random.randn(20, 3),
+        columns=['A', 'B', 'C']
+    )
+
+    st.subheader("ラインチャート")
+    st.line_chart(chart_data)
+
+    st.subheader("エリアチャート")
+    st.area_chart(chart_data)
+
+    st.subheader("バーチャート")
+    st.bar_chart(chart_data)
+
+    # マップデータ
+    st.subheader("マップ")
+    map_data = pd.DataFrame(
+        np.random.randn(100, 2) / [50, 50] + [35.6762, 139.6503],
+        columns=['lat', 'lon']
+    )
+    st.map(map_data)
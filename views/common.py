@@ -0,0 +1,29 @@
+"""複数のページで使う部品（ダウンロード）
+
+ページを開いたときにだけimportされる。app.py が毎回importする部品は
+views.runtime に置き、ここにはpandasやpyarrowを読み込むものを置く。
+"""
+import streamlit as st
+
+from core.exports import ExportCache, download_name, mime_type
+from core.metrics import REGISTRY
+
+
+@st.cache_resource
+def get_export_cache():
+    """ダウンロード用に書き出したファイル（内容のハッシュごとに保存し、全ページで共有）"""
+    cache = ExportCache("data/exports")
+    REGISTRY.track_cache("exports", cache)
+    return cache
+
+
+def download_button(label, data, stem, fmt, key):
+    """ダウンロードボタン（ファイルはクリックされたときに書き出し関数 data で作る）"""
+    st.download_button(
+        label=f"{label}（{fmt}）",
+        data=data,
+        file_name=download_name(stem, fmt),
+        mime=mime_type(fmt),
+        on_click="ignore",
+        key=key,
+    )
@@ -0,0 +1,33 @@
+"""データ可視化デモ"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+
+def render():
+    st.header("📊 データ可視化デモ")
+
+    # サンプルデータの生成
+    df = pd.DataFrame({
+        '日付': pd.date_range('2024-01-01', periods=100),
+        '売上': np.random.randint(100, 1000, 100),
+        'カテゴリ': np.random.choice(['A', 'B', 'C'], 100)
+    })
+
+    st.subheader("データテーブル")
+    st.dataframe(df.head(10))
+
+    st.subheader("売上推移グラフ")
+    fig = px.line(df, x='日付', y='売上', color='カテゴリ',
+                  title='カテゴリ別売上推移')
+    st.plotly_chart(fig, use_container_width=True)
+
+    # ダウンロードボタン
+    csv = df.to_csv(index=False).encode('utf-8')
+    st.download_button(
+        label="CSVダウンロード",
+        data=csv,
+        file_name='sample_data.csv',
+        mime='text/csv',
+    )
@@ -0,0 +1,617 @@
+"""F1分析ダッシュボード（Fast-F1）"""
+import os
+import warnings
+
+import fastf1
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from core.downsample import DEFAULT_MAX_POINTS, lttb_indices, minmax_indices
+from core.exports import FORMATS
+from core.f1_data import SessionCache
+from core.f1_prefetch import GRAND_PRIX, SEASONS, SESSION_TYPES, SeasonPrefetcher, season_targets
+from core.lap_features import (clean_laps, compound_pace, lap_time_stats, pace_stability, sector_means,
+                               within_median)
+from core.metrics import FETCH_SECONDS, REGISTRY
+from core.profiling import COMPUTE, FETCH, stage
+from core.telemetry import TelemetryCache, delta_time
+from views.common import download_button, get_export_cache
+from views.runtime import timed_fragment
+
+
+def render():
+    st.header("🏎️ F1分析ダッシュボード")
+    st.write("Fast-F1ライブラリを使用してF1データを分析・可視化します。")
+
+    # Fast-F1のキャッシュを有効化
+    warnings.filterwarnings('ignore')
+    cache_dir = 'cache'
+    os.makedirs(cache_dir, exist_ok=True)
+    fastf1.Cache.enable_cache(cache_dir)
+
+    # サイドバー設定
+    st.sidebar.subheader("分析設定")
+
+    @st.cache_resource
+    def get_season_prefetcher():
+        """シーズンの先読み（fastf1のディスクキャッシュを温める）をバックグラウンドで実行する"""
+        return SeasonPrefetcher(cache_dir=cache_dir)
+
+    prefetcher = get_season_prefetcher()
+
+    # 年とグランプリを選択
+    year = st.sidebar.selectbox(
+        "シーズンを選択",
+        SEASONS,
+        index=0
+    )
+
+    session_type = st.sidebar.selectbox(
+        "セッション種別",
+        SESSION_TYPES,
+        index=0
+    )
+
+    # キャッシュが温まっている（すぐに表示できる）グランプリに印を付ける
+    warm = prefetcher.manifest.status(year, GRAND_PRIX[year], session_type)
+    gp = st.sidebar.selectbox(
+        "グランプリを選択",
+        GRAND_PRIX[year],
+        index=0,
+        format_func=lambda name: f"{name} ✅" if warm[name] else name
+    )
+
+    if prefetcher.running:
+        st.sidebar.caption(f"⏳ 先読み中... {prefetcher.done}/{prefetcher.total}")
+    else:
+        st.sidebar.caption(f"キャッシュ済み: {sum(warm.values())}/{len(warm)} グランプリ")
+        prefetch_classes = ["laps", "telemetry"] if st.sidebar.checkbox(
+            "テレメトリも先読み", help="テレメトリの重ね合わせ・エクスポートを最初に開くときの待ち時間がなくなります"
+        ) else ["laps"]
+        season_warm = all(prefetcher.manifest.is_warm(year, name, session_type, prefetch_classes) for name in warm)
+        if not season_warm and st.sidebar.button("このシーズンを先読み"):
+            prefetcher.start(season_targets([year], [session_type]), prefetch_classes)
+            st.sidebar.caption("⏳ バックグラウンドで先読みを開始しました")
+    max_points = st.sidebar.slider("最大描画ポイント数", 500, 10000, DEFAULT_MAX_POINTS, step=500)
+
+    def record_load(timing):
+        """fastf1の読み込み時間をメトリクスに記録する（ディスクキャッシュからの読み込みは別に数える）"""
+        FETCH_SECONDS.observe(timing.seconds, source="fastf1_disk" if timing.warm else "fastf1", kind=timing.data_class)
+
+    @st.cache_resource
+    def get_session_cache():
+        """読み込み済みのF1セッションを全ブラウザセッションで共有する（最大4件・合計2GBまで）"""
+        cache = SessionCache(max_sessions=4, max_bytes=2 * 1024 ** 3, cache_dir=cache_dir, on_load=record_load)
+        memory = REGISTRY.gauge("app_f1_session_cache_bytes", "読み込み済みのF1セッションのメモリ使用量（バイト）")
+        memory.set_function(lambda: cache.memory_bytes)
+        return cache
+
+    @st.cache_resource
+    def get_telemetry_cache():
+        """5 m間隔にリサンプリングしたテレメトリのディスクキャッシュ"""
+        cache = TelemetryCache("data/telemetry")
+        REGISTRY.track_cache("telemetry", cache)
+        return cache
+
+    # データ読み込み
+    try:
+        with st.spinner(f'{year} {gp} Grand Prix {session_type}のデータを読み込み中...'):
+            # セッションデータを取得（最初はラップのみ。テレメトリは表示するときに追加で読み込む）
+            with stage("セッションの読み込み", FETCH):
+                session_data = get_session_cache().get(year, gp, session_type, "laps")
+            session = session_data.session
+            laps = session.laps
+            if not warm[gp] and not laps.empty:
+                # 読み込めたセッションはfastf1のディスクキャッシュにも入っている
+                prefetcher.manifest.mark(year, gp, session_type, session_data.loaded)
+            # 秒単位のラップ・セクタータイムなどの特徴量（セッションごとに1回だけ作成）
+            with stage("ラップの特徴量", COMPUTE):
+                features = session_data.lap_features()
+            available_drivers = laps['Driver'].unique().tolist()
+
+            # 統計情報
+            st.markdown("---")
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                st.metric("シーズン", year)
+            with col2:
+                st.metric("グランプリ", gp)
+            with col3:
+                st.metric("セッション", session_type)
+
+            st.markdown("---")
+
+            # 表示ごとのウィジェットを操作したときは、この部分だけを再実行する
+            @timed_fragment("F1の表示")
+            def session_views():
+                # 表示の切り替え（選択中の表示だけを実行し、その表示に必要なデータだけを読み込む）
+                f1_view = st.radio(
+                    "表示", ["📊 ラップタイム分析", "🏎️ ドライビング特性", "🏁 ドライバー比較", "⚡ テレメトリ", "📋 データ"],
+                    horizontal=True, label_visibility="collapsed", key="f1_view"
+                )
+
+                if f1_view == "📊 ラップタイム分析":
+                    st.subheader("ラップタイム分析")
+
+                    if not laps.empty:
+                        # ドライバー選択（複数選択可能）
+                        drivers = sorted(available_drivers)
+                        selected_drivers = st.multiselect(
+                            "表示するドライバーを選択（複数選択可）",
+                            options=drivers,
+                            default=drivers[:5] if len(drivers) > 5 else drivers
+                        )
+
+                        if selected_drivers:
+                            # 外れ値（例：ピットインラップ）を除いた、選択されたドライバーのラップ
+                            filtered_laps = clean_laps(features, selected_drivers)
+
+                            # ラップタイム推移グラフ（折れ線）
+                            fig = px.line(
+                                filtered_laps,
+                                x='LapNumber',
+                                y='LapTimeSeconds',
+                                color='Driver',
+                                title=f'{year} {gp} GP - ラップタイム推移',
+                                labels={'LapNumber': 'ラップ番号', 'LapTimeSeconds': 'ラップタイム (秒)'},
+                                markers=True,
+                                hover_data=['Compound', 'TyreLife']
+                            )
+
+                            fig.update_layout(height=500, hovermode='x unified')
+                            st.plotly_chart(fig, use_container_width=True)
+
+                            # ドライバー別平均ラップタイム
+                            st.subheader("ドライバー別統計")
+                            avg_laptimes = lap_time_stats(filtered_laps)
+
+                            # 平均ラップタイムの棒グラフ
+                            fig_avg = px.bar(
+                                avg_laptimes,
+                                x='ドライバー',
+                                y='平均 (秒)',
+                                title='ドライバー別平均ラップタイム',
+                                color='平均 (秒)',
+                                color_continuous_scale='Viridis',
+                                text='平均 (秒)'
+                            )
+                            fig_avg.update_traces(texttemplate='%{text:.2f}', textposition='outside')
+                            fig_avg.update_layout(height=400)
+                            st.plotly_chart(fig_avg, use_container_width=True)
+
+                            # データテーブル
+                            st.dataframe(avg_laptimes.round(3), hide_index=True, use_container_width=True)
+                        else:
+                            st.warning("ドライバーを選択してください。")
+                    else:
+                        st.warning("ラップデータが見つかりませんでした。")
+
+                elif f1_view == "🏎️ ドライビング特性":
+                    st.subheader("ドライビング特性比較")
+
+                    if not laps.empty:
+                        # ドライバー選択（複数選択可能）
+                        drivers = sorted(available_drivers)
+                        selected_drivers_char = st.multiselect(
+                            "比較するドライバーを選択",
+                            options=drivers,
+                            default=drivers[:3] if len(drivers) > 3 else drivers,
+                            key='char_drivers'
+                        )
+
+                        if selected_drivers_char:
+                            # セクタータイム比較
+                            st.markdown("### セクタータイム比較")
+                            sector_df = sector_means(
+                                features, selected_drivers_char,
+                                labels=('セクター1 (秒)', 'セクター2 (秒)', 'セクター3 (秒)')
+                            )
+
+                            if not sector_df.empty:
+                                # セクター別の折れ線グラフ
+                                fig_sector = go.Figure()
+
+                                for sector in ['セクター1 (秒)', 'セクター2 (秒)', 'セクター3 (秒)']:
+                                    fig_sector.add_trace(go.Scatter(
+                                        x=sector_df['ドライバー'],
+                                        y=sector_df[sector],
+                                        mode='lines+markers',
+                                        name=sector,
+                                        line=dict(width=3),
+                                        marker=dict(size=10)
+                                    ))
+
+                                fig_sector.update_layout(
+                                    title='セクター別平均タイム比較',
+                                    xaxis_title='ドライバー',
+                                    yaxis_title='平均タイム (秒)',
+                                    height=400,
+                                    hovermode='x unified'
+                                )
+                                st.plotly_chart(fig_sector, use_container_width=True)
+
+                                # セクタータイムのデータテーブル
+                                st.dataframe(sector_df.round(3), hide_index=True, use_container_width=True)
+                            else:
+                                st.warning("セクタータイムデータが見つかりませんでした。")
+
+                            # タイヤコンパウンド別ペース比較
+                            st.markdown("### タイヤコンパウンド別ペース")
+                            compound_df = compound_pace(features, selected_drivers_char)
+
+                            if not compound_df.empty:
+                                fig_compound = px.line(
+                                    compound_df,
+                                    x='タイヤ',
+                                    y='平均ラップタイム (秒)',
+                                    color='ドライバー',
+                                    title='タイヤコンパウンド別平均ラップタイム',
+                                    markers=True,
+                                    line_shape='linear'
+                                )
+                                fig_compound.update_layout(height=400, hovermode='x unified')
+                                st.plotly_chart(fig_compound, use_container_width=True)
+
+                                st.dataframe(compound_df.round(3), hide_index=True, use_container_width=True)
+                            else:
+                                st.warning("タイヤコンパウンドデータが見つかりませんでした。")
+
+                            # ペース安定性比較（標準偏差）
+                            st.markdown("### ペース安定性比較")
+                            stability_df = pace_stability(features, selected_drivers_char)
+
+                            if not stability_df.empty:
+                                fig_stability = go.Figure()
+                                fig_stability.add_trace(go.Scatter(
+                                    x=stability_df['ドライバー'],
+                                    y=stability_df['標準偏差 (秒)'],
+                                    mode='lines+markers',
+                                    name='標準偏差',
+                                    line=dict(color='red', width=3),
+                                    marker=dict(size=12)
+                                ))
+                                fig_stability.update_layout(
+                                    title='ペース安定性（標準偏差が小さいほど安定）',
+                                    xaxis_title='ドライバー',
+                                    yaxis_title='標準偏差 (秒)',
+                                    height=400
+                                )
+                                st.plotly_chart(fig_stability, use_container_width=True)
+
+                                st.dataframe(stability_df.round(3), hide_index=True, use_container_width=True)
+                                st.info("💡 **標準偏差が小さいほどペースが安定しています。変動係数はペースのばらつきをパーセンテージで表します。**")
+                            else:
+                                st.warning("ペース安定性データを計算できませんでした。")
+
+                        else:
+                            st.warning("ドライバーを選択してください。")
+                    else:
+                        st.warning("ラップデータが見つかりませんでした。")
+
+                elif f1_view == "🏁 ドライバー比較":
+                    st.subheader("ドライバー比較")
+
+                    # ドライバー選択
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        driver1 = st.selectbox("ドライバー 1", available_drivers, index=0)
+                    with col2:
+                        driver2_index = min(1, len(available_drivers) - 1)
+                        driver2 = st.selectbox("ドライバー 2", available_drivers, index=driver2_index)
+
+                    # 2人のドライバーのラップを比較
+                    pair_laps = features[features['Driver'].isin([driver1, driver2])]
+                    pair_laps = pair_laps[pair_laps['LapTimeSeconds'].notna()]
+
+                    if (pair_laps['Driver'] == driver1).any() and (pair_laps['Driver'] == driver2).any():
+                        # 外れ値除去（2人のラップ全体の中央値で判定）
+                        comparison_df = pair_laps[
+                            within_median(pair_laps['LapTimeSeconds'], pair_laps['LapTimeSeconds'].median())
+                        ]
+
+                        # プロット
+                        fig_comp = px.line(
+                            comparison_df,
+                            x='LapNumber',
+                            y='LapTimeSeconds',
+                            color='Driver',
+                            title=f'{driver1} vs {driver2} - ラップタイム比較',
+                            labels={'LapNumber': 'ラップ番号', 'LapTimeSeconds': 'ラップタイム (秒)'},
+                            markers=True
+                        )
+                        fig_comp.update_layout(height=500)
+                        st.plotly_chart(fig_comp, use_container_width=True)
+
+                        # 統計比較
+                        pair_stats = pair_laps.groupby('Driver')['LapTimeSeconds'].agg(['mean', 'min', 'size'])
+                        col1, col2 = st.columns(2)
+
+                        for col, driver in [(col1, driver1), (col2, driver2)]:
+                            with col:
+                                st.markdown(f"### {driver} 統計")
+                                st.metric("平均ラップタイム", f"{pair_stats.loc[driver, 'mean']:.3f}秒")
+                                st.metric("最速ラップ", f"{pair_stats.loc[driver, 'min']:.3f}秒")
+                                st.metric("ラップ数", int(pair_stats.loc[driver, 'size']))
+
+                        # セクタータイム比較
+                        st.markdown("---")
+                        st.subheader("セクタータイム比較")
+
+                        sector_comp_df = sector_means(features, [driver1, driver2])
+
+                        if not sector_comp_df.empty:
+                            # セクター別比較グラフ
+                            fig_sector_comp = go.Figure()
+
+                            sectors = ['セクター1', 'セクター2', 'セクター3']
+                            colors = ['blue', 'green', 'red']
+
+                            for i, sector in enumerate(sectors):
+                                fig_sector_comp.add_trace(go.Scatter(
+                                    x=sector_comp_df['ドライバー'],
+                                    y=sector_comp_df[sector],
+                                    mode='lines+markers',
+                                    name=sector,
+                                    line=dict(width=3, color=colors[i]),
+                                    marker=dict(size=12)
+                                ))
+
+                            fig_sector_comp.update_layout(
+                                title=f'{driver1} vs {driver2} - セクター別平均タイム',
+                                xaxis_title='ドライバー',
+                                yaxis_title='平均タイム (秒)',
+                                height=400,
+                                hovermode='x unified'
+                            )
+                            st.plotly_chart(fig_sector_comp, use_container_width=True)
+
+                            # セクタータイムの差分表示
+                            if len(sector_comp_df) == 2:
+                                st.markdown("### セクター別タイム差")
+                                first, second = sector_comp_df[sectors].to_numpy()
+                                diff_df = pd.DataFrame({
+                                    'セクター': sectors,
+                                    f'{driver1} (秒)': first,
+                                    f'{driver2} (秒)': second,
+                                    '差 (秒)': second - first
+                                })
+                                st.dataframe(diff_df.round(3), hide_index=True, use_container_width=True)
+                        else:
+                            st.warning("セクタータイムデータが見つかりませんでした。")
+                    else:
+                        st.warning("選択したドライバーのデータが見つかりませんでした。")
+
+                elif f1_view == "⚡ テレメトリ":
+                    st.subheader("テレメトリデータ")
+
+                    # ドライバーとラップを選択（複数のラップを距離でそろえて重ねる）
+                    telemetry_drivers = st.multiselect(
+                        "ドライバーを選択（複数選択可）",
+                        available_drivers,
+                        default=available_drivers[:1],
+                        key='telemetry_drivers'
+                    )
+                    lap_mode = st.radio("ラップ", ["最速ラップ", "ラップ番号を指定"], horizontal=True, key='telemetry_lap_mode')
+
+                    driver_laps = features[features['Driver'].isin(telemetry_drivers)]
+                    if lap_mode == "最速ラップ":
+                        timed = driver_laps[driver_laps['LapTimeSeconds'].notna()]
+                        fastest = timed.loc[timed.groupby('Driver')['LapTimeSeconds'].idxmin()].set_index('Driver')
+                        picks = [(d, int(fastest.loc[d, 'LapNumber'])) for d in telemetry_drivers if d in fastest.index]
+                    else:
+                        lap_numbers = sorted(int(n) for n in driver_laps['LapNumber'].dropna().unique())
+                        selected_laps = st.multiselect("ラップ番号を選択", lap_numbers, default=lap_numbers[:1])
+                        available = set(zip(driver_laps['Driver'], driver_laps['LapNumber'].fillna(-1).astype(int)))
+                        picks = [(d, n) for d in telemetry_drivers for n in selected_laps if (d, n) in available]
+
+                    if picks:
+                        def fetch_telemetry(keys):
+                            """ディスクキャッシュに無いラップのテレメトリを取得する（このときだけテレメトリを読み込む）"""
+                            with st.spinner('テレメトリを読み込み中...'), stage("テレメトリの読み込み", FETCH):
+                                session_laps = get_session_cache().get(year, gp, session_type, "laps", "telemetry").session.laps
+                            return [
+                                session_laps[(session_laps['Driver'] == driver) & (session_laps['LapNumber'] == lap_number)]
+                                .iloc[0].get_telemetry()
+                                for *_, driver, lap_number in keys
+                            ]
+
+                        try:
+                            # 5 m間隔の距離グリッドにリサンプリングしたラップ（ラップ単位でディスクにキャッシュ）
+                            with stage("テレメトリのリサンプリング", COMPUTE):
+                                resampled = get_telemetry_cache().get_many(
+                                    [(year, gp, session_type, driver, lap_number) for driver, lap_number in picks],
+                                    fetch_telemetry
+                                )
+                            labels = [f"{driver} L{lap_number}" for driver, lap_number in picks]
+                            palette = px.colors.qualitative.Plotly
+
+                            # 表示区間で絞り込み（絞り込むと全解像度で描画）
+                            dist_max = float(max(lap['Distance'].max() for lap in resampled))
+                            dist_from, dist_to = st.slider(
+                                "表示区間 (m)", 0.0, dist_max, (0.0, dist_max), key='telemetry_range'
+                            )
+                            # 1ラップあたりの描画点数（重ねるラップが多いほど間引く）
+                            lap_points = max(max_points // len(resampled), 100)
+
+                            def overlay_figure(channel, y_title, downsample, dash=None, fig=None, name_suffix=''):
+                                """各ラップのチャンネルを距離に対して重ねた図"""
+                                fig = fig or go.Figure()
+                                for i, (label, lap) in enumerate(zip(labels, resampled)):
+                                    lap = lap[(lap['Distance'] >= dist_from) & (lap['Distance'] <= dist_to)]
+                                    distance = lap['Distance'].to_numpy()
+                                    values = lap[channel].to_numpy()
+                                    idx = downsample(distance, values)
+                                    fig.add_trace(go.Scatter(
+                                        x=distance[idx],
+                                        y=values[idx],
+                                        mode='lines',
+                                        name=label + name_suffix,
+                                        legendgroup=label,
+                                        line=dict(color=palette[i % len(palette)], dash=dash)
+                                    ))
+                                fig.update_layout(xaxis_title='距離 (m)', yaxis_title=y_title, height=300)
+                                return fig
+
+                            # チャンネルごとに描画点を間引く（連続値はLTTB、階段状の信号は最小・最大）
+                            lttb = lambda x, y: lttb_indices(x, y, lap_points)
+                            minmax = lambda x, y: minmax_indices(y, lap_points)
+
+                            # 速度グラフ
+                            st.markdown("#### 速度")
+                            st.plotly_chart(overlay_figure('Speed', '速度 (km/h)', lttb), use_container_width=True)
+
+                            # スロットル・ブレーキ
+                            st.markdown("#### スロットル・ブレーキ")
+                            fig_tb = overlay_figure('Throttle', '入力 (%)', lttb, name_suffix=' スロットル')
+                            overlay_figure('Brake', '入力 (%)', minmax, dash='dot', fig=fig_tb, name_suffix=' ブレーキ')
+                            st.plotly_chart(fig_tb, use_container_width=True)
+
+                            # ギア
+                            st.markdown("#### ギア")
+                            st.plotly_chart(overlay_figure('nGear', 'ギア', minmax), use_container_width=True)
+
+                            # タイム差（最初のラップを基準に、同じ距離を通過した時刻の差）
+                            if len(resampled) > 1:
+                                st.markdown(f"#### タイム差（基準: {labels[0]}）")
+                                distance, deltas = delta_time(resampled)
+                                in_range = (distance >= dist_from) & (distance <= dist_to)
+                                fig_delta = go.Figure()
+                                for i, label in enumerate(labels[1:], start=1):
+                                    x, y = distance[in_range], deltas[i][in_range]
+                                    idx = lttb_indices(x, y, lap_points)
+                                    fig_delta.add_trace(go.Scatter(
+                                        x=x[idx],
+                                        y=y[idx],
+                                        mode='lines',
+                                        name=label,
+                                        line=dict(color=palette[i % len(palette)])
+                                    ))
+                                fig_delta.add_hline(y=0, line=dict(color='gray', dash='dash'))
+                                fig_delta.update_layout(
+                                    xaxis_title='距離 (m)',
+                                    yaxis_title='タイム差 (秒、正は基準より遅い)',
+                                    height=300
+                                )
+                                st.plotly_chart(fig_delta, use_container_width=True)
+                        except Exception as e:
+                            st.error(f"テレメトリデータの読み込みエラー: {str(e)}")
+                    else:
+                        st.warning("表示するラップを選択してください。")
+
+                else:
+                    st.subheader("セッションデータ")
+
+                    # ラップデータ表示
+                    if not laps.empty:
+                        # 表示するカラムを選択
+                        display_columns = ['LapNumber', 'Driver', 'LapTime', 'Sector1Time', 'Sector2Time',
+                                           'Sector3Time', 'Compound', 'TyreLife', 'TrackStatus']
+
+                        # カラムが存在するか確認
+                        available_columns = [col for col in display_columns if col in laps.columns]
+
+                        display_df = laps[available_columns].copy()
+
+                        # 日本語カラム名
+                        column_mapping = {
+                            'LapNumber': 'ラップ番号',
+                            'Driver': 'ドライバー',
+                            'LapTime': 'ラップタイム',
+                            'Sector1Time': 'セクター1',
+                            'Sector2Time': 'セクター2',
+                            'Sector3Time': 'セクター3',
+                            'Compound': 'タイヤ',
+                            'TyreLife': 'タイヤ寿命',
+                            'TrackStatus': 'トラック状況'
+                        }
+
+                        display_df = display_df.rename(columns=column_mapping)
+
+                        # 表示行数選択
+                        show_rows = st.selectbox("表示行数", [10, 25, 50, 100, "全て"], index=0, key='f1_rows')
+
+                        if show_rows == "全て":
+                            st.dataframe(display_df, use_container_width=True, hide_index=True)
+                        else:
+                            st.dataframe(display_df.head(int(show_rows)), use_container_width=True, hide_index=True)
+
+                        # ダウンロード（CSV・Parquet・Arrow）
+                        export_format = st.radio("ファイル形式", list(FORMATS), horizontal=True, key='f1_export_format')
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            download_button(
+                                "📥 ラップデータ", get_export_cache().frame(display_df, export_format),
+                                f'f1_{year}_{gp}_{session_type}_data', export_format, key='f1_laps_download'
+                            )
+
+                        def session_telemetry():
+                            """セッション全体のテレメトリをドライバーごとに返す（ダウンロード時に読み込む）"""
+                            loaded = get_session_cache().get(year, gp, session_type, "laps", "telemetry").session
+                            numbers = loaded.laps.drop_duplicates('DriverNumber').set_index('DriverNumber')['Driver']
+                            for number, car_data in loaded.car_data.items():
+                                yield pd.DataFrame(car_data).assign(Driver=numbers.get(number, number))
+
+                        with col2:
+                            download_button(
+                                "📥 全ドライバーのテレメトリ",
+                                get_export_cache().frames((year, gp, session_type, "telemetry"), session_telemetry, export_format),
+                                f'f1_{year}_{gp}_{session_type}_telemetry', export_format, key='f1_telemetry_download'
+                            )
+                    else:
+                        st.warning("データが見つかりませんでした。")
+
+            session_views()
+
+            # セッション情報
+            st.markdown("---")
+            st.subheader("📋 セッション情報")
+
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                st.write(f"**イベント名:** {session.event['EventName']}")
+                st.write(f"**開催地:** {session.event['Location']}")
+                st.write(f"**国:** {session.event['Country']}")
+
+            with col2:
+                st.write(f"**サーキット:** {session.event.get('OfficialEventName', 'N/A')}")
+                st.write(f"**セッション:** {session_type}")
+                st.write(f"**シーズン:** {year}")
+
+            with col3:
+                if hasattr(session, 'date'):
+                    st.write(f"**日付:** {session.date}")
+                st.write(f"**総ラップ数:** {len(laps)}")
+                st.write(f"**参加ドライバー数:** {len(laps['Driver'].unique())}")
+
+            # データの種類ごとの読み込み時間（warm: fastf1のディスクキャッシュから読み込み）
+            with st.expander("⏱️ 読み込み時間"):
+                st.dataframe(
+                    pd.DataFrame([
+                        {'データ': t.data_class, '時間 (秒)': round(t.seconds, 3), 'キャッシュ': 'warm' if t.warm else 'cold'}
+                        for t in session_data.timings
+                    ]),
+                    hide_index=True,
+                    use_container_width=True
+                )
+
+    except Exception as e:
+        st.error(f"データの読み込みに失敗しました: {str(e)}")
+        st.info("""
+        **ヒント:**
+        - インターネット接続を確認してください
+        - 別のグランプリまたはシーズンを選択してみてください
+        - Fast-F1のキャッシュが破損している可能性があります
+        """)
+
+    # 注意事項
+    st.markdown("---")
+    st.info("""
+    ℹ️ **情報**:
+    - このページはFast-F1ライブラリを使用してF1の公式データを取得・分析しています
+    - データの読み込みには時間がかかる場合があります
+    - キャッシュを使用して2回目以降の読み込みを高速化しています
+    """)
@@ -0,0 +1,27 @@
+"""ホーム画面"""
+import streamlit as st
+
+
+def render():
+    st.header("👋 ようこそ！")
+    st.write("""
+    これはStreamlitで作成されたサンプルアプリケーションです。
+
+    **主な機能:**
+    - データ可視化
+    - インタラクティブなUI要素
+    - リアルタイムチャート
+
+    左のサイドバーから各デモを選択してください。
+    """)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric(label="ユーザー数", value="1,234", delta="123")
+
+    with col2:
+        st.metric(label="アクティブセッション", value="456", delta="-12")
+
+    with col3:
+        st.metric(label="処理数", value="7,890", delta="345")
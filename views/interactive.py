@@ -0,0 +1,39 @@
+"""インタラクティブUIデモ"""
+from datetime import datetime
+
+import streamlit as st
+
+
+def render():
+    st.header("🎮 インタラクティブUIデモ")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("入力要素")
+
+        name = st.text_input("名前を入力してください")
+        age = st.slider("年齢を選択", 0, 100, 25)
+        color = st.color_picker("好きな色を選択", "#00f900")
+
+        if st.button("送信"):
+            st.success(f"こんにちは、{name}さん！ {age}歳ですね。")
+
+    with col2:
+        st.subheader("選択要素")
+
+        choice = st.radio(
+            "好きな果物は？",
+            ["リンゴ", "バナナ", "オレンジ"]
+        )
+
+        multi = st.multiselect(
+            "趣味を選択（複数可）",
+            ["読書", "スポーツ", "音楽", "旅行", "料理"]
+        )
+
+        date = st.date_input("日付を選択", datetime.now())
+
+        st.write(f"選択: {choice}")
+        if multi:
+            st.write(f"趣味: {', '.join(multi)}")
@@ -0,0 +1,106 @@
+"""毎回の再実行で使う部品（再実行時間・プロファイリング・メトリクス）
+
+app.py がどのページでもimportするので、pandasやpyarrowなどの重い
+ライブラリを読み込まない（plotlyはプロファイルを表示するときにだけ読み込む）。
+"""
+import functools
+import logging
+import os
+from contextlib import contextmanager
+
+import streamlit as st
+
+from core.metrics import DEFAULT_PORT, RERUN_SECONDS, start_server
+from core.profiling import DEFAULT_DIR, DEFAULT_KEEP, KINDS, RENDER, Profiler, current, profile_mode, stage
+from core.timing import RerunTimer
+
+logger = logging.getLogger(__name__)
+
+
+@st.cache_resource
+def serve_metrics():
+    """メトリクスのHTTPサーバーをプロセスごとに1回だけ起動する（METRICS_PORT=0 で起動しない）"""
+    port = int(os.environ.get("METRICS_PORT", DEFAULT_PORT))
+    if not port:
+        return None
+    try:
+        return start_server(port)
+    except OSError as e:  # 同じホストの別プロセスがポートを使っている
+        logger.warning("メトリクスのサーバーを起動できませんでした（ポート %d）: %s", port, e)
+        return None
+
+
+def rerun_timer():
+    """このブラウザセッションの再実行時間の記録"""
+    if "rerun_timer" not in st.session_state:
+        st.session_state.rerun_timer = RerunTimer()
+    return st.session_state.rerun_timer
+
+
+def timed_fragment(name):
+    """関数をフラグメントにする（中のウィジェットを操作してもその部分だけを再実行し、時間を記録する）"""
+    def decorator(func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            timer = rerun_timer()
+            with timer.measure(name), profiling(name, sidebar=False):
+                func(*args, **kwargs)
+            RERUN_SECONDS.observe(timer.last(name).seconds, page=func.__module__.rsplit(".", 1)[-1], scope=name)
+            st.caption(f"⏱️ {name}: {timer.last(name).seconds * 1000:.0f} ms")
+        return st.fragment(run)
+    return decorator
+
+
+def profile_settings():
+    """プロファイルモード（?profile= を環境変数 APP_PROFILE より優先する。無効なら None）"""
+    return profile_mode(st.query_params.get("profile", os.environ.get("APP_PROFILE")))
+
+
+@contextmanager
+def profiling(label, sidebar=True):
+    """プロファイルモードのときだけ中の処理を記録し、終わったら段階ごとの時間を表示する
+
+    すでに記録中（ページ全体の再実行の中で呼ばれたフラグメントなど）なら、
+    その中の1つの描画段階として記録する。
+    """
+    mode = profile_settings()
+    if mode is None or current() is not None:
+        with stage(label, RENDER):
+            yield
+        return
+    profiler = Profiler(label, mode, os.environ.get("APP_PROFILE_DIR", DEFAULT_DIR),
+                        int(os.environ.get("APP_PROFILE_KEEP", DEFAULT_KEEP)))
+    with profiler.activate():
+        yield
+    with (st.sidebar if sidebar else st).expander(f"🔬 プロファイル（{label}）", expanded=sidebar):
+        show_profile(profiler)
+
+
+def show_profile(profiler):
+    """段階ごとの開始と時間のウォーターフォール"""
+    import plotly.graph_objects as go
+
+    st.caption(f"再実行の合計: {profiler.total * 1000:.0f} ms")
+    rows = profiler.summary()
+    if rows:
+        fig = go.Figure()
+        colors = dict(zip(KINDS, ["#636EFA", "#EF553B", "#00CC96"]))
+        labels = [f"{'　' * (s.depth - 1)}{s.name}" for s in sorted(profiler.stages, key=lambda s: (s.start, s.depth))]
+        for kind in KINDS:
+            picked = [(label, row) for label, row in zip(labels, rows) if row["種類"] == kind]
+            if picked:
+                fig.add_trace(go.Bar(
+                    y=[label for label, _ in picked],
+                    x=[row["時間 (ms)"] for _, row in picked],
+                    base=[row["開始 (ms)"] for _, row in picked],
+                    orientation="h", name=kind, marker_color=colors[kind],
+                ))
+        fig.update_layout(
+            height=80 + 24 * len(rows), margin=dict(l=0, r=0, t=10, b=0), barmode="overlay",
+            xaxis_title="ms", yaxis=dict(autorange="reversed", categoryorder="array", categoryarray=labels),
+            legend=dict(orientation="h", y=-0.2),
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+    if profiler.output:
+        st.caption(f"プロファイラの出力: `{profiler.output}`")
@@ -0,0 +1,357 @@
+"""株価分析ダッシュボード（単一銘柄・ウォッチリスト）"""
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import streamlit as st
+
+from core.charts import (bollinger_figure, macd_figure, monthly_returns_figure, price_figure,
+                         returns_histogram, rsi_figure)
+from core.downsample import DEFAULT_MAX_POINTS, aggregate_ohlc, downsample_lines
+from core.exports import FORMATS
+from core.fundamentals import FundamentalsCache, yfinance_fetcher
+from core.indicators import add_indicators, annualized_stats
+from core.intraday import INTRADAY_PERIODS, IntradayFeed, bars_per_year
+from core.metrics import REGISTRY, timed
+from core.price_store import PriceStore, yfinance_downloader
+from core.profiling import COMPUTE, FETCH, RENDER, stage
+from core.watchlist import fetch_watchlist, parse_tickers, summarize
+from views.common import download_button, get_export_cache
+from views.runtime import timed_fragment
+
+
+def render():
+    st.header("📊 株価分析ダッシュボード")
+
+    # サイドバーで期間設定
+    st.sidebar.subheader("分析設定")
+    mode = st.sidebar.radio("表示モード", ["単一銘柄", "ウォッチリスト"], horizontal=True)
+
+    # 分足は単一銘柄モードのみ
+    interval_options = {"日足": "1d", "5分足": "5m", "1分足": "1m"}
+    if mode == "単一銘柄":
+        interval = interval_options[st.sidebar.radio("足種", list(interval_options.keys()), horizontal=True)]
+    else:
+        interval = "1d"
+
+    if interval == "1d":
+        period_options = {
+            "1ヶ月": 30,
+            "3ヶ月": 90,
+            "6ヶ月": 180,
+            "1年": 365,
+            "2年": 730,
+            "5年": 1825
+        }
+        period = st.sidebar.selectbox("期間を選択", list(period_options.keys()), index=3)
+    else:
+        period_options = INTRADAY_PERIODS[interval]
+        period = st.sidebar.selectbox("期間を選択", list(period_options.keys()), index=0)
+    days = period_options[period]
+    max_points = st.sidebar.slider("最大描画ポイント数", 500, 10000, DEFAULT_MAX_POINTS, step=500)
+
+    @st.cache_resource
+    def get_price_store():
+        """プロセス全体で共有する株価キャッシュ（yfinanceの取得時間とヒット数をメトリクスに記録する）"""
+        store = PriceStore("data/prices", downloader=timed(yfinance_downloader, "yfinance", "prices"))
+        REGISTRY.track_cache("price_store", store)
+        return store
+
+    @st.cache_data(ttl=60, show_spinner=False)
+    def load_price_history(ticker, days):
+        """ローカルキャッシュ経由で株価履歴を取得し、テクニカル指標を付加する"""
+        end_date = datetime.now(timezone.utc)
+        start_date = end_date - timedelta(days=days)
+        with stage("株価の読み込み", FETCH):
+            prices = get_price_store().get(ticker, start_date, end_date)
+        with stage("テクニカル指標", COMPUTE):
+            return add_indicators(prices)
+
+    @st.cache_resource
+    def get_intraday_feed(ticker, interval, days):
+        """分足フレームを全セッションで共有する（更新は末尾のみ）"""
+        return IntradayFeed(get_price_store(), ticker, interval, timedelta(days=days))
+
+    @st.fragment(run_every=60)
+    def live_price_chart(feed, max_points):
+        """分足チャートだけを1分ごとに再描画する（ページ全体は再実行しない）"""
+        new_bars = feed.refresh()
+        st.caption(f"🔄 {datetime.now():%H:%M:%S} 更新（新規バー: {new_bars}本）")
+        st.plotly_chart(price_figure(aggregate_ohlc(feed.frame, max_points)), use_container_width=True)
+
+    @timed_fragment("データ表")
+    def data_table(df, ticker, period):
+        """データ表と表示行数・ダウンロード（表示行数を変えてもこの部分だけを再実行する）"""
+        st.subheader("株価データ")
+
+        # データ表示オプション
+        show_rows = st.selectbox("表示行数", [10, 25, 50, 100, "全て"], index=0)
+
+        display_df = df[['Open', 'High', 'Low', 'Close', 'Volume', 'MA5', 'MA25', 'RSI', 'MACD']].copy()
+        display_df.columns = ['始値', '高値', '安値', '終値', '出来高', 'MA5', 'MA25', 'RSI', 'MACD']
+
+        if show_rows == "全て":
+            st.dataframe(display_df, use_container_width=True)
+        else:
+            st.dataframe(display_df.tail(int(show_rows)), use_container_width=True)
+
+        # ダウンロード（CSV・Parquet・Arrow）
+        export_format = st.radio("ファイル形式", list(FORMATS), horizontal=True, key='stock_export_format')
+        download_button(
+            "📥 ダウンロード", get_export_cache().frame(display_df, export_format, index=True),
+            f'{ticker}_{period}_stock_data', export_format, key='stock_download'
+        )
+
+    @st.cache_resource
+    def get_fundamentals_cache():
+        """企業情報のキャッシュ（有効期限1日、バックグラウンドで取得）"""
+        return FundamentalsCache("data/fundamentals", fetcher=timed(yfinance_fetcher, "yfinance", "info"))
+
+    def company_info(ticker):
+        """企業情報を表示する。取得中は読み込み表示の部分だけを定期的に再描画する"""
+        cache = get_fundamentals_cache()
+        info = cache.get_nowait(ticker)
+        if info is None:
+            if cache.error(ticker) and not cache.is_loading(ticker):
+                st.warning(f"企業情報を取得できませんでした: {cache.error(ticker)}")
+            else:
+                wait_for_company_info(ticker)
+            return
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.write(f"**企業名:** {info.get('longName', 'N/A')}")
+            st.write(f"**セクター:** {info.get('sector', 'N/A')}")
+            st.write(f"**産業:** {info.get('industry', 'N/A')}")
+
+        with col2:
+            st.write(f"**時価総額:** ¥{info.get('marketCap', 0):,.0f}")
+            st.write(f"**PER:** {info.get('trailingPE', 'N/A')}")
+            st.write(f"**PBR:** {info.get('priceToBook', 'N/A')}")
+
+        with col3:
+            st.write(f"**配当利回り:** {info.get('dividendYield', 0) * 100:.2f}%" if info.get('dividendYield') else "N/A")
+            st.write(f"**52週高値:** ¥{info.get('fiftyTwoWeekHigh', 'N/A')}")
+            st.write(f"**52週安値:** ¥{info.get('fiftyTwoWeekLow', 'N/A')}")
+
+    @st.fragment(run_every=2)
+    def wait_for_company_info(ticker):
+        """取得中の読み込み表示。取得が終わったら（失敗も含む）ページ全体を再実行して定期的な再描画を止める"""
+        cache = get_fundamentals_cache()
+        if cache.get_nowait(ticker) is not None or (cache.error(ticker) and not cache.is_loading(ticker)):
+            st.rerun(scope="app")
+        st.info("⏳ 企業情報を読み込み中...")
+
+    @st.cache_data(ttl=60, show_spinner=False)
+    def load_watchlist(tickers, days):
+        """ウォッチリストの銘柄を並列取得する"""
+        end_date = datetime.now(timezone.utc)
+        start_date = end_date - timedelta(days=days)
+        return fetch_watchlist(get_price_store(), list(tickers), start_date, end_date)
+
+    # データ取得
+    if mode == "単一銘柄":
+        ticker = st.sidebar.text_input("ティッカー", "7203.T").strip().upper()  # デフォルト: トヨタ自動車
+    else:
+        watchlist_text = st.sidebar.text_area(
+            "ウォッチリスト（カンマ・改行区切り）",
+            "7203.T, 6758.T, 9984.T, 7974.T, 8306.T, 6861.T, 9432.T, 8035.T"
+        )
+        tickers = parse_tickers(watchlist_text)
+
+        st.subheader("📋 ウォッチリスト")
+        with st.spinner(f'{len(tickers)}銘柄の株価データを取得中...'), stage("ウォッチリストの取得", FETCH):
+            results = load_watchlist(tuple(tickers), days)
+
+        summary_df = summarize(results)
+        st.dataframe(
+            summary_df.round(2),
+            hide_index=True,
+            use_container_width=True
+        )
+
+        failed = [r for r in results if not r.ok]
+        if failed:
+            st.warning(f"{len(failed)}銘柄の取得に失敗しました: {', '.join(r.ticker for r in failed)}")
+
+        # 詳細表示する銘柄を選択
+        ok_tickers = [r.ticker for r in results if r.ok]
+        ticker = st.selectbox("詳細を表示する銘柄", ok_tickers) if ok_tickers else None
+        st.markdown("---")
+
+    if ticker:
+        st.subheader(f"🔍 {ticker}")
+
+    with st.spinner('株価データを取得中...'):
+        with stage("株価データ", FETCH):
+            if not ticker:
+                df = pd.DataFrame()
+            elif interval == "1d":
+                df = load_price_history(ticker, days)
+            else:
+                feed = get_intraday_feed(ticker, interval, days)
+                feed.refresh()
+                df = feed.frame.copy()
+
+        if df.empty:
+            st.error("データを取得できませんでした。")
+        else:
+            # メトリクス表示
+            col1, col2, col3, col4 = st.columns(4)
+
+            current_price = df['Close'].iloc[-1]
+            # 寄り付き直後の分足などバーが1本しかないときは前のバーとの差を出さない
+            price_delta = None
+            if len(df) > 1:
+                prev_price = df['Close'].iloc[-2]
+                price_change = current_price - prev_price
+                price_change_pct = (price_change / prev_price) * 100
+                price_delta = f"{price_change:+.2f} ({price_change_pct:+.2f}%)"
+
+            with col1:
+                st.metric(
+                    label="現在値",
+                    value=f"¥{current_price:,.2f}",
+                    delta=price_delta
+                )
+
+            with col2:
+                st.metric(
+                    label="出来高",
+                    value=f"{df['Volume'].iloc[-1]:,.0f}"
+                )
+
+            with col3:
+                high_52w = df['High'].max()
+                st.metric(
+                    label=f"{period}高値",
+                    value=f"¥{high_52w:,.2f}"
+                )
+
+            with col4:
+                low_52w = df['Low'].min()
+                st.metric(
+                    label=f"{period}安値",
+                    value=f"¥{low_52w:,.2f}"
+                )
+
+            # ボラティリティ計算
+            with stage("ボラティリティ・シャープレシオ", COMPUTE):
+                volatility, sharpe_ratio = annualized_stats(df['Close'].to_numpy(), bars_per_year(ticker, interval))
+
+            st.markdown("---")
+
+            # ズームを変えたときはチャートと指標のタブだけを再実行する
+            @timed_fragment("チャート・指標")
+            def price_tabs():
+                # 描画上限を超える場合は表示期間で絞り込めるようにする（絞り込むと全解像度で描画）
+                view_df = df
+                if len(df) > max_points:
+                    dates = df.index.tz_localize(None) if df.index.tz is not None else df.index
+                    view_start, view_end = st.slider(
+                        "表示期間（ズーム）",
+                        min_value=dates[0].to_pydatetime(),
+                        max_value=dates[-1].to_pydatetime(),
+                        value=(dates[0].to_pydatetime(), dates[-1].to_pydatetime())
+                    )
+                    view_df = df[(dates >= view_start) & (dates <= view_end)]
+                if len(view_df) > max_points:
+                    st.caption(f"📉 {len(view_df):,}点を{max_points:,}点に間引いて描画しています。期間を絞ると全解像度で表示します。")
+
+                # タブで表示を切り替え
+                tab1, tab2, tab3, tab4 = st.tabs(["📈 価格チャート", "📊 テクニカル分析", "📉 統計情報", "📋 データ"])
+
+                with tab1, stage("価格チャート", RENDER):
+                    st.subheader("ローソク足チャート + 移動平均線")
+
+                    # ローソク足チャート（分足は一定間隔で自動更新）
+                    if interval == "1d":
+                        fig = price_figure(aggregate_ohlc(view_df, max_points))
+                        st.plotly_chart(fig, use_container_width=True)
+                    else:
+                        live_price_chart(feed, max_points)
+
+                with tab2, stage("テクニカル分析", RENDER):
+                    st.subheader("テクニカル指標")
+
+                    # RSI
+                    col1, col2 = st.columns(2)
+
+                    with col1:
+                        st.markdown("### RSI (相対力指数)")
+                        fig_rsi = rsi_figure(downsample_lines(view_df, 'RSI', max_points))
+                        st.plotly_chart(fig_rsi, use_container_width=True)
+
+                        current_rsi = df['RSI'].iloc[-1]
+                        if current_rsi > 70:
+                            st.warning(f"現在のRSI: {current_rsi:.2f} - 買われすぎの可能性")
+                        elif current_rsi < 30:
+                            st.info(f"現在のRSI: {current_rsi:.2f} - 売られすぎの可能性")
+                        else:
+                            st.success(f"現在のRSI: {current_rsi:.2f} - 中立")
+
+                    with col2:
+                        st.markdown("### MACD")
+                        fig_macd = macd_figure(downsample_lines(view_df, 'MACD', max_points))
+                        st.plotly_chart(fig_macd, use_container_width=True)
+
+                        if df['MACD'].iloc[-1] > df['Signal'].iloc[-1]:
+                            st.success("MACD: 買いシグナル")
+                        else:
+                            st.warning("MACD: 売りシグナル")
+
+                    # ボリンジャーバンド
+                    st.markdown("### ボリンジャーバンド")
+                    fig_bb = bollinger_figure(downsample_lines(view_df, 'Close', max_points))
+                    st.plotly_chart(fig_bb, use_container_width=True)
+
+                with tab3, stage("統計情報", RENDER):
+                    st.subheader("統計情報")
+
+                    col1, col2 = st.columns(2)
+
+                    with col1:
+                        st.markdown("### 価格統計")
+                        stats_df = pd.DataFrame({
+                            '指標': ['平均値', '中央値', '標準偏差', '最高値', '最安値', '変動率'],
+                            '値': [
+                                f"¥{df['Close'].mean():,.2f}",
+                                f"¥{df['Close'].median():,.2f}",
+                                f"¥{df['Close'].std():,.2f}",
+                                f"¥{df['Close'].max():,.2f}",
+                                f"¥{df['Close'].min():,.2f}",
+                                f"{((df['Close'].iloc[-1] / df['Close'].iloc[0] - 1) * 100):+.2f}%"
+                            ]
+                        })
+                        st.dataframe(stats_df, hide_index=True, use_container_width=True)
+
+                        st.metric(
+                            label=f"年率ボラティリティ ({period})",
+                            value=f"{volatility:.2f}%"
+                        )
+
+                    with col2:
+                        st.markdown("### リターン分布")
+                        fig_hist = returns_histogram(df['Close'])
+                        st.plotly_chart(fig_hist, use_container_width=True)
+
+                        # シャープレシオ（リスクフリーレート0%と仮定）
+                        st.metric(
+                            label="シャープレシオ (年率)",
+                            value=f"{sharpe_ratio:.2f}"
+                        )
+
+                    # 月次リターン
+                    st.markdown("### 月次リターン")
+                    fig_monthly = monthly_returns_figure(df['Close'])
+                    st.plotly_chart(fig_monthly, use_container_width=True)
+
+                with tab4:
+                    data_table(df, ticker, period)
+
+            price_tabs()
+
+            # 企業情報（価格チャートを先に表示し、取得でき次第表示する）
+            st.markdown("---")
+            st.subheader("📋 企業情報")
+            company_info(ticker)
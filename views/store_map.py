@@ -0,0 +1,267 @@
+"""イトーヨーカドー店舗マップ"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+import streamlit.components.v1 as components
+from streamlit_folium import st_folium
+
+from core.metrics import REGISTRY
+from core.profiling import COMPUTE, FETCH, RENDER, stage
+from core.store_data import StoreDataError, load_stores
+from core.store_index import DISTANCE_COLUMN, StoreIndex
+from core.store_map import (MODE_CLUSTER, MODE_MARKERS, MapCache, build_store_map, contains_bounds,
+                            cull_to_bounds, expand_bounds, map_cache_key, render_map_html)
+from core.store_search import SearchIndex
+from core.store_stats import PrefectureStats
+
+
+def render():
+    st.header("🏪 イトーヨーカドー店舗マップ")
+    st.write("日本全国のイトーヨーカドー店舗を地図上に表示します。")
+
+    # list_store.txtからビルドした店舗データセットを読み込む
+    # （失敗したときは例外のまま返してキャッシュせず、list_store.txtを直せば次の実行で読み込み直す）
+    @st.cache_data
+    def load_store_data():
+        """店舗データセット（緯度経度を含む）をDataFrameとして読み込む（全列をコピーする）"""
+        return load_stores('list_store.txt', 'data/stores.arrow')
+
+    @st.cache_resource
+    def get_map_cache():
+        """HTML化した店舗マップを全セッションで共有する（最大8件のLRU）"""
+        cache = MapCache(maxsize=8)
+        REGISTRY.track_cache("store_map", cache)
+        return cache
+
+    @st.cache_resource
+    def get_store_index():
+        """全店舗の緯度経度から近傍検索用のKD木を1回だけ作成する"""
+        return StoreIndex(load_store_data())
+
+    @st.cache_resource
+    def get_search_index():
+        """店舗名・住所の検索インデックスと、並び替え用の各列の順位を1回だけ作成する"""
+        df = load_store_data()
+        ranks = {col: df[col].astype(str).rank(method='first').to_numpy() for col in ['店舗名', '都道府県']}
+        return SearchIndex(df), ranks
+
+    @st.cache_resource
+    def get_prefecture_stats():
+        """都道府県別の店舗数・範囲・重心を1回だけ集計する"""
+        return PrefectureStats(load_store_data())
+
+    # データ読み込み
+    with st.spinner('店舗データを読み込み中...'), stage("店舗データの読み込み", FETCH):
+        try:
+            df_stores = load_store_data()
+        except FileNotFoundError:
+            st.error("list_store.txtファイルが見つかりません。")
+            df_stores = pd.DataFrame()
+        except StoreDataError as e:
+            st.error(f"店舗データに{len(e.errors)}件のエラーがあります。")
+            st.code("\n".join(e.errors))
+            df_stores = pd.DataFrame()
+        except Exception as e:
+            st.error(f"エラーが発生しました: {str(e)}")
+            df_stores = pd.DataFrame()
+
+    if df_stores.empty:
+        st.warning("店舗データを読み込めませんでした。")
+    else:
+        with stage("都道府県別の集計", COMPUTE):
+            stats = get_prefecture_stats()
+
+        # サイドバーでフィルター
+        st.sidebar.subheader("表示設定")
+        selected_prefectures = st.sidebar.multiselect(
+            "都道府県で絞り込み",
+            options=stats.prefectures,
+            default=stats.prefectures
+        )
+        map_modes = {"クラスタ表示": MODE_CLUSTER, "個別マーカー": MODE_MARKERS}
+        map_mode = map_modes[st.sidebar.radio("地図の描画方式", list(map_modes.keys()))]
+        cull_viewport = st.sidebar.checkbox("表示範囲内の店舗のみ描画", value=False)
+
+        # 統計情報（読み込み時の集計から求める）
+        selection = stats.selection(selected_prefectures)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("総店舗数", len(df_stores))
+        with col2:
+            st.metric("表示店舗数", stats.count(selected_prefectures))
+        with col3:
+            st.metric("都道府県数", len(selection))
+
+        st.markdown("---")
+
+        # 表示切り替え（st.tabsは非表示のタブも毎回実行されるため、選択中の表示だけを実行する）
+        store_view = st.radio(
+            "表示", ["🗺️ 地図表示", "📋 店舗一覧", "📍 近くの店舗"],
+            horizontal=True, label_visibility="collapsed", key="store_view"
+        )
+
+        if store_view == "🗺️ 地図表示":
+            st.subheader("店舗マップ")
+
+            if selection.empty:
+                st.warning("選択された都道府県に店舗がありません。")
+            else:
+                # ビューポートカリング: 前回の表示範囲を広げた範囲内の店舗だけを描画する
+                view = st.session_state.get('store_map_view', {}) if cull_viewport else {}
+                render_bounds = view.get('render_bounds')
+
+                def build():
+                    return build_store_map(
+                        df_stores[stats.mask(selected_prefectures)],
+                        mode=map_mode,
+                        bounds=render_bounds,
+                        center=view.get('center') or stats.centroid(selected_prefectures),
+                        zoom=view.get('zoom', 6),
+                        # 初期表示は選択した都道府県の範囲（読み込み時に集計済み）に合わせる
+                        fit=None if view.get('center') else stats.bounds(selected_prefectures)
+                    )
+
+                map_state = None
+                if cull_viewport:
+                    # 表示範囲を受け取るためst_foliumで表示する（マップは毎回作り、セッション間で共有しない）
+                    with stage("地図の作成", COMPUTE):
+                        m = build()
+                    if render_bounds:
+                        st.caption(f"表示範囲内の{len(cull_to_bounds(df_stores[stats.mask(selected_prefectures)], render_bounds))}店舗を描画しています。")
+                    with stage("地図の描画", RENDER):
+                        map_state = st_folium(
+                            m, width=None, height=600, key='store_map',
+                            returned_objects=['bounds', 'zoom', 'center']
+                        )
+                else:
+                    # 地図を操作しても再実行しないので、HTML化したマップをキャッシュしてそのまま表示する
+                    with stage("地図の作成", COMPUTE):
+                        map_html = get_map_cache().get_or_build(
+                            map_cache_key(selected_prefectures, map_mode),
+                            lambda: render_map_html(build())
+                        )
+                    with stage("地図の描画", RENDER):
+                        components.html(map_html, height=600)
+
+                # 描画済みの範囲の外へ移動したら、新しい表示範囲で描画し直す
+                bounds = (map_state or {}).get('bounds')
+                if cull_viewport and bounds and bounds['_southWest']['lat'] is not None:
+                    if not render_bounds or not contains_bounds(render_bounds, bounds):
+                        center = map_state.get('center') or {
+                            'lat': (bounds['_southWest']['lat'] + bounds['_northEast']['lat']) / 2,
+                            'lng': (bounds['_southWest']['lng'] + bounds['_northEast']['lng']) / 2,
+                        }
+                        st.session_state['store_map_view'] = {
+                            'render_bounds': expand_bounds(bounds),
+                            'center': (center['lat'], center['lng']),
+                            'zoom': map_state.get('zoom') or 6,
+                        }
+                        st.rerun()
+
+                # 地図の使い方
+                with st.expander("💡 地図の使い方"):
+                    st.write("""
+                    - **マーカーをクリック**: 店舗の詳細情報を表示
+                    - **マーカーにホバー**: 店舗名を表示
+                    - **ズーム**: マウスホイールまたは+/-ボタンでズーム
+                    - **移動**: 地図をドラッグして移動
+                    - **絞り込み**: 左のサイドバーで都道府県を選択
+                    """)
+
+        elif store_view == "📋 店舗一覧":
+            st.subheader("店舗一覧")
+
+            # 検索機能（全角半角・カタカナひらがなの違いは無視する）
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                search_query = st.text_input("🔍 店舗名・住所で検索", "")
+            with col2:
+                prefix_only = st.checkbox("前方一致", value=False)
+
+            with stage("検索", COMPUTE):
+                search_index, sort_ranks = get_search_index()
+                in_filter = stats.mask(selected_prefectures)
+                rows = search_index.search(search_query, prefix=prefix_only)
+                rows = rows[in_filter[rows]]
+            fuzzy = bool(search_query) and len(rows) == 0
+            if fuzzy:
+                # 一致が無ければあいまい検索の候補を近い順に出す
+                rows, _ = search_index.fuzzy(search_query)
+                rows = rows[in_filter[rows]]
+                if len(rows):
+                    st.caption(f"「{search_query}」に一致する店舗が無いため、近い候補を表示しています。")
+
+            # 並び替え（事前に計算した順位で検索結果だけを並べる）
+            sort_by = st.selectbox("並び替え", ["店舗名", "都道府県"], disabled=fuzzy)
+            if not fuzzy:
+                rows = rows[np.argsort(sort_ranks[sort_by][rows], kind='stable')]
+            search_filtered_df = df_stores.iloc[rows]
+
+            # 店舗一覧表示
+            st.dataframe(
+                search_filtered_df[['店舗名', '都道府県', '住所', '緯度', '経度']],
+                use_container_width=True,
+                hide_index=True
+            )
+
+            # CSVダウンロード
+            csv = search_filtered_df.to_csv(index=False).encode('utf-8')
+            st.download_button(
+                label="📥 CSVダウンロード",
+                data=csv,
+                file_name='ito_yokado_stores.csv',
+                mime='text/csv',
+            )
+
+            # 都道府県別統計
+            st.markdown("---")
+            st.subheader("都道府県別店舗数")
+
+            prefecture_counts = stats.counts(selected_prefectures)
+
+            fig = px.bar(
+                prefecture_counts,
+                x='都道府県',
+                y='店舗数',
+                title='都道府県別イトーヨーカドー店舗数',
+                color='店舗数',
+                color_continuous_scale='Greens'
+            )
+            fig.update_layout(height=400)
+            st.plotly_chart(fig, use_container_width=True)
+
+        else:
+            st.subheader("近くの店舗を探す")
+            st.caption("都道府県の絞り込みに関係なく、全店舗から検索します。")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                lat = st.number_input("緯度", min_value=-90.0, max_value=90.0, value=35.6812, format="%.4f")
+            with col2:
+                lon = st.number_input("経度", min_value=-180.0, max_value=180.0, value=139.7671, format="%.4f")
+
+            search_type = st.radio("検索方法", ["近い順", "半径で検索"], horizontal=True)
+            with stage("近傍検索の準備", COMPUTE):
+                index = get_store_index()
+            if search_type == "近い順":
+                # 店舗が1件だけのときはスライダーの最小・最大が同じになるので出さない
+                k = st.slider("表示件数", 1, min(50, len(index)), min(5, len(index))) if len(index) > 1 else 1
+                nearby_df = index.nearest(lat, lon, k=k)
+            else:
+                radius = st.slider("半径 (km)", 1, 200, 20)
+                nearby_df = index.within(lat, lon, radius)
+
+            if nearby_df.empty:
+                st.info("条件に合う店舗がありません。")
+            else:
+                st.dataframe(
+                    nearby_df[['店舗名', '都道府県', '住所', DISTANCE_COLUMN]],
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={DISTANCE_COLUMN: st.column_config.NumberColumn(format="%.1f")}
+                )
+
+        # 注意事項
+        st.markdown("---")
+        st.info("ℹ️ **情報**: list_store.txtに記載されている緯度経度情報を使用して店舗を表示しています。")